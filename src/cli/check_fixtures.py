@@ -11,6 +11,7 @@ from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn, T
 
 from ethereum_test_base_types import to_json
 from ethereum_test_fixtures.file import Fixtures
+from ethereum_test_fixtures.store import FIXTURE_STORE_DIR_NAME
 from ethereum_test_specs.base import HashMismatchExceptionError
 
 
@@ -36,7 +37,7 @@ def check_json(json_file_path: Path):
         a. Compare the newly calculated hashes from step 2. and 3. and
         b. If present, compare info["hash"] with the calculated hash from step 2.
     """
-    fixtures: Fixtures = Fixtures.model_validate_json(json_file_path.read_text())
+    fixtures: Fixtures = Fixtures.from_file(json_file_path)
     fixtures_json = to_json(fixtures)
     fixtures_deserialized: Fixtures = Fixtures.model_validate(fixtures_json)
     for fixture_name, fixture in fixtures.items():
@@ -100,7 +101,9 @@ def check_fixtures(input_str: str, quiet_mode: bool, stop_on_error: bool):
         if input_path.is_file():
             yield input_path
         else:
-            yield from input_path.rglob("*.json")
+            for json_file_path in input_path.rglob("*.json"):
+                if FIXTURE_STORE_DIR_NAME not in json_file_path.relative_to(input_path).parts:
+                    yield json_file_path
 
     with Progress(
         TextColumn(
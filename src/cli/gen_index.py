@@ -4,7 +4,7 @@ import datetime
 import json
 import os
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Mapping
 
 import click
 import rich
@@ -18,8 +18,11 @@ from rich.progress import (
 )
 
 from ethereum_test_base_types import HexNumber
+from ethereum_test_fixtures.collector import RecordedFixtureFile
+from ethereum_test_fixtures.compression import is_fixture_file
 from ethereum_test_fixtures.consume import IndexFile, TestCaseIndexFile
 from ethereum_test_fixtures.file import Fixtures
+from ethereum_test_fixtures.store import FIXTURE_STORE_DIR_NAME
 
 from .hasher import HashableItem
 
@@ -34,12 +37,25 @@ fixtures_to_skip = {
 }
 
 
+def iter_fixture_files(start_path: Path) -> Iterator[Path]:
+    """
+    Yield all the, possibly compressed, json fixture files in the specified
+    directory, excluding index.json files, the metadata directory and the fixture store.
+    """
+    for file in start_path.rglob("*.json*"):
+        if file.name == "index.json" or ".meta" in file.parts or not is_fixture_file(file):
+            continue
+        if FIXTURE_STORE_DIR_NAME in file.relative_to(start_path).parts:
+            continue
+        yield file
+
+
 def count_json_files_exclude_index(start_path: Path) -> int:
     """
     Return the number of json files in the specified directory, excluding
     index.json files and tests in "blockchain_tests_engine".
     """
-    json_file_count = sum(1 for file in start_path.rglob("*.json") if file.name != "index.json")
+    json_file_count = sum(1 for _ in iter_fixture_files(start_path))
     return json_file_count
 
 
@@ -101,10 +117,18 @@ def generate_fixtures_index(
     quiet_mode: bool = False,
     force_flag: bool = False,
     disable_infer_format: bool = False,
+    known_test_cases: Iterable[TestCaseIndexFile] = (),
+    known_fixture_files: Mapping[Path, RecordedFixtureFile] | None = None,
 ):
     """
     Generate an index file (index.json) of all the fixtures in the specified
     directory.
+
+    The entries of `known_test_cases`, e.g. recorded by `fill` as it wrote the fixtures,
+    are trusted without reading the fixture files that are in `known_fixture_files`, the
+    manifest of the written files, with as many fixtures as there are known test cases for
+    the file and with their recorded size. The other fixture files, e.g. written by a
+    previous run, are loaded. The index is the same either way.
     """
     total_files = 0
     if not os.path.isdir(input_path):  # caught by click if using via cli
@@ -151,31 +175,44 @@ def generate_fixtures_index(
     ) as progress:  # type: Progress
         task_id = progress.add_task("[cyan]Processing files...", total=total_files, filename="...")
 
+        known_test_cases_by_file: Dict[Path, Dict[str, TestCaseIndexFile]] = {}
+        for test_case in known_test_cases:
+            known_test_cases_by_file.setdefault(test_case.json_path, {})[test_case.id] = test_case
+
         test_cases: List[TestCaseIndexFile] = []
-        for file in input_path.rglob("*.json"):
-            if file.name == "index.json" or ".meta" in file.parts:
-                continue
+        for file in iter_fixture_files(input_path):
             if any(fixture in str(file) for fixture in fixtures_to_skip):
                 rich.print(f"Skipping '{file}'")
                 continue
 
-            try:
-                fixtures: Fixtures = Fixtures.model_validate_json(file.read_text())
-            except Exception as e:
-                rich.print(f"[red]Error loading fixtures from {file}[/red]")
-                raise e
-
             relative_file_path = Path(file).absolute().relative_to(Path(input_path).absolute())
-            for fixture_name, fixture in fixtures.items():
-                test_cases.append(
-                    TestCaseIndexFile(
-                        id=fixture_name,
-                        json_path=relative_file_path,
-                        fixture_hash=fixture.info.get("hash", None),
-                        fork=fixture.get_fork(),
-                        format=fixture.__class__,
+            file_test_cases = known_test_cases_by_file.get(relative_file_path, {})
+            recorded_file = (known_fixture_files or {}).get(relative_file_path)
+            if (
+                file_test_cases
+                and recorded_file is not None
+                and recorded_file.fixture_count == len(file_test_cases)
+                and recorded_file.size == file.stat().st_size
+            ):
+                # The fixtures are written sorted by name.
+                test_cases.extend(file_test_cases[name] for name in sorted(file_test_cases))
+            else:
+                try:
+                    fixtures: Fixtures = Fixtures.from_file(file)
+                except Exception as e:
+                    rich.print(f"[red]Error loading fixtures from {file}[/red]")
+                    raise e
+
+                for fixture_name, fixture in fixtures.items():
+                    test_cases.append(
+                        TestCaseIndexFile(
+                            id=fixture_name,
+                            json_path=relative_file_path,
+                            fixture_hash=fixture.info.get("hash", None),
+                            fork=fixture.get_fork(),
+                            format=fixture.__class__,
+                        )
                     )
-                )
 
             display_filename = file.name
             if len(display_filename) > filename_display_width:
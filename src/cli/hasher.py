@@ -9,6 +9,13 @@ from typing import Dict, List, Optional
 
 import click
 
+from ethereum_test_fixtures.compression import (
+    is_fixture_file,
+    open_fixture_file,
+    strip_compression_suffix,
+)
+from ethereum_test_fixtures.store import FIXTURE_STORE_DIR_NAME
+
 
 class HashableItemType(IntEnum):
     """Represents the type of a hashable item."""
@@ -58,10 +65,16 @@ class HashableItem:
 
     @classmethod
     def from_json_file(cls, *, file_path: Path, parents: List[str]) -> "HashableItem":
-        """Create a hashable item from a JSON file."""
+        """
+        Create a hashable item from a, possibly compressed, JSON file.
+
+        Compressed files are named after their uncompressed file name, so that the
+        hash does not depend on the compression of the fixture files.
+        """
         items = {}
-        with file_path.open("r") as f:
+        with open_fixture_file(file_path, "r") as f:
             data = json.load(f)
+        file_name = strip_compression_suffix(file_path).name
         for key, item in sorted(data.items()):
             if not isinstance(item, dict):
                 raise TypeError(f"Expected dict, got {type(item)} for {key}")
@@ -80,7 +93,7 @@ class HashableItem:
             items[key] = cls(
                 type=HashableItemType.TEST,
                 root=item_hash_bytes,
-                parents=parents + [file_path.name],
+                parents=parents + [file_name],
             )
         return cls(type=HashableItemType.FILE, items=items, parents=parents)
 
@@ -93,13 +106,14 @@ class HashableItem:
             parents = []
         items = {}
         for file_path in sorted(folder_path.iterdir()):
-            if ".meta" in file_path.parts:
+            # Stored fixtures are hashed by the info of the references to them.
+            if ".meta" in file_path.parts or file_path.name == FIXTURE_STORE_DIR_NAME:
                 continue
-            if file_path.is_file() and file_path.suffix == ".json":
+            if file_path.is_file() and is_fixture_file(file_path):
                 item = cls.from_json_file(
                     file_path=file_path, parents=parents + [folder_path.name]
                 )
-                items[file_path.name] = item
+                items[strip_compression_suffix(file_path).name] = item
             elif file_path.is_dir():
                 item = cls.from_folder(folder_path=file_path, parents=parents + [folder_path.name])
                 items[file_path.name] = item
@@ -0,0 +1,282 @@
+"""
+Merge the outputs of the shards of a `fill` run (`fill --shard i/N`) into a single release.
+
+Each shard's output records its shard index, the number of shards and a digest of the test
+items collected before sharding in the `[shard]` section of its `.meta/fixtures.ini`. This
+command checks that the outputs are the complete set of shards of the same item set, filled
+with the same transition tool, and combines them into a release identical to the output of a
+single `fill` run: the fixture files, the fixture store of deduplicated outputs, the
+`.meta/fixtures.ini` properties and the fixtures index.
+"""
+
+import configparser
+import re
+import shutil
+import tarfile
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+
+import click
+
+from ethereum_test_fixtures.collector import pop_recorded_fixture_files, record_fixture_files
+from ethereum_test_fixtures.consume import IndexFile, TestCaseIndexFile
+from ethereum_test_fixtures.file import (
+    deduplicate_fixtures,
+    iter_output_fixture_files,
+    merge_fixture_outputs,
+)
+from ethereum_test_fixtures.store import FIXTURE_STORE_DIR_NAME
+from pytest_plugins.filler.filler import (
+    has_output_tarball_suffix,
+    is_release_file,
+    strip_output_tarball_suffix,
+    write_properties,
+)
+from pytest_plugins.filler.tarball import create_tarball
+
+from .gen_index import generate_fixtures_index
+
+# The shard option as it appears in the command-line arguments recorded in the properties.
+SHARD_ARGUMENT = re.compile(r" --shard(=| )\S+")
+
+
+class ShardMergeError(Exception):
+    """Raised when the outputs can't be merged into a release."""
+
+
+def check_tarball_members(tar: tarfile.TarFile, destination: Path) -> None:
+    """
+    Check that the members of a tarball are files and directories inside the destination, as
+    the `data` extraction filter does on the Python versions that have it.
+    """
+    destination = destination.resolve()
+    for member in tar.getmembers():
+        if not (member.isfile() or member.isdir()):
+            raise ShardMergeError(f"the tarball member {member.name} is not a file")
+        if not (destination / member.name).resolve().is_relative_to(destination):
+            raise ShardMergeError(f"the tarball member {member.name} is outside of its root")
+
+
+def extract_tarball(tarball_path: Path, destination: Path) -> Path:
+    """Extract a tarball and return the output directory it contains."""
+    with tarfile.open(tarball_path, "r:gz") as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(destination, filter="data")
+        else:
+            # Python < 3.10.12 and < 3.11.4 have no extraction filters.
+            check_tarball_members(tar, destination)
+            tar.extractall(destination)
+    entries = list(destination.iterdir())
+    if len(entries) == 1 and entries[0].is_dir():
+        return entries[0]
+    return destination
+
+
+def read_properties(output_dir: Path) -> configparser.ConfigParser:
+    """Read the properties of a shard's output and check that it was filled by a shard."""
+    properties = configparser.ConfigParser(interpolation=None)
+    properties_path = output_dir / ".meta" / "fixtures.ini"
+    if not properties.read(properties_path):
+        raise ShardMergeError(
+            f"{output_dir} contains no {properties_path.relative_to(output_dir)}"
+        )
+    if not properties.has_section("shard"):
+        raise ShardMergeError(f"{output_dir} was not filled with `fill --shard`")
+    return properties
+
+
+def merge_properties(
+    output_dirs: List[Path], shard_properties: List[configparser.ConfigParser]
+) -> configparser.ConfigParser:
+    """
+    Check that the shards are complete and consistent, and return the properties of the
+    release, i.e., the properties of the first shard without its `[shard]` section, with the
+    earliest timestamp of all shards and without the `--shard` command-line argument.
+    """
+    shard_count = len(shard_properties)
+    shards: Dict[str, Path] = {}
+    for output_dir, properties in zip(output_dirs, shard_properties, strict=True):
+        shard = properties["shard"]
+        if int(shard["count"]) != shard_count:
+            raise ShardMergeError(
+                f"{output_dir} is one of {shard['count']} shards, but {shard_count} outputs "
+                "were given"
+            )
+        if shard["index"] in shards:
+            raise ShardMergeError(
+                f"{output_dir} and {shards[shard['index']]} are both shard {shard['index']}"
+            )
+        shards[shard["index"]] = output_dir
+
+    first_output_dir, first_properties = output_dirs[0], shard_properties[0]
+    for output_dir, properties in zip(output_dirs, shard_properties, strict=True):
+        for section, key in [
+            ("shard", "collection_digest"),
+            ("fixtures", "build"),
+            ("tools", "t8n"),
+        ]:
+            if properties.get(section, key, fallback=None) != first_properties.get(
+                section, key, fallback=None
+            ):
+                raise ShardMergeError(
+                    f"{output_dir} and {first_output_dir} have a different {section}.{key}, "
+                    "all shards must be filled from the same tests with the same tools"
+                )
+
+    release_properties = configparser.ConfigParser(interpolation=None)
+    release_properties.read_dict(first_properties)
+    release_properties.remove_section("shard")
+    fixture_properties = release_properties["fixtures"]
+    fixture_properties["timestamp"] = min(
+        properties["fixtures"]["timestamp"] for properties in shard_properties
+    )
+    fixture_properties["command_line_args"] = SHARD_ARGUMENT.sub(
+        "", fixture_properties["command_line_args"]
+    )
+    return release_properties
+
+
+def copy_common_metadata(output_dirs: List[Path], release_dir: Path) -> None:
+    """
+    Copy the metadata files that are identical in all shards, e.g. the EELS resolutions,
+    except for the properties and the index, which are merged. Metadata specific to each
+    shard, e.g. its report, is not part of the release.
+    """
+    first_meta_dir = output_dirs[0] / ".meta"
+    for file in sorted(first_meta_dir.rglob("*")):
+        relative_path = file.relative_to(first_meta_dir)
+        if not file.is_file() or relative_path in (Path("fixtures.ini"), Path("index.json")):
+            continue
+        contents = file.read_bytes()
+        if all(
+            (output_dir / ".meta" / relative_path).is_file()
+            and (output_dir / ".meta" / relative_path).read_bytes() == contents
+            for output_dir in output_dirs[1:]
+        ):
+            (release_dir / ".meta" / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(file, release_dir / ".meta" / relative_path)
+
+
+def read_index_test_cases(output_dirs: List[Path]) -> List[TestCaseIndexFile]:
+    """
+    Return the test cases of the indexes of the shards, which are reused to index the
+    release, except for the shards without an index, e.g. filled with `--skip-index`.
+    """
+    test_cases: List[TestCaseIndexFile] = []
+    for output_dir in output_dirs:
+        index_path = output_dir / ".meta" / "index.json"
+        if index_path.is_file():
+            test_cases.extend(IndexFile.model_validate_json(index_path.read_bytes()).test_cases)
+    return test_cases
+
+
+def indexed_fixture_counts(
+    output_dirs: List[Path], shard_test_cases: List[TestCaseIndexFile]
+) -> Dict[Path, int]:
+    """
+    Return the number of fixtures of the fixture files of the release whose fixtures are all
+    indexed by the shards, mapped by their path relative to the release.
+
+    The release directory starts empty, so each of its fixture files contains exactly the
+    fixtures of the shard files merged into it, unless one of them is from a shard without
+    an index.
+    """
+    fixture_counts = Counter(test_case.json_path for test_case in shard_test_cases)
+    for output_dir in output_dirs:
+        if not (output_dir / ".meta" / "index.json").is_file():
+            for file_path in iter_output_fixture_files(output_dir):
+                fixture_counts.pop(file_path.relative_to(output_dir), None)
+    return dict(fixture_counts)
+
+
+def merge_shard_outputs(inputs: List[Path], output: Path) -> None:
+    """
+    Merge the outputs of all the shards of a fill run, given as directories or tarballs,
+    into a release directory or, if `output` ends with `.tar.gz`, a release tarball.
+    """
+    release_dir = strip_output_tarball_suffix(output)
+    if release_dir.exists() and any(release_dir.iterdir()):
+        raise ShardMergeError(f"the output directory {release_dir} is not empty")
+
+    with ExitStack() as stack:
+        output_dirs = []
+        for input_path in inputs:
+            if has_output_tarball_suffix(input_path):
+                temp_dir = Path(stack.enter_context(TemporaryDirectory()))
+                input_path = extract_tarball(input_path, temp_dir)
+            output_dirs.append(input_path)
+
+        shard_properties = [read_properties(output_dir) for output_dir in output_dirs]
+        release_properties = merge_properties(output_dirs, shard_properties)
+        shard_test_cases = read_index_test_cases(output_dirs)
+        fixture_counts = indexed_fixture_counts(output_dirs, shard_test_cases)
+
+        release_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            merge_fixture_outputs(output_dirs, release_dir)
+        except ValueError as e:
+            raise ShardMergeError(str(e)) from e
+        copy_common_metadata(output_dirs, release_dir)
+    if (release_dir / FIXTURE_STORE_DIR_NAME).is_dir():
+        # Fixtures shared by tests of different shards are only deduplicated in the release.
+        deduplicate_fixtures(release_dir)
+
+    # The test cases of the shards are trusted for the release files they completely index.
+    record_fixture_files(
+        release_dir,
+        {
+            release_dir / relative_path: fixture_count
+            for relative_path, fixture_count in fixture_counts.items()
+            if (release_dir / relative_path).is_file()
+        },
+    )
+
+    (release_dir / ".meta").mkdir(exist_ok=True)
+    write_properties(release_properties, release_dir / ".meta")
+    generate_fixtures_index(
+        release_dir,
+        quiet_mode=True,
+        force_flag=False,
+        disable_infer_format=False,
+        known_test_cases=shard_test_cases,
+        known_fixture_files=pop_recorded_fixture_files(release_dir),
+    )
+
+    if has_output_tarball_suffix(output):
+        create_tarball(release_dir, output, include=is_release_file)
+
+
+@click.command()
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path),
+    required=True,
+    help=(
+        "Directory of the merged release or, if it ends with '.tar.gz', the release tarball "
+        "(and its directory, with the suffix removed)."
+    ),
+)
+@click.argument(
+    "inputs",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, path_type=Path),
+)
+def merge_shards(output: Path, inputs: List[Path]) -> None:
+    """
+    Merge the outputs of `fill --shard i/N`, directories or tarballs, of all N shards into
+    a single release, identical to the output of an unsharded `fill`.
+    """
+    try:
+        merge_shard_outputs(list(inputs), output)
+    except ShardMergeError as e:
+        raise click.ClickException(str(e)) from e
+    click.echo(f"Merged {len(inputs)} shards into {output}")
+
+
+if __name__ == "__main__":
+    merge_shards()
@@ -41,11 +41,26 @@ def handle_fill_command_flags(fill_args: List[str]) -> List[str]:
     }
 )
 @common_click_options
-def fill(pytest_args: List[str], **kwargs) -> None:
+@click.option(
+    "--daemon",
+    "use_daemon",
+    is_flag=True,
+    default=False,
+    help="Send the request to the warm daemon started with `fill_daemon start`.",
+)
+def fill(pytest_args: List[str], use_daemon: bool = False, **kwargs) -> None:
     """Entry point for the fill command."""
-    result = pytest.main(
-        handle_fill_command_flags(list(pytest_args)),
-    )
+    args = handle_fill_command_flags(list(pytest_args))
+    if use_daemon:
+        # Only the clients of the daemon pay for the import of its module.
+        from .fill_daemon import FillDaemonError, send_fill_request
+
+        try:
+            result = send_fill_request(args)
+        except FillDaemonError as e:
+            sys.exit(f"error: {e}")
+        sys.exit(result)
+    result = pytest.main(args)
     sys.exit(result)
 
 
@@ -0,0 +1,616 @@
+"""
+Warm daemon for iterative `fill` runs.
+
+Each `fill` invocation pays for starting the interpreter, importing (and rewriting the
+assertions of) the framework and the pytest plugins and, for server-based transition
+tools, starting the t8n server. When iterating on a single test, these dominate the
+turnaround time.
+
+The daemon pays these costs once: it loads the pytest plugins configured in the working
+directory, which import the framework, and starts the transition tool, then waits for
+fill requests on a unix socket. Each request is run by a child forked from the warm
+daemon, which only has to import the selected test modules. Since the daemon itself never
+imports test modules, edited tests are always picked up, and the state of a session never
+leaks into the next one. When a source file of the framework or a pytest configuration
+file changes, the daemon restarts itself before serving the next request.
+
+Start the daemon in the root directory of the repository:
+
+```console
+fill_daemon start
+```
+
+and send it fill requests with `fill --daemon`, using the same arguments as `fill`:
+
+```console
+fill --daemon tests/prague/eip7702_set_code_tx/test_set_code_txs.py -k test_self_sponsored
+```
+
+Requests are served one at a time; the daemon requires `os.fork` and unix sockets.
+
+The socket is created in a directory only accessible by the user, `$XDG_RUNTIME_DIR` or a
+private directory in the temporary directory, and, where the platform reports the
+credentials of the peer of a unix socket, requests from processes of other users are
+rejected. Only the environment variables read by a fill session, see
+`SESSION_ENVIRONMENT_VARIABLES`, are sent with a request.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import selectors
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Tuple
+
+import click
+
+# Frames sent by the daemon to the client: a channel byte and a 32-bit value, followed, for
+# the output channels, by a payload of `value` bytes. The value of an exit frame is the exit
+# code of the session.
+FRAME_HEADER = struct.Struct("!BI")
+STDOUT_CHANNEL = 1
+STDERR_CHANNEL = 2
+EXIT_CHANNEL = 3
+RESTART_CHANNEL = 4
+
+OUTPUT_CHUNK_SIZE = 64 * 1024
+STARTUP_TIMEOUT = 120.0
+
+SOURCE_DIRECTORY = Path(__file__).parents[2]
+
+# Environment variables of the client that are applied to its fill session: the ones read
+# by the framework, pytest and the tools run by the session, and the ones describing the
+# terminal and the locale. The other variables of the session are the daemon's.
+SESSION_ENVIRONMENT_VARIABLES = {
+    "CI",
+    "COLUMNS",
+    "FORCE_COLOR",
+    "GEN_TEST_DOC_VERSION",
+    "HOME",
+    "LANG",
+    "LANGUAGE",
+    "LINES",
+    "NO_COLOR",
+    "PATH",
+    "PY_COLORS",
+    "TERM",
+    "TMPDIR",
+    "TZ",
+    "VIRTUAL_ENV",
+}
+SESSION_ENVIRONMENT_PREFIXES = ("EELS_", "GITHUB_", "LC_", "PYTEST_")
+
+
+class FillDaemonError(Exception):
+    """Raised when a request can't be served by the fill daemon."""
+
+
+def runtime_directory() -> Path:
+    """
+    Return the directory of the daemons' sockets, which is only accessible by the user:
+    `$XDG_RUNTIME_DIR` if set, or a directory of the user in the temporary directory.
+
+    Raises:
+        FillDaemonError: if the directory in the temporary directory already exists, but
+            is not a directory owned by, and only accessible by, the user.
+
+    """
+    if xdg_runtime_dir := os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(xdg_runtime_dir)
+    directory = Path(tempfile.gettempdir()) / f"eest-fill-{os.getuid()}"
+    try:
+        directory.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    directory_stat = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(directory_stat.st_mode)
+        or directory_stat.st_uid != os.getuid()
+        or stat.S_IMODE(directory_stat.st_mode) & 0o077
+    ):
+        raise FillDaemonError(f"{directory} is not a directory private to the current user")
+    return directory
+
+
+def default_socket_path(working_directory: Optional[Path] = None) -> Path:
+    """
+    Return the path of the socket of the daemon serving the working directory.
+
+    The path is derived from the working directory, so each checkout of the repository can
+    be served by its own daemon, and is kept short to fit the limit of unix socket paths.
+    """
+    working_directory = (working_directory or Path.cwd()).resolve()
+    digest = hashlib.sha256(str(working_directory).encode()).hexdigest()[:16]
+    return runtime_directory() / f"eest-fill-{digest}.sock"
+
+
+def is_session_environment_variable(name: str) -> bool:
+    """Return whether the environment variable of the client applies to its fill session."""
+    return name in SESSION_ENVIRONMENT_VARIABLES or name.startswith(SESSION_ENVIRONMENT_PREFIXES)
+
+
+def session_environment(environment: Mapping[str, str]) -> Dict[str, str]:
+    """Return the variables of the environment that apply to a fill session."""
+    return {
+        name: value for name, value in environment.items() if is_session_environment_variable(name)
+    }
+
+
+def peer_uid(connection: socket.socket) -> Optional[int]:
+    """
+    Return the user id of the process connected to the unix socket, or `None` if the
+    platform doesn't report it.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = struct.Struct("3i")
+    _, uid, _ = credentials.unpack(
+        connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, credentials.size)
+    )
+    return uid
+
+
+def encode_frame(channel: int, payload: bytes = b"", value: Optional[int] = None) -> bytes:
+    """Encode a frame sent by the daemon to the client."""
+    return FRAME_HEADER.pack(channel, len(payload) if value is None else value) + payload
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    """Receive exactly `size` bytes from the connection."""
+    data = bytearray()
+    while len(data) < size:
+        try:
+            chunk = connection.recv(size - len(data))
+        except ConnectionError:
+            chunk = b""
+        if not chunk:
+            raise FillDaemonError("the fill daemon closed the connection")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def receive_frame(connection: socket.socket) -> Tuple[int, bytes, int]:
+    """Receive a frame, returning its channel, payload and value."""
+    channel, value = FRAME_HEADER.unpack(_receive_exactly(connection, FRAME_HEADER.size))
+    if channel in (STDOUT_CHANNEL, STDERR_CHANNEL):
+        return channel, _receive_exactly(connection, value), value
+    return channel, b"", value
+
+
+def watched_files_digest(working_directory: Path) -> str:
+    """
+    Return a digest of the paths, sizes and modification times of the framework sources
+    and of the pytest configuration files of the working directory.
+    """
+    from pytest_plugins.filler.collection_cache import source_files
+
+    h = hashlib.sha256()
+    files = [*source_files(SOURCE_DIRECTORY), *sorted(working_directory.glob("*.ini"))]
+    for file in files:
+        stat = file.stat()
+        h.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+class WarmTransitionToolPlugin:
+    """
+    Plugin that shares the transition tool started by the daemon with a fill session.
+
+    The session runs in a child forked from the daemon, so it uses a copy of the daemon's
+    `TransitionTool` object, which refers to the daemon's t8n server. This is safe because:
+    requests are served one at a time, so the server is only used by one session at a time;
+    each request to the server uses a new connection, so no connection state is shared; the
+    session never shuts the tool down (see the `t8n` fixture); and the child exits with
+    `os._exit`, so the finalizers of the daemon's objects, e.g. of the server's temporary
+    directory, don't run in the child. The tool is not shared if its server has stopped, so
+    a session never starts a server that would outlive it.
+    """
+
+    def __init__(self, t8n: Any, evm_bin: Path):
+        """Initialize the plugin with the transition tool started by the daemon."""
+        self.t8n = t8n
+        self.evm_bin = evm_bin
+
+    def pytest_configure(self, config) -> None:
+        """Share the transition tool if the session uses the same binary, without traces."""
+        try:
+            evm_bin = config.getoption("evm_bin")
+            traces = config.getoption("evm_collect_traces")
+        except ValueError:
+            # The filler plugin is not loaded.
+            return
+        if evm_bin != self.evm_bin or traces or not transition_tool_running(self.t8n):
+            return
+
+        from pytest_plugins.filler.filler import warm_transition_tool_key
+
+        config.stash[warm_transition_tool_key] = self.t8n
+
+
+def transition_tool_running(t8n: Any) -> bool:
+    """Return whether the transition tool is ready to evaluate, i.e. its server is running."""
+    if not t8n.t8n_use_server:
+        return True
+    return t8n.process is not None and t8n.process.poll() is None
+
+
+class FillDaemon:
+    """Serve fill requests from processes forked from a warm process."""
+
+    def __init__(self, *, socket_path: Path, evm_bin: Optional[Path]):
+        """Initialize the daemon."""
+        self.socket_path = socket_path
+        self.evm_bin = evm_bin
+        self.working_directory = Path.cwd()
+        self.digest = ""
+        self.t8n: Any = None
+        self.listener: Optional[socket.socket] = None
+        self.start_time = time.monotonic()
+        self.served_requests = 0
+
+    def log(self, message: str) -> None:
+        """Log a message to the daemon's output."""
+        click.echo(f"{time.strftime('%H:%M:%S')} {message}")
+
+    def warm_up(self) -> None:
+        """Load the pytest plugins and the framework, and start the transition tool."""
+        import pytest
+
+        from ethereum_test_fixtures import BaseFixture
+
+        start = time.perf_counter()
+        # Parsing the configuration imports the plugins with pytest's assertion rewriting,
+        # exactly as in a fill session, so the sessions of the children reuse the modules.
+        # With `--version`, pytest only parses the configuration: it doesn't configure the
+        # plugins or run a session.
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            pytest.main(["--version", "--noconftest", "-p", "no:cacheprovider"])
+        BaseFixture.formats_type_adapter()
+        self.digest = watched_files_digest(self.working_directory)
+        self.log(f"loaded the framework in {time.perf_counter() - start:.2f}s")
+
+        if self.evm_bin is None:
+            return
+        from ethereum_clis import TransitionTool
+
+        start = time.perf_counter()
+        try:
+            self.t8n = TransitionTool.from_binary_path(binary_path=self.evm_bin)
+            self.t8n.version()
+            if self.t8n.t8n_use_server:
+                self.t8n.start_server()
+        except Exception as e:
+            self.t8n = None
+            self.log(f"not sharing a transition tool, {self.evm_bin} failed to start: {e}")
+            return
+        self.log(
+            f"started {self.t8n.__class__.__name__} ({self.evm_bin}) "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+    def plugins(self) -> List[Any]:
+        """Return the plugins registered in the sessions of the children."""
+        if self.t8n is None or self.evm_bin is None:
+            return []
+        return [WarmTransitionToolPlugin(self.t8n, self.evm_bin)]
+
+    def serve(self) -> None:
+        """Listen on the socket and serve requests until stopped."""
+        try:
+            with socket.socket(socket.AF_UNIX) as probe:
+                probe.connect(str(self.socket_path))
+            raise FillDaemonError(f"a fill daemon is already listening on {self.socket_path}")
+        except (FileNotFoundError, ConnectionRefusedError):
+            self.socket_path.unlink(missing_ok=True)
+
+        # Listen before warming up: the requests received meanwhile wait to be served.
+        self.listener = socket.socket(socket.AF_UNIX)
+        self.listener.bind(str(self.socket_path))
+        # The socket's directory is private, its permissions shouldn't depend on the umask.
+        os.chmod(self.socket_path, 0o600)
+        self.listener.listen()
+        self.log(f"listening on {self.socket_path}")
+        try:
+            self.warm_up()
+            while True:
+                connection, _ = self.listener.accept()
+                with connection:
+                    uid = peer_uid(connection)
+                    if uid is not None and uid != os.getuid():
+                        self.log(f"rejected a request from user {uid}")
+                        continue
+                    if not self.handle(connection):
+                        break
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop listening and shut the transition tool down."""
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+            self.socket_path.unlink(missing_ok=True)
+        if self.t8n is not None:
+            self.t8n.shutdown()
+            self.t8n = None
+
+    def handle(self, connection: socket.socket) -> bool:
+        """Serve a request, returning whether the daemon should keep serving requests."""
+        with connection.makefile("rb") as f:
+            request = json.loads(f.readline())
+        command = request["command"]
+        if command == "stop":
+            self.reply(connection, "fill daemon stopped\n")
+            self.log("stopped")
+            return False
+        if command == "status":
+            self.reply(connection, self.status())
+            return True
+        if watched_files_digest(self.working_directory) != self.digest:
+            self.restart(connection)
+        start = time.perf_counter()
+        exit_code = self.run_session(connection, request)
+        self.served_requests += 1
+        self.log(
+            f"exit code {exit_code} in {time.perf_counter() - start:.2f}s: "
+            f"fill {' '.join(request['args'])}"
+        )
+        return True
+
+    def reply(self, connection: socket.socket, message: str) -> None:
+        """Reply to a request with a message and a successful exit code."""
+        connection.sendall(encode_frame(STDOUT_CHANNEL, message.encode()))
+        connection.sendall(encode_frame(EXIT_CHANNEL, value=0))
+
+    def status(self) -> str:
+        """Return the status of the daemon."""
+        t8n = f"{self.t8n.__class__.__name__} ({self.evm_bin})" if self.t8n else "none"
+        if self.t8n and not transition_tool_running(self.t8n):
+            t8n += ", stopped"
+        return (
+            f"pid: {os.getpid()}\n"
+            f"working directory: {self.working_directory}\n"
+            f"uptime: {time.monotonic() - self.start_time:.0f}s\n"
+            f"served requests: {self.served_requests}\n"
+            f"transition tool: {t8n}\n"
+        )
+
+    def restart(self, connection: socket.socket) -> None:
+        """
+        Restart the daemon to reload the framework after its sources changed, letting the
+        client send its request again once the restarted daemon listens.
+        """
+        self.log("framework sources changed, restarting")
+        self.close()
+        connection.sendall(encode_frame(RESTART_CHANNEL, value=0))
+        # Wait for the client to receive the frame and disconnect.
+        connection.recv(1)
+        sys.stdout.flush()
+        os.execv(
+            sys.executable,
+            [sys.executable, "-m", "cli.pytest_commands.fill_daemon", *sys.argv[1:]],
+        )
+
+    def run_session(self, connection: socket.socket, request: Dict[str, Any]) -> int:
+        """Run a fill session in a forked child, relaying its output to the client."""
+        stdout_read, stdout_write = os.pipe()
+        stderr_read, stderr_write = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                os.close(stdout_read)
+                os.close(stderr_read)
+                connection.close()
+                if self.listener is not None:
+                    self.listener.close()
+                exit_code = self.run_child(request, stdout_write, stderr_write)
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exit_code)
+
+        os.close(stdout_write)
+        os.close(stderr_write)
+        self.relay_output(
+            connection, pid, {stdout_read: STDOUT_CHANNEL, stderr_read: STDERR_CHANNEL}
+        )
+        _, status = os.waitpid(pid, 0)
+        exit_code = os.waitstatus_to_exitcode(status)
+        try:
+            connection.sendall(encode_frame(EXIT_CHANNEL, value=exit_code & 0xFFFFFFFF))
+        except OSError:
+            pass
+        return exit_code
+
+    def run_child(self, request: Dict[str, Any], stdout: int, stderr: int) -> int:
+        """Run the fill session of the request in the forked child."""
+        import pytest
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(stdout, 1)
+        os.dup2(stderr, 2)
+        for fd in (devnull, stdout, stderr):
+            os.close(fd)
+        os.chdir(request["cwd"])
+        for name in [name for name in os.environ if is_session_environment_variable(name)]:
+            del os.environ[name]
+        os.environ.update(session_environment(request["env"]))
+        return int(pytest.main(request["args"], plugins=self.plugins()))
+
+    @staticmethod
+    def relay_output(connection: socket.socket, pid: int, channels: Dict[int, int]) -> None:
+        """
+        Relay the output of the child to the client until the child closes its output.
+
+        If the client disconnects, e.g. when interrupted, the session is interrupted and its
+        remaining output is discarded.
+        """
+        client_connected = True
+        with selectors.DefaultSelector() as selector:
+            for fd in channels:
+                selector.register(fd, selectors.EVENT_READ)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    fd = key.fd
+                    data = os.read(fd, OUTPUT_CHUNK_SIZE)
+                    if not data:
+                        selector.unregister(fd)
+                        os.close(fd)
+                        continue
+                    if not client_connected:
+                        continue
+                    try:
+                        connection.sendall(encode_frame(channels[fd], data))
+                    except OSError:
+                        client_connected = False
+                        os.kill(pid, signal.SIGINT)
+
+
+def _connect(socket_path: Path, timeout: float = 0.0) -> socket.socket:
+    """Connect to the daemon, waiting up to `timeout` seconds for it to listen."""
+    deadline = time.monotonic() + timeout
+    while True:
+        connection = socket.socket(socket.AF_UNIX)
+        try:
+            connection.connect(str(socket_path))
+            return connection
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            connection.close()
+            if time.monotonic() >= deadline:
+                raise FillDaemonError(
+                    f"no fill daemon is listening on {socket_path}, "
+                    "start one with `fill_daemon start`"
+                ) from e
+            time.sleep(0.1)
+
+
+def send_request(
+    request: Dict[str, Any],
+    *,
+    socket_path: Optional[Path] = None,
+    stdout: Optional[BinaryIO] = None,
+    stderr: Optional[BinaryIO] = None,
+) -> int:
+    """
+    Send a request to the daemon, writing its output as it's received, and return the exit
+    code. If the daemon restarts to reload the framework, the request is sent again once
+    it's listening.
+    """
+    socket_path = socket_path or default_socket_path()
+    outputs = {
+        STDOUT_CHANNEL: stdout or sys.stdout.buffer,
+        STDERR_CHANNEL: stderr or sys.stderr.buffer,
+    }
+    timeout = 0.0
+    while True:
+        with _connect(socket_path, timeout) as connection:
+            connection.sendall(json.dumps(request).encode() + b"\n")
+            while True:
+                channel, payload, value = receive_frame(connection)
+                if channel == EXIT_CHANNEL:
+                    return value
+                if channel == RESTART_CHANNEL:
+                    break
+                outputs[channel].write(payload)
+                outputs[channel].flush()
+        timeout = STARTUP_TIMEOUT
+
+
+def send_fill_request(args: List[str], *, socket_path: Optional[Path] = None) -> int:
+    """Send the arguments of a fill command to the daemon and return the exit code."""
+    env = session_environment(os.environ)
+    if sys.stdout.isatty():
+        # The session's output is a pipe: keep the colors and width of the terminal.
+        env.setdefault("PY_COLORS", "1")
+        env.setdefault("COLUMNS", str(os.get_terminal_size().columns))
+    return send_request(
+        {"command": "fill", "args": args, "cwd": os.getcwd(), "env": env},
+        socket_path=socket_path,
+    )
+
+
+socket_option = click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Path of the daemon's unix socket. Default: derived from the working directory.",
+)
+
+
+@click.group()
+def fill_daemon() -> None:
+    """Keep a warm process that serves `fill --daemon` requests."""
+    pass
+
+
+@fill_daemon.command()
+@socket_option
+@click.option(
+    "--evm-bin",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=Path("ethereum-spec-evm-resolver"),
+    help=(
+        "Transition tool started by the daemon and shared with the fill sessions using the "
+        "same `--evm-bin`. Default: `ethereum-spec-evm-resolver`."
+    ),
+)
+@click.option(
+    "--no-t8n",
+    is_flag=True,
+    default=False,
+    help="Don't start a transition tool; each fill session starts its own.",
+)
+def start(socket_path: Optional[Path], evm_bin: Path, no_t8n: bool) -> None:
+    """Start the daemon in the foreground, serving the working directory."""
+    if not hasattr(os, "fork"):
+        raise click.ClickException("the fill daemon requires `os.fork`")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    daemon = FillDaemon(
+        socket_path=socket_path or default_socket_path(), evm_bin=None if no_t8n else evm_bin
+    )
+    try:
+        daemon.serve()
+    except FillDaemonError as e:
+        raise click.ClickException(str(e)) from e
+
+
+@fill_daemon.command()
+@socket_option
+def stop(socket_path: Optional[Path]) -> None:
+    """Stop the daemon serving the working directory."""
+    try:
+        send_request({"command": "stop"}, socket_path=socket_path)
+    except FillDaemonError as e:
+        raise click.ClickException(str(e)) from e
+
+
+@fill_daemon.command()
+@socket_option
+def status(socket_path: Optional[Path]) -> None:
+    """Show the status of the daemon serving the working directory."""
+    try:
+        send_request({"command": "status"}, socket_path=socket_path)
+    except FillDaemonError as e:
+        raise click.ClickException(str(e)) from e
+
+
+if __name__ == "__main__":
+    fill_daemon()
@@ -0,0 +1,166 @@
+"""Test the warm daemon serving fill requests."""
+
+import io
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from ..pytest_commands.fill_daemon import (
+    EXIT_CHANNEL,
+    STDOUT_CHANNEL,
+    FillDaemonError,
+    default_socket_path,
+    encode_frame,
+    peer_uid,
+    receive_frame,
+    runtime_directory,
+    send_request,
+    session_environment,
+    watched_files_digest,
+)
+
+TEST_MODULE = """
+def test_value():
+    assert {value} == 1
+"""
+
+
+def test_fill_imports_daemon_lazily():
+    """Test that the `fill` command only imports the daemon module with `--daemon`."""
+    script = (
+        "import sys, cli.pytest_commands.fill; "
+        "print('cli.pytest_commands.fill_daemon' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_frames():
+    """Test that the frames are received as they were encoded."""
+    daemon, client = socket.socketpair()
+    with daemon, client:
+        daemon.sendall(encode_frame(STDOUT_CHANNEL, b"output"))
+        daemon.sendall(encode_frame(EXIT_CHANNEL, value=3))
+        assert receive_frame(client) == (STDOUT_CHANNEL, b"output", 6)
+        assert receive_frame(client) == (EXIT_CHANNEL, b"", 3)
+        daemon.close()
+        with pytest.raises(FillDaemonError):
+            receive_frame(client)
+
+
+def test_default_socket_path(tmp_path: Path):
+    """Test that each working directory is served by a different socket."""
+    assert default_socket_path(tmp_path) == default_socket_path(tmp_path / ".")
+    assert default_socket_path(tmp_path) != default_socket_path(tmp_path / "other")
+    assert len(str(default_socket_path(tmp_path))) < 100
+
+
+def test_runtime_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that the sockets are created in a directory private to the user."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "xdg"))
+    assert runtime_directory() == tmp_path / "xdg"
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    directory = runtime_directory()
+    assert directory.parent == tmp_path
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+    assert runtime_directory() == directory
+
+    directory.chmod(0o777)
+    with pytest.raises(FillDaemonError, match="not a directory private"):
+        runtime_directory()
+
+
+def test_session_environment():
+    """Test that only the variables read by a fill session are sent to the daemon."""
+    environment = {
+        "PATH": "/bin",
+        "LC_ALL": "C",
+        "PYTEST_ADDOPTS": "-v",
+        "AWS_SECRET_ACCESS_KEY": "secret",
+        "SSH_AUTH_SOCK": "/tmp/agent",
+    }
+    assert session_environment(environment) == {
+        "PATH": "/bin",
+        "LC_ALL": "C",
+        "PYTEST_ADDOPTS": "-v",
+    }
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="requires SO_PEERCRED")
+def test_peer_uid():
+    """Test that the user of the peer of a unix socket is reported."""
+    first, second = socket.socketpair()
+    with first, second:
+        assert peer_uid(first) == os.getuid()
+
+
+def test_watched_files_digest(tmp_path: Path):
+    """Test that changing a configuration file changes the digest."""
+    digest = watched_files_digest(tmp_path)
+    assert watched_files_digest(tmp_path) == digest
+    (tmp_path / "pytest.ini").write_text("[pytest]\n")
+    assert watched_files_digest(tmp_path) != digest
+
+
+def test_no_daemon(tmp_path: Path):
+    """Test the error raised when no daemon is listening."""
+    with pytest.raises(FillDaemonError, match="fill_daemon start"):
+        send_request({"command": "status"}, socket_path=default_socket_path(tmp_path))
+
+
+@pytest.fixture
+def daemon_socket(tmp_path: Path) -> Generator[Path, None, None]:
+    """Start a daemon serving a directory containing a test module."""
+    (tmp_path / "pytest.ini").write_text("[pytest]\n")
+    (tmp_path / "test_module.py").write_text(TEST_MODULE.format(value=1))
+    socket_path = default_socket_path(tmp_path)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "cli.pytest_commands.fill_daemon", "start", "--no-t8n"],
+        cwd=tmp_path,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        while not socket_path.exists():
+            assert process.poll() is None, "the daemon failed to start"
+            time.sleep(0.05)
+        yield socket_path
+        send_request({"command": "stop"}, socket_path=socket_path, stdout=io.BytesIO())
+        process.wait(timeout=30)
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+
+def test_daemon(tmp_path: Path, daemon_socket: Path):
+    """Test that the sessions of the daemon's children pick up edited test modules."""
+    request = {
+        "command": "fill",
+        "args": ["-p", "no:cacheprovider", "test_module.py"],
+        "cwd": str(tmp_path),
+        "env": {},
+    }
+    for value, expected_exit_code, expected_output in [
+        (1, pytest.ExitCode.OK, b"1 passed"),
+        (2, pytest.ExitCode.TESTS_FAILED, b"1 failed"),
+    ]:
+        (tmp_path / "test_module.py").write_text(TEST_MODULE.format(value=value))
+        stdout = io.BytesIO()
+        exit_code = send_request(request, socket_path=daemon_socket, stdout=stdout)
+        assert exit_code == expected_exit_code
+        assert expected_output in stdout.getvalue()
+
+    status = io.BytesIO()
+    assert send_request({"command": "status"}, socket_path=daemon_socket, stdout=status) == 0
+    assert b"served requests: 2" in status.getvalue()
+    assert stat.S_IMODE(daemon_socket.stat().st_mode) == 0o600
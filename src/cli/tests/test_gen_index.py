@@ -0,0 +1,151 @@
+"""Test the generation of the fixtures index."""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from ethereum_test_fixtures import FixtureCollector
+from ethereum_test_fixtures.collector import (
+    INDEX_ENTRIES_DIR,
+    pop_recorded_fixture_files,
+    pop_recorded_test_cases,
+    record_fixture_files,
+)
+from ethereum_test_fixtures.collector import TestInfo as FixtureTestInfo
+from ethereum_test_fixtures.file import Fixtures, merge_fixture_shards
+
+from ..gen_index import generate_fixtures_index
+
+FIXTURES_DIR = Path(__file__).parents[2] / "ethereum_test_specs" / "tests" / "fixtures"
+FIXTURE_FILES = [
+    "chainid_cancun_blockchain_test_tx_type_0.json",
+    "chainid_cancun_state_test_tx_type_0.json",
+    "chainid_cancun_state_test_tx_type_1.json",
+]
+
+
+def fill_output(output_dir: Path) -> None:
+    """Write an output as `fill` does, with a collector per test module."""
+    for module_index, file_name in enumerate(FIXTURE_FILES):
+        collector = FixtureCollector(
+            output_dir=output_dir,
+            flat_output=False,
+            single_fixture_per_file=False,
+            filler_path=Path("tests"),
+            worker_id=f"gw{module_index}",
+            memory_budget=0,
+        )
+        fixture = next(iter(Fixtures.from_file(FIXTURES_DIR / file_name).values()))
+        for function_name in ["test_one", "test_two"]:
+            for param in range(2):
+                info = FixtureTestInfo(
+                    name=f"{function_name}[fork_Cancun-param_{param}]",
+                    id=f"tests/cancun/test_{module_index}.py::{function_name}[fork_Cancun-{param}]",
+                    original_name=function_name,
+                    path=Path("tests") / "cancun" / f"test_{module_index}.py",
+                )
+                collector.add_fixture(info, fixture)
+        collector.dump_fixtures()
+    record_fixture_files(output_dir, merge_fixture_shards(output_dir))
+
+
+def read_index(output_dir: Path) -> Dict:
+    """Read the index of an output, without its creation time."""
+    with open(output_dir / ".meta" / "index.json") as f:
+        index = json.load(f)
+    del index["created_at"]
+    return index
+
+
+def test_index_from_recorded_test_cases(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that the index generated from the recorded test cases is the standalone index."""
+    fill_output(tmp_path)
+    recorded_test_cases = pop_recorded_test_cases(tmp_path)
+    recorded_fixture_files = pop_recorded_fixture_files(tmp_path)
+    assert len(recorded_test_cases) == 12
+    assert set(recorded_fixture_files) == {
+        test_case.json_path for test_case in recorded_test_cases
+    }
+    assert not (tmp_path / INDEX_ENTRIES_DIR).exists()
+
+    generate_fixtures_index(tmp_path, quiet_mode=True)
+    expected_index = read_index(tmp_path)
+
+    def from_file(file_path: Path) -> Fixtures:
+        raise AssertionError(f"{file_path} was loaded")
+
+    monkeypatch.setattr(Fixtures, "from_file", from_file)
+    generate_fixtures_index(
+        tmp_path,
+        quiet_mode=True,
+        force_flag=True,
+        known_test_cases=recorded_test_cases,
+        known_fixture_files=recorded_fixture_files,
+    )
+    assert read_index(tmp_path) == expected_index
+
+
+def test_index_from_partially_recorded_test_cases(tmp_path: Path):
+    """Test that the files that don't only contain recorded test cases are loaded."""
+    fill_output(tmp_path)
+    recorded_test_cases = pop_recorded_test_cases(tmp_path)
+    recorded_fixture_files = pop_recorded_fixture_files(tmp_path)
+    generate_fixtures_index(tmp_path, quiet_mode=True)
+    expected_index = read_index(tmp_path)
+
+    generate_fixtures_index(
+        tmp_path,
+        quiet_mode=True,
+        force_flag=True,
+        known_test_cases=recorded_test_cases[1:],
+        known_fixture_files=recorded_fixture_files,
+    )
+    assert read_index(tmp_path) == expected_index
+
+
+def test_index_without_recorded_fixture_files(tmp_path: Path):
+    """Test that the recorded test cases aren't trusted without the manifest of the files."""
+    fill_output(tmp_path)
+    recorded_test_cases = pop_recorded_test_cases(tmp_path)
+    generate_fixtures_index(tmp_path, quiet_mode=True)
+    expected_index = read_index(tmp_path)
+    file_path = tmp_path / recorded_test_cases[0].json_path
+    Fixtures.from_file(FIXTURES_DIR / FIXTURE_FILES[0]).collect_into_file(file_path)
+
+    generate_fixtures_index(
+        tmp_path, quiet_mode=True, force_flag=True, known_test_cases=recorded_test_cases
+    )
+    assert read_index(tmp_path)["test_count"] == expected_index["test_count"] + 1
+
+
+@pytest.mark.parametrize("previous_fixtures_written", ["before", "after"])
+def test_index_of_file_with_previous_fixtures(tmp_path: Path, previous_fixtures_written: str):
+    """
+    Test that a fixture file that also contains other fixtures, merged into it or written
+    after the manifest was recorded, is loaded.
+    """
+    fill_output(tmp_path / "first")
+    file_path = tmp_path / "output" / pop_recorded_test_cases(tmp_path / "first")[0].json_path
+    previous_fixtures = Fixtures.from_file(FIXTURES_DIR / FIXTURE_FILES[0])
+    if previous_fixtures_written == "before":
+        file_path.parent.mkdir(parents=True)
+        previous_fixtures.collect_into_file(file_path)
+    fill_output(tmp_path / "output")
+    if previous_fixtures_written == "after":
+        previous_fixtures.collect_into_file(file_path)
+    recorded_test_cases = pop_recorded_test_cases(tmp_path / "output")
+    recorded_fixture_files = pop_recorded_fixture_files(tmp_path / "output")
+    generate_fixtures_index(tmp_path / "output", quiet_mode=True)
+    expected_index = read_index(tmp_path / "output")
+    assert expected_index["test_count"] == len(recorded_test_cases) + len(previous_fixtures)
+
+    generate_fixtures_index(
+        tmp_path / "output",
+        quiet_mode=True,
+        force_flag=True,
+        known_test_cases=recorded_test_cases,
+        known_fixture_files=recorded_fixture_files,
+    )
+    assert read_index(tmp_path / "output") == expected_index
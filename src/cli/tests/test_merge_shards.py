@@ -0,0 +1,206 @@
+"""Test merging the outputs of the shards of a fill run into a release."""
+
+import configparser
+import io
+import json
+import shutil
+import tarfile
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from click.testing import CliRunner
+
+from ethereum_test_fixtures.file import Fixtures, deduplicate_fixtures, write_json_fixtures
+from pytest_plugins.filler.filler import write_properties
+from pytest_plugins.filler.tarball import create_tarball
+
+from ..gen_index import generate_fixtures_index
+from ..merge_shards import (
+    ShardMergeError,
+    check_tarball_members,
+    merge_shard_outputs,
+    merge_shards,
+)
+
+FIXTURES_DIR = Path(__file__).parents[2] / "ethereum_test_specs" / "tests" / "fixtures"
+FIXTURE_FILES = [
+    "chainid_cancun_state_test_tx_type_0.json",
+    "chainid_cancun_state_test_tx_type_1.json",
+    "chainid_paris_state_test_tx_type_0.json",
+    "chainid_shanghai_state_test_tx_type_0.json",
+]
+COMMAND_LINE_ARGS = "fill tests/istanbul --until Cancun"
+
+
+def write_output(
+    output_dir: Path,
+    fixture_files: List[str],
+    timestamp: str = "2025-01-01T00:00:00",
+    shard: Dict[str, str] | None = None,
+) -> None:
+    """Write the output of a fill run containing the given fixture files."""
+    # All fixtures in a file shared by the shards, and each fixture file in its own file.
+    json_fixtures = {}
+    (output_dir / "state_tests" / "chainid").mkdir(parents=True)
+    for file_name in fixture_files:
+        for name, fixture in Fixtures.from_file(FIXTURES_DIR / file_name).items():
+            json_fixtures[f"{file_name}::{name}"] = fixture.json_dict_with_info()
+        shutil.copyfile(FIXTURES_DIR / file_name, output_dir / "state_tests" / file_name)
+    write_json_fixtures(output_dir / "state_tests" / "chainid" / "chainid.json", json_fixtures)
+    properties = configparser.ConfigParser(interpolation=None)
+    command_line_args = COMMAND_LINE_ARGS
+    if shard is not None:
+        command_line_args += f" --shard {shard['index']}/{shard['count']}"
+    properties["fixtures"] = {"timestamp": timestamp, "command_line_args": command_line_args}
+    properties["tools"] = {"t8n": "evm version 1.0"}
+    if shard is not None:
+        properties["shard"] = {"collection_digest": "digest", **shard}
+    properties["environment"] = {"python": "3.11"}
+    (output_dir / ".meta").mkdir(parents=True)
+    write_properties(properties, output_dir / ".meta")
+    (output_dir / ".meta" / "eels_resolutions.json").write_text("{}")
+    (output_dir / ".meta" / "report_fill.html").write_text(str(output_dir))
+
+
+def write_shards(
+    tmp_path: Path, count: int = 2, shard_overrides: Dict[str, str] | None = None
+) -> List[Path]:
+    """Write the outputs of the shards of a fill run."""
+    shard_dirs = [tmp_path / f"shard_{i}" for i in range(1, count + 1)]
+    for i, shard_dir in enumerate(shard_dirs):
+        write_output(
+            shard_dir,
+            FIXTURE_FILES[i::count],
+            timestamp=f"2025-01-01T00:0{count - i}:00",
+            shard={"index": str(i + 1), "count": str(count), **(shard_overrides or {})},
+        )
+    return shard_dirs
+
+
+def index_test_cases(output_dir: Path) -> List[Dict]:
+    """Return the test cases of the index of an output, sorted by ID."""
+    with open(output_dir / ".meta" / "index.json") as f:
+        return sorted(json.load(f)["test_cases"], key=lambda test_case: test_case["id"])
+
+
+@pytest.mark.parametrize("count", [1, 2, 4])
+def test_merge_shards(tmp_path: Path, count: int):
+    """Test that the merged release is identical to the output of an unsharded fill run."""
+    expected_dir = tmp_path / "expected"
+    write_output(expected_dir, FIXTURE_FILES, timestamp="2025-01-01T00:01:00")
+    generate_fixtures_index(expected_dir, quiet_mode=True)
+    release_dir = tmp_path / "release"
+    merge_shard_outputs(write_shards(tmp_path, count), release_dir)
+
+    def output_files(output_dir: Path) -> List[Path]:
+        return sorted(
+            path.relative_to(output_dir)
+            for path in output_dir.rglob("*")
+            if path.is_file() and path.name != "report_fill.html"
+        )
+
+    assert output_files(release_dir) == output_files(expected_dir)
+    for path in output_files(release_dir):
+        if path.name != "index.json":
+            assert (release_dir / path).read_bytes() == (expected_dir / path).read_bytes(), path
+    assert index_test_cases(release_dir) == index_test_cases(expected_dir)
+
+
+def test_merge_shard_tarballs(tmp_path: Path):
+    """Test merging shard tarballs into a release tarball."""
+    tarballs = []
+    for shard_dir in write_shards(tmp_path):
+        tarball = shard_dir.with_suffix(".tar.gz")
+        create_tarball(shard_dir, tarball, include=lambda file: file.suffix in (".ini", ".json"))
+        tarballs.append(tarball)
+
+    release = tmp_path / "release.tar.gz"
+    result = CliRunner().invoke(merge_shards, ["--output", str(release), *map(str, tarballs)])
+    assert result.exit_code == 0, result.output
+    with tarfile.open(release) as tar:
+        names = tar.getnames()
+    assert "fixtures/.meta/fixtures.ini" in names
+    assert "fixtures/.meta/index.json" in names
+    assert "fixtures/state_tests/chainid/chainid.json" in names
+
+
+def test_merge_empty_shard(tmp_path: Path):
+    """Test merging a shard without tests, whose output only contains its properties."""
+    expected_dir = tmp_path / "expected"
+    write_output(expected_dir, FIXTURE_FILES)
+    generate_fixtures_index(expected_dir, quiet_mode=True)
+    shard_dirs = write_shards(tmp_path, count=len(FIXTURE_FILES) + 1)
+    shutil.rmtree(shard_dirs[-1] / "state_tests")
+    release_dir = tmp_path / "release"
+    merge_shard_outputs(shard_dirs, release_dir)
+    assert index_test_cases(release_dir) == index_test_cases(expected_dir)
+
+
+def test_extract_tarball_outside_of_root(tmp_path: Path):
+    """Test that a tarball with members outside of its root is rejected."""
+    tarball = tmp_path / "shard.tar.gz"
+    with tarfile.open(tarball, "w:gz") as tar:
+        info = tarfile.TarInfo("../outside.json")
+        tar.addfile(info, io.BytesIO())
+    (tmp_path / "destination").mkdir()
+    with tarfile.open(tarball) as tar, pytest.raises(ShardMergeError, match="outside"):
+        check_tarball_members(tar, tmp_path / "destination")
+
+
+@pytest.mark.parametrize(
+    "shard_overrides,error",
+    [
+        ({"count": "3"}, "one of 3 shards"),
+        ({"index": "1"}, "are both shard 1"),
+    ],
+)
+def test_merge_incomplete_shards(tmp_path: Path, shard_overrides: Dict[str, str], error: str):
+    """Test that an incomplete set of shards is rejected."""
+    shard_dirs = write_shards(tmp_path, shard_overrides=shard_overrides)
+    with pytest.raises(ShardMergeError, match=error):
+        merge_shard_outputs(shard_dirs, tmp_path / "release")
+
+
+def test_merge_shards_with_different_digests(tmp_path: Path):
+    """Test that shards collected from different item sets are rejected."""
+    shard_dirs = write_shards(tmp_path)
+    properties_path = shard_dirs[1] / ".meta" / "fixtures.ini"
+    properties_path.write_text(
+        properties_path.read_text().replace("collection_digest = digest", "collection_digest = x")
+    )
+    with pytest.raises(ShardMergeError, match="different shard.collection_digest"):
+        merge_shard_outputs(shard_dirs, tmp_path / "release")
+
+
+def test_merge_unsharded_output(tmp_path: Path):
+    """Test that outputs not filled by a shard are rejected."""
+    write_output(tmp_path / "output", FIXTURE_FILES)
+    with pytest.raises(ShardMergeError, match="not filled with `fill --shard`"):
+        merge_shard_outputs([tmp_path / "output"], tmp_path / "release")
+
+
+def test_merge_deduplicated_shards(tmp_path: Path):
+    """Test that the merged release of deduplicated shards is deduplicated as a single run."""
+    expected_dir = tmp_path / "expected"
+    write_output(expected_dir, FIXTURE_FILES, timestamp="2025-01-01T00:01:00")
+    assert deduplicate_fixtures(expected_dir) > 0
+    shard_dirs = write_shards(tmp_path, count=2)
+    for shard_dir in shard_dirs:
+        deduplicate_fixtures(shard_dir)
+    release_dir = tmp_path / "release"
+    merge_shard_outputs(shard_dirs, release_dir)
+
+    generate_fixtures_index(expected_dir, quiet_mode=True)
+
+    def fixture_files(output_dir: Path) -> List[Path]:
+        return sorted(
+            path.relative_to(output_dir)
+            for path in output_dir.rglob("*")
+            if path.is_file() and ".meta" not in path.parts
+        )
+
+    assert fixture_files(release_dir) == fixture_files(expected_dir)
+    for path in fixture_files(release_dir):
+        assert (release_dir / path).read_bytes() == (expected_dir / path).read_bytes(), path
+    assert index_test_cases(release_dir) == index_test_cases(expected_dir)
@@ -39,7 +39,7 @@ from .conversions import to_bytes, to_hex
 from .json import to_json
 from .pydantic import CamelModel, EthereumTestBaseModel, EthereumTestRootModel
 from .reference_spec import ReferenceSpec
-from .serialization import RLPSerializable, SignableRLPSerializable
+from .serialization import RLPSerializable, SignableRLPSerializable, rlp_encode_element
 
 __all__ = (
     "AccessList",
@@ -77,6 +77,7 @@ __all__ = (
     "TestPrivateKey2",
     "Wei",
     "ZeroPaddedHexNumber",
+    "rlp_encode_element",
     "to_bytes",
     "to_hex",
     "to_json",
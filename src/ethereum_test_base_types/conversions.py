@@ -32,9 +32,9 @@ def to_bytes(input_bytes: BytesConvertible) -> bytes:
         raise Exception("Cannot convert `None` input to bytes")
 
     if (
-        isinstance(input_bytes, SupportsBytes)
-        or isinstance(input_bytes, bytes)
+        isinstance(input_bytes, bytes)
         or isinstance(input_bytes, list)
+        or isinstance(input_bytes, SupportsBytes)
     ):
         return bytes(input_bytes)
 
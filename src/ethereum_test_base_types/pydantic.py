@@ -15,12 +15,14 @@ RootModelRootType = TypeVar("RootModelRootType")
 class EthereumTestBaseModel(BaseModel, ModelCustomizationsMixin):
     """Base model for all models for Ethereum tests."""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class EthereumTestRootModel(RootModel[RootModelRootType], ModelCustomizationsMixin):
     """Base model for all models for Ethereum tests."""
 
+    model_config = ConfigDict(defer_build=True)
+
     root: Any
 
 
@@ -4,12 +4,21 @@ import base64
 import json
 import warnings
 from dataclasses import dataclass
-from typing import Any, Dict
-
-import requests
+from typing import TYPE_CHECKING, Any, Dict
 
 from .reference_spec import NoLatestKnownVersionError, ParseModuleError, ReferenceSpec
 
+if TYPE_CHECKING:
+    from requests import Response
+
+
+def _get(url: str) -> "Response":
+    # `requests` takes a significant share of the import time of the framework and is only
+    # needed to check the latest version of the spec, so it's imported on first use.
+    import requests
+
+    return requests.get(url)
+
 
 def _decode_base64_content(encoded_data: str) -> str:
     return base64.b64decode(encoded_data).decode("utf-8")
@@ -45,7 +54,7 @@ class GitReferenceSpec(ReferenceSpec):
         )
 
     def _get_latest_known_spec(self) -> Dict | None:
-        response = requests.get(self.api_url())
+        response = _get(self.api_url())
         if response.status_code != 200:
             return None
         content = json.loads(response.content)
@@ -55,7 +64,7 @@ class GitReferenceSpec(ReferenceSpec):
     def _get_latest_spec(self) -> Dict | None:
         if self._latest_spec is not None:
             return self._latest_spec
-        response = requests.get(self.api_url())
+        response = _get(self.api_url())
         if response.status_code != 200:
             warnings.warn(
                 f"Unable to get latest version, status code: {response.status_code} - "
@@ -1,9 +1,9 @@
 """Ethereum test types for serialization and encoding."""
 
-from typing import Any, ClassVar, List
+from typing import Any, ClassVar, List, Tuple
 
 import ethereum_rlp as eth_rlp
-from ethereum_types.numeric import Uint
+from ethereum_types.numeric import FixedUnsigned, Uint
 
 from ethereum_test_base_types import Bytes
 
@@ -25,6 +25,82 @@ def to_serializable_element(v: Any) -> Any:
     raise Exception(f"Unable to serialize element {v} of type {type(v)}.")
 
 
+def rlp_encode_bytes(data: bytes) -> bytes:
+    """Return the RLP encoding of a byte string, identical to `eth_rlp.encode`."""
+    length = len(data)
+    if length == 1 and data[0] < 0x80:
+        return bytes(data)
+    if length < 0x38:
+        return bytes([0x80 + length]) + data
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([0xB7 + len(length_bytes)]) + length_bytes + data
+
+
+def rlp_encode_uint(value: int) -> bytes:
+    """Return the RLP encoding of an unsigned integer, identical to `eth_rlp.encode(Uint(v))`."""
+    if value < 0:
+        # Raise the same error as the generic path.
+        Uint(value)
+    return rlp_encode_bytes(value.to_bytes((value.bit_length() + 7) // 8, "big"))
+
+
+def rlp_encode_list_payload(payload: bytes) -> bytes:
+    """Return the RLP encoding of a list, given the concatenated encodings of its items."""
+    length = len(payload)
+    if length < 0x38:
+        return bytes([0xC0 + length]) + payload
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([0xF7 + len(length_bytes)]) + length_bytes + payload
+
+
+def rlp_encode_element(v: Any) -> bytes:
+    """
+    Return `eth_rlp.encode(v)`, encoding the byte strings, unsigned integers and lists that
+    make up headers, transactions and blocks directly instead of through the generic dispatch
+    of `eth_rlp.encode`.
+    """
+    if isinstance(v, (bytes, bytearray)):
+        return rlp_encode_bytes(v)
+    if isinstance(v, (list, tuple)):
+        return rlp_encode_list_payload(b"".join([rlp_encode_element(item) for item in v]))
+    if isinstance(v, (Uint, FixedUnsigned)):
+        return rlp_encode_bytes(v.to_be_bytes())
+    return eth_rlp.encode(v)
+
+
+# Key of a field value in the cache of the encodings of an object. Scalar values are keyed by
+# type and value, lists by the keys of their items and nested objects by their own encoding,
+# which is itself cached, so the key changes whenever the encoding would.
+_NESTED = object()
+_LIST = object()
+
+
+def _rlp_cache_key(v: Any) -> Any:
+    if isinstance(v, RLPSerializable):
+        return (_NESTED, v._rlp_list_encoding(signing=False))
+    if isinstance(v, list):
+        return (_LIST, tuple(_rlp_cache_key(item) for item in v))
+    if isinstance(v, int) and v < 0:
+        # Raise the same error as the generic path.
+        Uint(v)
+    if v is None or isinstance(v, (int, bytes)):
+        return (v.__class__, v)
+    raise Exception(f"Unable to serialize element {v} of type {type(v)}.")
+
+
+def _rlp_encode_cache_key(key: Any) -> bytes:
+    kind, value = key
+    if kind is _NESTED:
+        return value
+    if kind is _LIST:
+        return rlp_encode_list_payload(b"".join([_rlp_encode_cache_key(item) for item in value]))
+    if value is None:
+        return b"\x80"
+    if isinstance(value, bytes):
+        return rlp_encode_bytes(value)
+    return rlp_encode_uint(value)
+
+
 class RLPSerializable:
     """Class that adds RLP serialization to another class."""
 
@@ -124,15 +200,59 @@ class RLPSerializable:
 
         return self.to_list_from_fields(field_list)
 
+    def _rlp_list_encoding(self, signing: bool) -> bytes:
+        """
+        Return the RLP encoding of the list returned by `to_list`, without the prefix.
+
+        The encoding is cached in the object together with the key of the values it was
+        computed from, and computed again once any of the values, or the encoding of a nested
+        object, changes.
+        """
+        if signing:
+            if not self.signable:
+                raise Exception(f'Object "{self.__class__.__name__}" does not support signing')
+            fields = self.get_rlp_signing_fields()
+            cache_attribute = "_rlp_signing_cache"
+        else:
+            if self.signable:
+                self.sign()
+            fields = self.get_rlp_fields()
+            cache_attribute = "_rlp_cache"
+
+        key_items: List[Any] = [fields]
+        for field in fields:
+            assert isinstance(field, str) and hasattr(self, field), (
+                f'Unable to rlp serialize field "{field}" '
+                f'in object type "{self.__class__.__name__}"'
+            )
+            try:
+                key_items.append(_rlp_cache_key(getattr(self, field)))
+            except Exception as e:
+                raise Exception(
+                    f'Unable to rlp serialize field "{field}" '
+                    f'in object type "{self.__class__.__name__}"'
+                ) from e
+        key = tuple(key_items)
+
+        cached: Tuple[Any, bytes] | None = self.__dict__.get(cache_attribute)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        encoding = rlp_encode_list_payload(
+            b"".join([_rlp_encode_cache_key(item) for item in key_items[1:]])
+        )
+        # The cache is replaced rather than updated, as copies of the object share it.
+        self.__dict__[cache_attribute] = (key, encoding)
+        return encoding
+
     def rlp_signing_bytes(self) -> Bytes:
         """Return the signing serialized envelope used for signing."""
-        return Bytes(self.get_rlp_signing_prefix() + eth_rlp.encode(self.to_list(signing=True)))
+        return Bytes(self.get_rlp_signing_prefix() + self._rlp_list_encoding(signing=True))
 
     def rlp(self) -> Bytes:
         """Return the serialized object."""
         if self.rlp_override is not None:
             return self.rlp_override
-        return Bytes(self.get_rlp_prefix() + eth_rlp.encode(self.to_list(signing=False)))
+        return Bytes(self.get_rlp_prefix() + self._rlp_list_encoding(signing=False))
 
 
 class SignableRLPSerializable(RLPSerializable):
@@ -2,11 +2,14 @@
 
 from typing import Any, Dict
 
+import ethereum_rlp as eth_rlp
 import pytest
+from ethereum_types.numeric import U64, Uint
 
 from ..base_types import Address, Hash, Wei
 from ..composite_types import AccessList
 from ..json import to_json
+from ..serialization import rlp_encode_element
 
 
 @pytest.mark.parametrize(
@@ -229,3 +232,33 @@ class TestPydanticModelConversion:
             pytest.skip(reason="The model instance in this case can not be deserialized")
         model_type = type(model_instance)
         assert model_type(**json) == model_instance
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        b"",
+        b"\x00",
+        b"\x7f",
+        b"\x80",
+        bytearray(b"\x01\x02"),
+        b"\x01" * 55,
+        b"\x01" * 56,
+        b"\x01" * 1024,
+        Uint(0),
+        Uint(127),
+        Uint(128),
+        Uint(2**256 - 1),
+        U64(2**64 - 1),
+        True,
+        False,
+        "text",
+        [],
+        [Uint(1), [b"", [Hash(1), Address(2)]]],
+        [b"\x01" * 20] * 3,
+        (Uint(1), b"\x02"),
+    ],
+)
+def test_rlp_encode_element(value: Any):
+    """Test that the direct RLP encoding is identical to `eth_rlp.encode`."""
+    assert rlp_encode_element(value) == eth_rlp.encode(value)
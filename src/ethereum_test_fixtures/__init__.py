@@ -6,7 +6,7 @@ from .collector import FixtureCollector, TestInfo
 from .eof import EOFFixture
 from .state import StateFixture
 from .transaction import TransactionFixture
-from .verify import FixtureVerifier
+from .verify import FixtureVerificationError, FixtureVerifier
 
 __all__ = [
     "BaseFixture",
@@ -16,6 +16,7 @@ __all__ = [
     "EOFFixture",
     "FixtureCollector",
     "FixtureFormat",
+    "FixtureVerificationError",
     "FixtureVerifier",
     "StateFixture",
     "TestInfo",
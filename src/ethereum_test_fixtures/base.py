@@ -3,7 +3,7 @@
 import hashlib
 import json
 from functools import cached_property
-from typing import Annotated, Any, ClassVar, Dict, Type, Union
+from typing import Annotated, Any, ClassVar, Dict, Tuple, Type, Union
 
 from pydantic import (
     Discriminator,
@@ -19,6 +19,22 @@ from pydantic_core.core_schema import ValidatorFunctionWrapHandler
 from ethereum_test_base_types import CamelModel, ReferenceSpec
 from ethereum_test_forks import Fork
 
+from .profiling import profile_phase
+
+# Encoder of the canonical JSON representation hashed by `BaseFixture.hash`, equivalent to
+# `json.dumps(obj, sort_keys=True, separators=(",", ":"))`. Reusing a single encoder avoids
+# building a new one for every fixture, and the JSON representation of a fixture, produced by
+# `model_dump`, can't contain circular references, so they are not checked for.
+CANONICAL_JSON_ENCODER = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), check_circular=False
+)
+
+
+def canonical_json_hash(json_dict: Dict[str, Any]) -> str:
+    """Return the hash of the canonical JSON representation of a fixture's JSON dictionary."""
+    json_str = CANONICAL_JSON_ENCODER.encode(json_dict)
+    return f"0x{hashlib.sha256(json_str.encode('utf-8')).hexdigest()}"
+
 
 def fixture_format_discriminator(v: Any) -> str | None:
     """Discriminator function that returns the model type as a string."""
@@ -41,7 +57,7 @@ class BaseFixture(CamelModel):
 
     # Base Fixture class properties
     formats: ClassVar[Dict[str, Type["BaseFixture"]]] = {}
-    formats_type_adapter: ClassVar[TypeAdapter]
+    _formats_type_adapter: ClassVar[TypeAdapter | None] = None
 
     info: Dict[str, Dict[str, Any] | str] = Field(default_factory=dict, alias="_info")
 
@@ -64,8 +80,16 @@ class BaseFixture(CamelModel):
         if cls.fixture_format_name != "unset":
             # Register the new fixture format
             BaseFixture.formats[cls.fixture_format_name] = cls
+            # Building the type adapter is expensive, so it's only built on first use, once
+            # all the fixture formats have been registered.
+            BaseFixture._formats_type_adapter = None
+
+    @classmethod
+    def formats_type_adapter(cls) -> TypeAdapter:
+        """Return the type adapter used to parse a fixture into its fixture format."""
+        if BaseFixture._formats_type_adapter is None:
             if len(BaseFixture.formats) > 1:
-                BaseFixture.formats_type_adapter = TypeAdapter(
+                BaseFixture._formats_type_adapter = TypeAdapter(
                     Annotated[
                         Union[
                             tuple(
@@ -80,27 +104,31 @@ class BaseFixture(CamelModel):
                     ]
                 )
             else:
-                BaseFixture.formats_type_adapter = TypeAdapter(cls)
+                BaseFixture._formats_type_adapter = TypeAdapter(
+                    next(iter(BaseFixture.formats.values()))
+                )
+        return BaseFixture._formats_type_adapter
 
     @model_validator(mode="wrap")
     @classmethod
     def _parse_into_subclass(cls, v: Any, handler: ValidatorFunctionWrapHandler) -> "BaseFixture":
         """Parse the fixture into the correct subclass."""
         if cls is BaseFixture:
-            return BaseFixture.formats_type_adapter.validate_python(v)
+            return BaseFixture.formats_type_adapter().validate_python(v)
         return handler(v)
 
     @cached_property
     def json_dict(self) -> Dict[str, Any]:
         """Returns the JSON representation of the fixture."""
-        return self.model_dump(mode="json", by_alias=True, exclude_none=True, exclude={"info"})
+        with profile_phase("fixture serialization"):
+            return self.model_dump(mode="json", by_alias=True, exclude_none=True, exclude={"info"})
 
     @cached_property
     def hash(self) -> str:
         """Returns the hash of the fixture."""
-        json_str = json.dumps(self.json_dict, sort_keys=True, separators=(",", ":"))
-        h = hashlib.sha256(json_str.encode("utf-8")).hexdigest()
-        return f"0x{h}"
+        json_dict = self.json_dict
+        with profile_phase("fixture hashing"):
+            return canonical_json_hash(json_dict)
 
     def json_dict_with_info(self, hash_only: bool = False) -> Dict[str, Any]:
         """Return JSON representation of the fixture with the info field."""
@@ -134,6 +162,22 @@ class BaseFixture(CamelModel):
         """Return fork of the fixture as a string."""
         raise NotImplementedError
 
+    @classmethod
+    def split_fork(cls, json_dict: Dict[str, Any]) -> Tuple[Dict[str, Any], str | None]:
+        """
+        Split the JSON representation of a fixture of this format into the fields that don't
+        depend on the name of the fork and the name of the fork, such that fixtures that only
+        differ by their fork share the same fork-independent fields.
+
+        By default, fixtures don't contain the name of their fork.
+        """
+        return json_dict, None
+
+    @classmethod
+    def join_fork(cls, json_dict: Dict[str, Any], fork: str | None) -> Dict[str, Any]:
+        """Return the JSON representation of a fixture split by `split_fork`."""
+        return json_dict
+
     @classmethod
     def supports_fork(cls, fork: Fork) -> bool:
         """
@@ -5,6 +5,7 @@ from typing import (
     Annotated,
     Any,
     ClassVar,
+    Dict,
     List,
     Literal,
     Tuple,
@@ -14,7 +15,6 @@ from typing import (
     get_type_hints,
 )
 
-import ethereum_rlp as eth_rlp
 from ethereum_types.numeric import Uint
 from pydantic import AliasChoices, Field, PlainSerializer, computed_field, model_validator
 
@@ -30,6 +30,7 @@ from ethereum_test_base_types import (
     HexNumber,
     Number,
     ZeroPaddedHexNumber,
+    rlp_encode_element,
 )
 from ethereum_test_exceptions import EngineAPIError, ExceptionInstanceOrList
 from ethereum_test_forks import Fork, Shanghai
@@ -160,7 +161,7 @@ class FixtureHeader(CamelModel):
     @cached_property
     def rlp(self) -> Bytes:
         """Compute the RLP of the header."""
-        return Bytes(eth_rlp.encode(self.rlp_encode_list))
+        return Bytes(rlp_encode_element(self.rlp_encode_list))
 
     @computed_field(alias="hash")  # type: ignore[misc]
     @cached_property
@@ -341,7 +342,7 @@ class FixtureBlockBase(CamelModel):
 
         return FixtureBlock(
             **self.model_dump(),
-            rlp=eth_rlp.encode(block),
+            rlp=rlp_encode_element(block),
         )
 
 
@@ -404,6 +405,24 @@ class BlockchainFixtureCommon(BaseFixture):
         """Return fork of the fixture as a string."""
         return self.fork
 
+    @classmethod
+    def split_fork(cls, json_dict: Dict[str, Any]) -> Tuple[Dict[str, Any], str | None]:
+        """Split the `network` field, also repeated in the config, from the rest of the fixture."""
+        json_dict = json_dict.copy()
+        fork = json_dict.pop("network")
+        config = json_dict.get("config")
+        if isinstance(config, dict) and config.get("network") == fork:
+            json_dict["config"] = {k: v for k, v in config.items() if k != "network"}
+        return json_dict, fork
+
+    @classmethod
+    def join_fork(cls, json_dict: Dict[str, Any], fork: str | None) -> Dict[str, Any]:
+        """Add the `network` field back to the fixture and to its config."""
+        config = json_dict.get("config")
+        if isinstance(config, dict) and "network" not in config:
+            json_dict = {**json_dict, "config": {"network": fork, **config}}
+        return {**json_dict, "network": fork}
+
 
 class BlockchainFixture(BlockchainFixtureCommon):
     """Cross-client specific blockchain test model use in JSON fixtures."""
@@ -3,19 +3,25 @@ Fixture collector class used to collect, sort and combine the different types of
 fixtures.
 """
 
+import itertools
 import json
 import os
 import re
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Literal, Optional, Tuple
-
-from ethereum_test_base_types import to_json
+from typing import TYPE_CHECKING, Dict, List, Literal, Mapping, Optional, Tuple, Type
 
 from .base import BaseFixture
-from .file import Fixtures
-from .verify import FixtureVerifier
+from .compression import FixtureFileCompression
+from .file import write_fixture_shard
+from .profiling import profile_phase
+from .stream import FixtureStreamFormat, FixtureStreamWriter
+from .verify import FixtureVerificationError, FixtureVerifier
+
+if TYPE_CHECKING:
+    from .consume import TestCaseIndexFile
 
 
 def strip_test_prefix(name: str) -> str:
@@ -44,6 +50,89 @@ def get_module_relative_output_dir(test_module: Path, filler_path: Path) -> Path
     return module_path
 
 
+# Sequence number used to keep the shard file names of a single process unique.
+_shard_sequence = itertools.count()
+
+# Directory of the output where the index entries of the written fixtures are recorded.
+INDEX_ENTRIES_DIR = Path(".meta") / "index_entries"
+
+# Manifest of the fixture files written to the output, in the directory of the index entries.
+FIXTURE_FILES_MANIFEST_NAME = "fixture_files.json"
+
+
+@dataclass(kw_only=True)
+class RecordedFixtureFile:
+    """A fixture file written to the output, as recorded in the manifest."""
+
+    fixture_count: int
+    size: int
+
+
+def _remove_index_entries_dir(entries_dir: Path) -> None:
+    """Remove the directory of the index entries once all its records were popped."""
+    try:
+        entries_dir.rmdir()
+    except OSError:
+        pass
+
+
+def pop_recorded_test_cases(output_dir: Path) -> List["TestCaseIndexFile"]:
+    """
+    Return the index entries recorded by all the collectors that wrote to the output, and
+    remove them from the output.
+    """
+    # The index models are only needed at the end of the session, so they're imported on
+    # first use to keep them out of the import time of the framework.
+    from .consume import TestCaseIndexFile
+
+    entries_dir = output_dir / INDEX_ENTRIES_DIR
+    if not entries_dir.is_dir():
+        return []
+    test_cases: List["TestCaseIndexFile"] = []
+    for entries_path in sorted(entries_dir.glob("*.jsonl")):
+        with open(entries_path) as f:
+            test_cases.extend(TestCaseIndexFile.model_validate_json(line) for line in f)
+        entries_path.unlink()
+    _remove_index_entries_dir(entries_dir)
+    return test_cases
+
+
+def record_fixture_files(output_dir: Path, fixture_counts: Mapping[Path, int]) -> None:
+    """
+    Record the number of fixtures and the current size of the fixture files written to the
+    output in the manifest of the index entries, see `pop_recorded_fixture_files`.
+    """
+    manifest = {
+        str(file_path.relative_to(output_dir)): {
+            "fixture_count": fixture_count,
+            "size": file_path.stat().st_size,
+        }
+        for file_path, fixture_count in fixture_counts.items()
+    }
+    os.makedirs(output_dir / INDEX_ENTRIES_DIR, exist_ok=True)
+    with open(output_dir / INDEX_ENTRIES_DIR / FIXTURE_FILES_MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f)
+
+
+def pop_recorded_fixture_files(output_dir: Path) -> Dict[Path, RecordedFixtureFile]:
+    """
+    Return the fixture files recorded in the manifest of the index entries, mapped by their
+    path relative to the output, and remove the manifest from the output.
+
+    The recorded index entries of a fixture file can be trusted without reading the file if
+    their number is its number of fixtures and the file still has the recorded size.
+    """
+    entries_dir = output_dir / INDEX_ENTRIES_DIR
+    manifest_path = entries_dir / FIXTURE_FILES_MANIFEST_NAME
+    if not manifest_path.is_file():
+        return {}
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest_path.unlink()
+    _remove_index_entries_dir(entries_dir)
+    return {Path(path): RecordedFixtureFile(**record) for path, record in manifest.items()}
+
+
 @dataclass(kw_only=True)
 class TestInfo:
     """Contains test information from the current node."""
@@ -92,17 +181,40 @@ class TestInfo:
 
 @dataclass(kw_only=True)
 class FixtureCollector:
-    """Collects all fixtures generated by the test cases."""
+    """
+    Collects all fixtures generated by the test cases.
+
+    Fixtures are serialized as soon as they are added, and the serialized fixtures are
+    written to shard files of their fixture files once they exceed the memory budget, if
+    any, or when the collector is dumped.
+    """
 
     output_dir: Path
     flat_output: bool
     single_fixture_per_file: bool
     filler_path: Path
     base_dump_dir: Optional[Path] = None
+    worker_id: str = "master"
+    compression: FixtureFileCompression = FixtureFileCompression.NONE
+    stdout_format: FixtureStreamFormat = FixtureStreamFormat.JSON
+    # Maximum size, in bytes, of the serialized fixtures held before they are written.
+    memory_budget: int | None = None
 
     # Internal state
-    all_fixtures: Dict[Path, Fixtures] = field(default_factory=dict)
+    pending_fixtures: Dict[Path, Dict[str, str]] = field(default_factory=dict)
+    pending_size: int = 0
+    json_path_to_fixture_format: Dict[Path, Type[BaseFixture]] = field(default_factory=dict)
     json_path_to_test_item: Dict[Path, TestInfo] = field(default_factory=dict)
+    # The names of the fixtures written to each shard file, by fixture file.
+    json_path_to_shards: Dict[Path, Dict[Path, List[str]]] = field(default_factory=dict)
+    # The index entries of the fixtures that were not written yet.
+    pending_test_cases: List["TestCaseIndexFile"] = field(default_factory=list)
+    stdout_writer: FixtureStreamWriter | None = None
+
+    def __post_init__(self):
+        """Stream the fixtures as they are added if the output is stdout."""
+        if self.output_dir.name == "stdout":
+            self.stdout_writer = FixtureStreamWriter(sys.stdout, self.stdout_format)
 
     def get_fixture_basename(self, info: TestInfo) -> Path:
         """Return basename of the fixture file for a given test case."""
@@ -129,44 +241,130 @@ class FixtureCollector:
         fixture_path = (
             self.output_dir
             / fixture.output_base_dir_name()
-            / fixture_basename.with_suffix(fixture.output_file_extension)
+            / fixture_basename.with_suffix(fixture.output_file_extension + self.compression.suffix)
         )
-        if fixture_path not in self.all_fixtures.keys():  # relevant when we group by test function
-            self.all_fixtures[fixture_path] = Fixtures(root={})
+        if self.stdout_writer is not None:
+            self.stdout_writer.write(info.id, fixture)
+            return fixture_path
+
+        if fixture_path not in self.json_path_to_fixture_format:
+            # relevant when we group by test function
+            self.json_path_to_fixture_format[fixture_path] = fixture.__class__
             self.json_path_to_test_item[fixture_path] = info
+        elif self.json_path_to_fixture_format[fixture_path] != fixture.__class__:
+            raise TypeError("All fixtures in a single file must have the same format.")
+
+        from .consume import TestCaseIndexFile
 
-        self.all_fixtures[fixture_path][info.id] = fixture
+        json_dict = fixture.json_dict_with_info()
+        json_fixture = json.dumps(json_dict)
+        self.pending_fixtures.setdefault(fixture_path, {})[info.id] = json_fixture
+        self.pending_size += len(json_fixture)
+        self.pending_test_cases.append(
+            TestCaseIndexFile(
+                id=info.id,
+                json_path=fixture_path.relative_to(self.output_dir),
+                fixture_hash=json_dict["_info"].get("hash"),
+                fork=fixture.get_fork(),
+                format=fixture.__class__,
+            )
+        )
+        if self.memory_budget is not None and self.pending_size > self.memory_budget:
+            self.flush_fixtures()
 
         return fixture_path
 
+    def flush_fixtures(self) -> None:
+        """
+        Write the serialized fixtures held by the collector to new shard files of their
+        respective fixture files.
+
+        The shard files are private to this collector and are merged into the final
+        fixture files by `merge_fixture_shards` at the end of the session, so the fixture
+        files don't depend on how often the fixtures were flushed. The index entries of the
+        fixtures are recorded along with them, see `pop_recorded_test_cases`.
+        """
+        if not self.pending_fixtures:
+            return
+        shard_name = f"{self.worker_id}-{next(_shard_sequence)}"
+        with profile_phase("file writing"):
+            for fixture_path, json_fixtures in self.pending_fixtures.items():
+                os.makedirs(fixture_path.parent, exist_ok=True)
+                shard_path = write_fixture_shard(fixture_path, shard_name, json_fixtures)
+                self.json_path_to_shards.setdefault(fixture_path, {})[shard_path] = list(
+                    json_fixtures
+                )
+            os.makedirs(self.output_dir / INDEX_ENTRIES_DIR, exist_ok=True)
+            with open(self.output_dir / INDEX_ENTRIES_DIR / f"{shard_name}.jsonl", "w") as f:
+                for test_case in self.pending_test_cases:
+                    f.write(test_case.model_dump_json() + "\n")
+        self.pending_fixtures.clear()
+        self.pending_test_cases.clear()
+        self.pending_size = 0
+
     def dump_fixtures(self) -> None:
-        """Dump all collected fixtures to their respective files."""
-        if self.output_dir.name == "stdout":
-            combined_fixtures = {
-                k: to_json(v) for fixture in self.all_fixtures.values() for k, v in fixture.items()
-            }
-            json.dump(combined_fixtures, sys.stdout, indent=4)
+        """Write all the fixtures that were not flushed yet to shard files."""
+        if self.stdout_writer is not None:
+            self.stdout_writer.close()
             return
         os.makedirs(self.output_dir, exist_ok=True)
-        for fixture_path, fixtures in self.all_fixtures.items():
-            os.makedirs(fixture_path.parent, exist_ok=True)
-            if len({fixture.__class__ for fixture in fixtures.values()}) != 1:
-                raise TypeError("All fixtures in a single file must have the same format.")
-            fixtures.collect_into_file(fixture_path)
-
-    def verify_fixture_files(self, evm_fixture_verification: FixtureVerifier) -> None:
-        """Run `evm [state|block]test` on each fixture."""
-        for fixture_path, name_fixture_dict in self.all_fixtures.items():
-            for _fixture_name, fixture in name_fixture_dict.items():
-                if evm_fixture_verification.is_verifiable(fixture.__class__):
-                    info = self.json_path_to_test_item[fixture_path]
-                    verify_fixtures_dump_dir = self._get_verify_fixtures_dump_dir(info)
-                    evm_fixture_verification.verify_fixture(
-                        fixture.__class__,
-                        fixture_path,
+        self.flush_fixtures()
+
+    def verify_fixture_files(
+        self, evm_fixture_verification: FixtureVerifier, max_workers: int | None = None
+    ) -> Dict[str, BaseException | None]:
+        """
+        Run `evm [state|block]test` on each fixture file.
+
+        The fixtures are verified using the shard files written by the collector, which
+        contain exactly the fixtures collected by this collector. Each shard file is
+        verified once, as all of its fixtures share the same format, and the files are
+        verified concurrently using up to `max_workers` threads.
+
+        If a dump directory is configured, the debug output of each shard file, including
+        the copy of the verified shard file as `fixtures.json`, is written to its own
+        sub-directory of the test's dump directory, named after the fixture format and the
+        shard file, so that concurrent verifications never overwrite each other's output.
+
+        Returns the verification result of each verified test, mapped by test id, where
+        `None` means that the test was verified successfully. Raises a
+        `FixtureVerificationError` if any of the tests failed verification.
+        """
+        results: Dict[str, BaseException | None] = {}
+        with (
+            profile_phase("fixture verification"),
+            ThreadPoolExecutor(max_workers=max_workers) as executor,
+        ):
+            futures: Dict[Path, Future] = {}
+            shard_fixture_names: Dict[Path, List[str]] = {}
+            for fixture_path, shards in self.json_path_to_shards.items():
+                fixture_format = self.json_path_to_fixture_format[fixture_path]
+                if not evm_fixture_verification.is_verifiable(fixture_format):
+                    continue
+                dump_dir = self._get_verify_fixtures_dump_dir(
+                    self.json_path_to_test_item[fixture_path]
+                )
+                if dump_dir:
+                    # The state and blockchain fixtures of a test share its dump directory.
+                    dump_dir = dump_dir / fixture_format.output_base_dir_name()
+                for shard_path, fixture_names in shards.items():
+                    futures[shard_path] = executor.submit(
+                        evm_fixture_verification.verify_fixture,
+                        fixture_format,
+                        shard_path,
                         fixture_name=None,
-                        debug_output_path=verify_fixtures_dump_dir,
+                        debug_output_path=dump_dir / shard_path.name if dump_dir else None,
                     )
+                    shard_fixture_names[shard_path] = fixture_names
+            for shard_path, future in futures.items():
+                exception = future.exception()
+                for fixture_name in shard_fixture_names[shard_path]:
+                    results[fixture_name] = exception
+
+        failures = {name: e for name, e in results.items() if e is not None}
+        if failures:
+            raise FixtureVerificationError(failures)
+        return results
 
     def _get_verify_fixtures_dump_dir(
         self,
@@ -0,0 +1,134 @@
+"""Compression formats supported for JSON fixture files."""
+
+import gzip
+import io
+from enum import Enum
+from pathlib import Path
+from typing import Any, BinaryIO, TextIO, cast
+
+
+def _import_zstandard() -> Any:
+    """Import the optional `zstandard` package, raising a helpful error if it is missing."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd compressed fixture files require the `zstandard` package; "
+            "install it with `uv pip install zstandard`."
+        ) from e
+    return zstandard
+
+
+class _ReproducibleGzipFile(gzip.GzipFile):
+    """
+    Gzip file written without the file name and modification time in its header, so that
+    compressing the same contents always gives the same bytes.
+    """
+
+    def __init__(self, path: Path, compresslevel: int):
+        self._raw_file: BinaryIO = open(path, "wb")
+        super().__init__(
+            filename="", mode="wb", compresslevel=compresslevel, fileobj=self._raw_file, mtime=0
+        )
+
+    def close(self) -> None:
+        """Flush the compressed stream and close the underlying file."""
+        try:
+            super().close()
+        finally:
+            self._raw_file.close()
+
+
+class FixtureFileCompression(str, Enum):
+    """Compression format of a JSON fixture file, determined by the file's suffix."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+    def __str__(self) -> str:
+        """Return the name of the compression format as used on the command line."""
+        return self.value
+
+    @property
+    def suffix(self) -> str:
+        """Return the suffix appended to the `.json` suffix of compressed fixture files."""
+        return _COMPRESSION_SUFFIXES[self]
+
+    @classmethod
+    def from_path(cls, path: Path) -> "FixtureFileCompression":
+        """Return the compression format of the file at the given path."""
+        for compression, suffix in _COMPRESSION_SUFFIXES.items():
+            if suffix and path.suffix == suffix:
+                return compression
+        return cls.NONE
+
+    @classmethod
+    def from_data(cls, data: bytes) -> "FixtureFileCompression":
+        """Return the compression format of the given data by inspecting its magic bytes."""
+        for compression, magic in _COMPRESSION_MAGIC.items():
+            if magic and data.startswith(magic):
+                return compression
+        return cls.NONE
+
+    def open(self, path: Path, mode: str = "r") -> TextIO:
+        """Open the file at the given path in text mode, (de)compressing it as a stream."""
+        assert mode in ("r", "w"), f"Unsupported mode: {mode}"
+        if self == FixtureFileCompression.GZIP:
+            if mode == "r":
+                return cast(TextIO, gzip.open(path, "rt", encoding="utf-8"))
+            # Level 6 is zlib's default and a much better trade-off than gzip's default of 9.
+            return io.TextIOWrapper(_ReproducibleGzipFile(path, compresslevel=6), encoding="utf-8")
+        if self == FixtureFileCompression.ZSTD:
+            return cast(TextIO, _import_zstandard().open(path, f"{mode}t", encoding="utf-8"))
+        return cast(TextIO, open(path, mode, encoding="utf-8"))
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress the given data."""
+        if self == FixtureFileCompression.GZIP:
+            return gzip.decompress(data)
+        if self == FixtureFileCompression.ZSTD:
+            decompressor = _import_zstandard().ZstdDecompressor()
+            with decompressor.stream_reader(data) as reader:
+                return reader.read()
+        return data
+
+
+_COMPRESSION_SUFFIXES = {
+    FixtureFileCompression.NONE: "",
+    FixtureFileCompression.GZIP: ".gz",
+    FixtureFileCompression.ZSTD: ".zst",
+}
+
+_COMPRESSION_MAGIC = {
+    FixtureFileCompression.NONE: b"",
+    FixtureFileCompression.GZIP: b"\x1f\x8b",
+    FixtureFileCompression.ZSTD: b"\x28\xb5\x2f\xfd",
+}
+
+
+def strip_compression_suffix(path: Path) -> Path:
+    """Return the path without the suffix of its compression format, if any."""
+    if FixtureFileCompression.from_path(path) != FixtureFileCompression.NONE:
+        return path.with_suffix("")
+    return path
+
+
+def is_fixture_file(path: Path) -> bool:
+    """Return whether the path points to a, possibly compressed, JSON fixture file."""
+    return strip_compression_suffix(path).suffix == ".json"
+
+
+def open_fixture_file(path: Path, mode: str = "r") -> TextIO:
+    """Open a, possibly compressed, fixture file in text mode based on its suffix."""
+    return FixtureFileCompression.from_path(path).open(path, mode)
+
+
+def read_fixture_file(path: Path) -> bytes:
+    """Read and decompress the contents of a, possibly compressed, fixture file."""
+    return FixtureFileCompression.from_path(path).decompress(path.read_bytes())
+
+
+def decompress_fixture_data(data: bytes) -> bytes:
+    """Decompress fixture data of any supported format, detected by its magic bytes."""
+    return FixtureFileCompression.from_data(data).decompress(data)
@@ -2,7 +2,7 @@
 
 import datetime
 from pathlib import Path
-from typing import List, TextIO
+from typing import BinaryIO, List, TextIO
 
 from pydantic import BaseModel, RootModel
 
@@ -10,7 +10,8 @@ from ethereum_test_base_types import HexNumber
 from ethereum_test_fixtures import FixtureFormat
 
 from .base import BaseFixture
-from .file import Fixtures
+from .compression import read_fixture_file
+from .stream import iter_fixture_stream
 
 
 class TestCaseBase(BaseModel):
@@ -108,9 +109,13 @@ class TestCases(RootModel):
         return f"{self.__class__.__name__}(root={self.root})"
 
     @classmethod
-    def from_stream(cls, fd: TextIO) -> "TestCases":
-        """Create a TestCases object from a stream."""
-        fixtures: Fixtures = Fixtures.model_validate_json(fd.read())
+    def from_stream(cls, fd: TextIO | BinaryIO) -> "TestCases":
+        """
+        Create a TestCases object from a stream.
+
+        The stream may contain plain or compressed (gzip or zstd) JSON fixtures, or JSON
+        Lines, in which case each fixture is parsed as soon as it's received.
+        """
         test_cases = [
             TestCaseStream(
                 id=fixture_name,
@@ -119,12 +124,12 @@ class TestCases(RootModel):
                 format=fixture.__class__,
                 fixture=fixture,
             )
-            for fixture_name, fixture in fixtures.items()
+            for fixture_name, fixture in iter_fixture_stream(fd)
         ]
         return cls(root=test_cases)
 
     @classmethod
     def from_index_file(cls, index_file: Path) -> "TestCases":
         """Create a TestCases object from an index file."""
-        index: IndexFile = IndexFile.model_validate_json(index_file.read_text())
+        index: IndexFile = IndexFile.model_validate_json(read_fixture_file(index_file))
         return cls(root=index.test_cases)
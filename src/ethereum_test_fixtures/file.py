@@ -1,15 +1,38 @@
 """Defines models for interacting with JSON fixture files."""
 
 import json
+import shutil
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List
 
 from filelock import FileLock
 from pydantic import SerializeAsAny
 
 from ethereum_test_base_types import EthereumTestRootModel
 
-from .base import BaseFixture
+from .base import BaseFixture, canonical_json_hash
+from .compression import (
+    FixtureFileCompression,
+    is_fixture_file,
+    open_fixture_file,
+    read_fixture_file,
+)
+from .store import (
+    CONTENT_KEY,
+    FIXTURE_STORE_DIR_NAME,
+    FORK_KEY,
+    FixtureStore,
+    contains_fixture_references,
+    resolve_fixture_references,
+    split_fixture_contents,
+)
+
+SHARD_FILE_SUFFIX = ".shard"
+
+# Size of the decompressed fixture files whose fixtures are kept parsed between the passes of
+# `deduplicate_fixtures`, so that the fixture files of most outputs are only parsed once.
+DEDUPLICATION_MEMORY_BUDGET = 1 << 30
 
 
 class Fixtures(EthereumTestRootModel):
@@ -50,6 +73,17 @@ class Fixtures(EthereumTestRootModel):
     def items(self):  # noqa: D102
         return self.root.items()
 
+    @classmethod
+    def from_file(cls, file_path: Path) -> "Fixtures":
+        """
+        Load the fixtures from a, possibly compressed, JSON fixture file, resolving the
+        references to fixtures of the output's fixture store, if any.
+        """
+        data = read_fixture_file(file_path)
+        if contains_fixture_references(data):
+            return cls.model_validate(resolve_fixture_references(json.loads(data), file_path))
+        return cls.model_validate_json(data)
+
     def collect_into_file(self, file_path: Path):
         """
         For all formats, we join the fixtures as json into a single file.
@@ -61,10 +95,202 @@ class Fixtures(EthereumTestRootModel):
         lock_file_path = file_path.with_suffix(".lock")
         with FileLock(lock_file_path):
             if file_path.exists():
-                with open(file_path, "r") as f:
+                with open_fixture_file(file_path, "r") as f:
                     json_fixtures = json.load(f)
             for name, fixture in self.items():
                 json_fixtures[name] = fixture.json_dict_with_info()
 
-            with open(file_path, "w") as f:
-                json.dump(dict(sorted(json_fixtures.items())), f, indent=4)
+            write_json_fixtures(file_path, json_fixtures)
+
+    def collect_into_shard(self, file_path: Path, shard_name: str) -> Path:
+        """
+        Write the fixtures into a private shard file that belongs to `file_path`.
+
+        Shard files are written by a single writer only and therefore require no
+        locking; they are combined into `file_path` by `merge_fixture_shards` once
+        all the writers are done. The shard name must not contain any dots.
+        """
+        return write_fixture_shard(
+            file_path,
+            shard_name,
+            {name: json.dumps(fixture.json_dict_with_info()) for name, fixture in self.items()},
+        )
+
+
+def write_fixture_shard(file_path: Path, shard_name: str, json_fixtures: Dict[str, str]) -> Path:
+    """
+    Write already serialized fixtures, mapped by name, into a private shard file that belongs
+    to `file_path`, see `Fixtures.collect_into_shard`.
+    """
+    shard_path = file_path.with_name(f"{file_path.name}.{shard_name}{SHARD_FILE_SUFFIX}")
+    with open(shard_path, "w") as f:
+        f.write("{")
+        f.write(
+            ", ".join(f"{json.dumps(name)}: {fixture}" for name, fixture in json_fixtures.items())
+        )
+        f.write("}")
+    return shard_path
+
+
+def merge_fixture_shards(output_dir: Path) -> Dict[Path, int]:
+    """
+    Merge all the shard files found in `output_dir` into their fixture files.
+
+    The resulting fixture files are identical to the ones produced by
+    `Fixtures.collect_into_file`, including the fixtures of any fixture file that
+    already existed. Fixture files with a compression suffix (e.g. `.json.gz`) are
+    compressed as they are written. Shard files are removed after merging.
+
+    Returns the fixture files that were written, mapped to their number of fixtures.
+    """
+    shards: Dict[Path, List[Path]] = {}
+    for shard_path in output_dir.rglob(f"*{SHARD_FILE_SUFFIX}"):
+        # "<file>.json[.gz].<shard_name>.shard" -> "<file>.json[.gz]"
+        file_path = shard_path.with_suffix("").with_suffix("")
+        shards.setdefault(file_path, []).append(shard_path)
+
+    fixture_counts: Dict[Path, int] = {}
+    for file_path, shard_paths in shards.items():
+        json_fixtures: Dict[str, Dict[str, Any]] = {}
+        if file_path.exists():
+            with open_fixture_file(file_path, "r") as f:
+                json_fixtures = json.load(f)
+        for shard_path in sorted(shard_paths):
+            with open(shard_path, "r") as f:
+                json_fixtures.update(json.load(f))
+
+        write_json_fixtures(file_path, json_fixtures)
+        for shard_path in shard_paths:
+            shard_path.unlink()
+        fixture_counts[file_path] = len(json_fixtures)
+    return fixture_counts
+
+
+def write_json_fixtures(file_path: Path, json_fixtures: Dict[str, Dict[str, Any]]) -> None:
+    """Write the fixtures, sorted by name, to a, possibly compressed, fixture file."""
+    with open_fixture_file(file_path, "w") as f:
+        json.dump(dict(sorted(json_fixtures.items())), f, indent=4)
+
+
+def merge_fixture_outputs(input_dirs: List[Path], output_dir: Path) -> List[Path]:
+    """
+    Merge the fixture files of several output directories into `output_dir`.
+
+    The inputs are outputs of `fill` for disjoint sets of tests, e.g. filled by different
+    shards. A fixture file written by a single input is copied as is; a fixture file written
+    by multiple inputs is combined as by `Fixtures.collect_into_file`, so the merged files
+    are identical to the ones of a single `fill` run for all the tests. The fixture stores of
+    the inputs are combined, and files in the `.meta` directories of the inputs are not
+    merged.
+
+    Returns the list of fixture files that were written, relative to `output_dir`.
+
+    Raises:
+        ValueError: If a fixture is contained in more than one input.
+
+    """
+    sources: Dict[Path, List[Path]] = {}
+    for input_dir in input_dirs:
+        for file_path in sorted(input_dir.rglob("*")):
+            relative_path = file_path.relative_to(input_dir)
+            if relative_path.parts[0] == ".meta" or not file_path.is_file():
+                continue
+            if relative_path.parts[0] == FIXTURE_STORE_DIR_NAME:
+                # Stored fixtures are named after their contents, so any copy will do.
+                if not (output_dir / relative_path).exists():
+                    (output_dir / relative_path).parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(file_path, output_dir / relative_path)
+                continue
+            if not is_fixture_file(file_path):
+                continue
+            sources.setdefault(relative_path, []).append(file_path)
+
+    for relative_path, source_paths in sources.items():
+        file_path = output_dir / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if len(source_paths) == 1:
+            shutil.copyfile(source_paths[0], file_path)
+            continue
+        json_fixtures: Dict[str, Dict[str, Any]] = {}
+        for source_path in source_paths:
+            with open_fixture_file(source_path, "r") as f:
+                source_fixtures = json.load(f)
+            if duplicates := source_fixtures.keys() & json_fixtures.keys():
+                raise ValueError(
+                    f"fixture {sorted(duplicates)[0]} of {relative_path} is contained in "
+                    "more than one input"
+                )
+            json_fixtures.update(source_fixtures)
+        write_json_fixtures(file_path, json_fixtures)
+    return list(sources.keys())
+
+
+def iter_output_fixture_files(output_dir: Path) -> Iterator[Path]:
+    """Yield the fixture files of an output, excluding its metadata and its fixture store."""
+    for file_path in sorted(output_dir.rglob("*")):
+        relative_parts = file_path.relative_to(output_dir).parts
+        if relative_parts[0] in (".meta", FIXTURE_STORE_DIR_NAME):
+            continue
+        if file_path.name == "index.json" or not is_fixture_file(file_path):
+            continue
+        if file_path.is_file():
+            yield file_path
+
+
+def deduplicate_fixtures(
+    output_dir: Path, memory_budget: int = DEDUPLICATION_MEMORY_BUDGET
+) -> int:
+    """
+    Move the fixtures of an output whose fork-independent contents are shared by other
+    fixtures of the output to the output's fixture store, and replace them by references.
+
+    Stored fixtures count as sharing their contents, so an output can be deduplicated
+    again, e.g. after merging the outputs of several shards. Only the fixture files that
+    contain fixtures to be stored are rewritten; they are parsed again only if they don't fit
+    in the memory budget, in bytes of decompressed fixture files.
+
+    Returns the number of fixtures that were moved to the store.
+    """
+    digest_counts: Counter[str] = Counter()
+    # The hashes of the contents of the fixtures that can be stored, by fixture file.
+    inline_digests: Dict[Path, Dict[str, str]] = {}
+    parsed_files: Dict[Path, Dict[str, Dict[str, Any]]] = {}
+    parsed_size = 0
+    for file_path in iter_output_fixture_files(output_dir):
+        data = read_fixture_file(file_path)
+        json_fixtures = json.loads(data)
+        for name, json_fixture in json_fixtures.items():
+            if CONTENT_KEY in json_fixture:
+                digest_counts[json_fixture[CONTENT_KEY]] += 1
+            elif (split_fixture := split_fixture_contents(json_fixture)) is not None:
+                digest = canonical_json_hash(split_fixture[0])
+                digest_counts[digest] += 1
+                inline_digests.setdefault(file_path, {})[name] = digest
+        if file_path in inline_digests and parsed_size + len(data) <= memory_budget:
+            parsed_files[file_path] = json_fixtures
+            parsed_size += len(data)
+
+    store = FixtureStore(output_dir / FIXTURE_STORE_DIR_NAME)
+    stored_fixtures = 0
+    for file_path, digests in inline_digests.items():
+        json_fixtures = parsed_files.pop(file_path, None)
+        shared_names = [name for name, digest in digests.items() if digest_counts[digest] > 1]
+        if not shared_names:
+            continue
+        if json_fixtures is None:
+            json_fixtures = json.loads(read_fixture_file(file_path))
+        compression = FixtureFileCompression.from_path(file_path)
+        for name in shared_names:
+            split_fixture = split_fixture_contents(json_fixtures[name])
+            assert split_fixture is not None
+            contents, fork = split_fixture
+            reference: Dict[str, Any] = {
+                CONTENT_KEY: store.add(contents, compression, digest=digests[name])
+            }
+            if fork is not None:
+                reference[FORK_KEY] = fork
+            reference["_info"] = json_fixtures[name]["_info"]
+            json_fixtures[name] = reference
+        write_json_fixtures(file_path, json_fixtures)
+        stored_fixtures += len(shared_names)
+    return stored_fixtures
@@ -0,0 +1,206 @@
+"""
+Phase profiler used to measure where the time of a fill run is spent.
+
+The profiler is disabled by default, in which case `profile_phase` returns a no-op
+context manager. When enabled, each phase records its inclusive and exclusive
+(self) duration and the test it belongs to. The recorded events of each process
+can be dumped to a file and aggregated into a ranked report and a trace-event
+file that can be loaded into viewers such as Perfetto or `chrome://tracing`.
+"""
+
+import json
+import os
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterable, List
+
+# Names of the report and trace-event files exported to the `.meta` directory of the output,
+# and of the directory where each process dumps its events before they're aggregated.
+PHASE_PROFILE_FILE_NAME = "phase_profile.json"
+PHASE_TRACE_FILE_NAME = "phase_profile.trace.json"
+PHASE_EVENTS_DIR_NAME = "phase_profile"
+
+
+@dataclass(kw_only=True)
+class PhaseEvent:
+    """Time spent in a single phase of fixture generation."""
+
+    name: str
+    test_id: str
+    process: str
+    start_ns: int  # wall-clock time, so events of different processes can be aligned
+    duration_ns: int
+    self_duration_ns: int
+    depth: int
+
+
+@dataclass(kw_only=True)
+class PhaseSummary:
+    """Aggregated time spent in one phase across all tests."""
+
+    name: str
+    count: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+    max_ns: int = 0
+
+    def add(self, event: PhaseEvent) -> None:
+        """Add the event to the summary."""
+        self.count += 1
+        self.total_ns += event.duration_ns
+        self.self_ns += event.self_duration_ns
+        self.max_ns = max(self.max_ns, event.duration_ns)
+
+
+class _Phase:
+    """Context manager that records the duration of a phase in the profiler."""
+
+    __slots__ = ("profiler", "name", "start_ns")
+
+    def __init__(self, profiler: "PhaseProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start_ns = 0
+
+    def __enter__(self) -> None:
+        self.profiler._child_durations.append(0)
+        self.start_ns = time.perf_counter_ns()
+
+    def __exit__(self, *args) -> None:
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        profiler = self.profiler
+        child_durations_ns = profiler._child_durations.pop()
+        if profiler._child_durations:
+            profiler._child_durations[-1] += duration_ns
+        profiler.events.append(
+            PhaseEvent(
+                name=self.name,
+                test_id=profiler.test_id,
+                process=profiler.process,
+                start_ns=self.start_ns + profiler._wall_clock_offset_ns,
+                duration_ns=duration_ns,
+                self_duration_ns=duration_ns - child_durations_ns,
+                depth=len(profiler._child_durations),
+            )
+        )
+
+
+@dataclass(kw_only=True)
+class PhaseProfiler:
+    """Records the time spent in the phases of fixture generation of a single process."""
+
+    enabled: bool = False
+    process: str = "master"
+    test_id: str = ""
+    events: List[PhaseEvent] = field(default_factory=list)
+
+    _child_durations: List[int] = field(default_factory=list)
+    _wall_clock_offset_ns: int = field(
+        default_factory=lambda: time.time_ns() - time.perf_counter_ns()
+    )
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """Return a context manager that records the time spent in the phase."""
+        if not self.enabled:
+            return nullcontext()
+        return _Phase(self, name)
+
+    def dump(self, path: Path) -> None:
+        """Write the recorded events to a json file."""
+        with open(path, "w") as f:
+            json.dump([asdict(event) for event in self.events], f)
+
+
+PROFILER = PhaseProfiler()
+"""Profiler of the current process."""
+
+
+def profile_phase(name: str) -> ContextManager[None]:
+    """Record the time spent in the phase using the profiler of the current process."""
+    return PROFILER.phase(name)
+
+
+def load_phase_events(paths: Iterable[Path]) -> List[PhaseEvent]:
+    """Load the events dumped by the profilers of one or more processes."""
+    events: List[PhaseEvent] = []
+    for path in paths:
+        with open(path) as f:
+            events.extend(PhaseEvent(**event) for event in json.load(f))
+    return events
+
+
+def summarize_phases(events: Iterable[PhaseEvent]) -> List[PhaseSummary]:
+    """Aggregate the events by phase, ranked by the exclusive time spent in each phase."""
+    summaries: Dict[str, PhaseSummary] = {}
+    for event in events:
+        summaries.setdefault(event.name, PhaseSummary(name=event.name)).add(event)
+    return sorted(summaries.values(), key=lambda summary: summary.self_ns, reverse=True)
+
+
+def summarize_tests(events: Iterable[PhaseEvent]) -> List[tuple[str, int]]:
+    """Return the total time recorded for each test, slowest first."""
+    totals: Dict[str, int] = {}
+    for event in events:
+        totals[event.test_id] = totals.get(event.test_id, 0) + event.self_duration_ns
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def format_phase_report(events: List[PhaseEvent], slowest_tests: int = 10) -> str:
+    """Format a ranked report of the time spent in each phase and the slowest tests."""
+    summaries = summarize_phases(events)
+    total_ns = sum(summary.self_ns for summary in summaries) or 1
+    lines = [
+        f"{'phase':<28} {'self (s)':>10} {'self %':>7} {'total (s)':>10} "
+        f"{'count':>8} {'mean (ms)':>10} {'max (ms)':>10}"
+    ]
+    for summary in summaries:
+        lines.append(
+            f"{summary.name:<28} {summary.self_ns / 1e9:>10.3f} "
+            f"{100 * summary.self_ns / total_ns:>6.1f}% {summary.total_ns / 1e9:>10.3f} "
+            f"{summary.count:>8} {summary.total_ns / summary.count / 1e6:>10.3f} "
+            f"{summary.max_ns / 1e6:>10.3f}"
+        )
+    if slowest_tests:
+        lines.append("")
+        lines.append(f"{slowest_tests} slowest tests (s):")
+        for test_id, test_ns in summarize_tests(events)[:slowest_tests]:
+            lines.append(f"{test_ns / 1e9:>10.3f} {test_id}")
+    return "\n".join(lines)
+
+
+def phase_report_json(events: List[PhaseEvent]) -> Dict[str, Any]:
+    """Return the aggregated phase and test timings as a json serializable dict."""
+    return {
+        "phases": [asdict(summary) for summary in summarize_phases(events)],
+        "tests": dict(summarize_tests(events)),
+    }
+
+
+def trace_events_json(events: List[PhaseEvent]) -> Dict[str, Any]:
+    """
+    Return the events in the Trace Event Format (complete events, in microseconds).
+
+    Each process (e.g. xdist worker) is shown as a separate track.
+    """
+    processes = sorted({event.process for event in events})
+    tids = {process: tid for tid, process in enumerate(processes)}
+    trace_events: List[Dict[str, Any]] = [
+        {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": p}}
+        for p, tid in tids.items()
+    ]
+    for event in sorted(events, key=lambda e: (e.start_ns, -e.duration_ns)):
+        trace_events.append(
+            {
+                "name": event.name,
+                "cat": "fill",
+                "ph": "X",
+                "ts": event.start_ns / 1000,
+                "dur": event.duration_ns / 1000,
+                "pid": os.getpid(),
+                "tid": tids[event.process],
+                "args": {"test": event.test_id},
+            }
+        )
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
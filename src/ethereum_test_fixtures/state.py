@@ -1,6 +1,6 @@
 """StateTest types."""
 
-from typing import ClassVar, List, Mapping, Sequence
+from typing import Any, ClassVar, Dict, List, Mapping, Sequence, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -118,3 +118,14 @@ class StateFixture(BaseFixture):
         forks = list(self.post.keys())
         assert len(forks) == 1, "Expected state test fixture with single fork"
         return forks[0]
+
+    @classmethod
+    def split_fork(cls, json_dict: Dict[str, Any]) -> Tuple[Dict[str, Any], str | None]:
+        """Split the fork from the `post` field, which maps the fork to its post."""
+        ((fork, post),) = json_dict["post"].items()
+        return {**json_dict, "post": post}, fork
+
+    @classmethod
+    def join_fork(cls, json_dict: Dict[str, Any], fork: str | None) -> Dict[str, Any]:
+        """Map the fork back to its post in the `post` field."""
+        return {**json_dict, "post": {fork: json_dict["post"]}}
@@ -0,0 +1,151 @@
+"""
+Content-addressed store of the fixtures that are shared by several tests.
+
+Many tests generate fixtures that are identical apart from their name and their fork, e.g.
+for all the forks in which the feature under test behaves the same. When an output is
+deduplicated, the fork-independent part of each such fixture, as split by
+`BaseFixture.split_fork`, is stored once in the `fixture_store` directory of the output,
+named after its hash, and each fixture file entry only contains a reference to it:
+
+```json
+"tests/.../test_x.py::test_x[fork_Cancun-state_test]": {
+    "_content": "0x<hash of the fork-independent fields>",
+    "_fork": "Cancun",
+    "_info": {...}
+}
+```
+
+The `_info` field, including the hash of the fixture, is kept as is, so the index and the
+hash of the output are the same as without deduplication. `Fixtures.from_file` resolves
+the references transparently.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from .base import BaseFixture, canonical_json_hash
+from .compression import FixtureFileCompression, read_fixture_file
+
+FIXTURE_STORE_DIR_NAME = "fixture_store"
+CONTENT_KEY = "_content"
+FORK_KEY = "_fork"
+
+
+class FixtureStore:
+    """A directory of fixture contents, named after their hash."""
+
+    def __init__(self, root: Path):
+        """Initialize the store in the given directory."""
+        self.root = root
+
+    def path(self, digest: str, compression: FixtureFileCompression) -> Path:
+        """Return the path of the contents with the given hash."""
+        hex_digest = digest.removeprefix("0x")
+        return self.root / hex_digest[:2] / f"{hex_digest}.json{compression.suffix}"
+
+    def find(self, digest: str) -> Path | None:
+        """Return the path of the contents with the given hash, if they are stored."""
+        for compression in FixtureFileCompression:
+            path = self.path(digest, compression)
+            if path.is_file():
+                return path
+        return None
+
+    def add(
+        self,
+        contents: Dict[str, Any],
+        compression: FixtureFileCompression = FixtureFileCompression.NONE,
+        digest: str | None = None,
+    ) -> str:
+        """
+        Store the contents, unless they are already stored, and return their hash, which is
+        computed unless given.
+
+        The contents are written to a temporary file that is then renamed, so concurrent
+        writers of the same contents never expose a partially written file.
+        """
+        if digest is None:
+            digest = canonical_json_hash(contents)
+        if self.find(digest) is None:
+            path = self.path(digest, compression)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with compression.open(temp_path, "w") as f:
+                json.dump(contents, f, indent=4)
+            os.replace(temp_path, path)
+        return digest
+
+    def load(self, digest: str) -> Dict[str, Any]:
+        """Load the contents with the given hash."""
+        path = self.find(digest)
+        if path is None:
+            raise FileNotFoundError(f"fixture contents {digest} not found in {self.root}")
+        return json.loads(read_fixture_file(path))
+
+
+def find_fixture_store(file_path: Path) -> FixtureStore | None:
+    """Return the store of the output that contains the fixture file, if any."""
+    for directory in file_path.absolute().parents:
+        if (directory / FIXTURE_STORE_DIR_NAME).is_dir():
+            return FixtureStore(directory / FIXTURE_STORE_DIR_NAME)
+    return None
+
+
+def contains_fixture_references(data: bytes) -> bool:
+    """Return whether the contents of a fixture file may contain references to a store."""
+    return f'"{CONTENT_KEY}"'.encode() in data
+
+
+def resolve_fixture_references(
+    json_fixtures: Dict[str, Dict[str, Any]], file_path: Path
+) -> Dict[str, Dict[str, Any]]:
+    """Replace the references of the fixtures of a fixture file by the referenced fixtures."""
+    store: FixtureStore | None = None
+    contents: Dict[str, Dict[str, Any]] = {}
+    resolved_fixtures: Dict[str, Dict[str, Any]] = {}
+    for name, json_fixture in json_fixtures.items():
+        if CONTENT_KEY not in json_fixture:
+            resolved_fixtures[name] = json_fixture
+            continue
+        if store is None:
+            store = find_fixture_store(file_path)
+            if store is None:
+                raise FileNotFoundError(
+                    f"{file_path} references stored fixtures, but no `{FIXTURE_STORE_DIR_NAME}` "
+                    "directory was found in its parent directories"
+                )
+        digest = json_fixture[CONTENT_KEY]
+        if digest not in contents:
+            contents[digest] = store.load(digest)
+        info = json_fixture["_info"]
+        fixture_format = BaseFixture.formats[info["fixture_format"]]
+        resolved_fixtures[name] = {
+            **fixture_format.join_fork(contents[digest], json_fixture.get(FORK_KEY)),
+            "_info": info,
+        }
+    return resolved_fixtures
+
+
+def read_resolved_fixture_file(file_path: Path) -> bytes:
+    """Read and decompress a fixture file and resolve the references to stored fixtures."""
+    data = read_fixture_file(file_path)
+    if not contains_fixture_references(data):
+        return data
+    json_fixtures = resolve_fixture_references(json.loads(data), file_path)
+    return json.dumps(json_fixtures, indent=4).encode()
+
+
+def split_fixture_contents(
+    json_fixture: Dict[str, Any],
+) -> Tuple[Dict[str, Any], str | None] | None:
+    """
+    Return the fork-independent contents and the fork of an unresolved fixture, or `None` if
+    the fixture can't be stored, e.g. because it was not generated by `fill`.
+    """
+    fixture_format_name = json_fixture.get("_info", {}).get("fixture_format")
+    if CONTENT_KEY in json_fixture or fixture_format_name not in BaseFixture.formats:
+        return None
+    fixture_format = BaseFixture.formats[fixture_format_name]
+    return fixture_format.split_fork({k: v for k, v in json_fixture.items() if k != "_info"})
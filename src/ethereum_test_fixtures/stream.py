@@ -0,0 +1,116 @@
+"""
+Streaming of fixtures to and from text streams, such as stdout/stdin.
+
+Fixtures are written one at a time as soon as they are generated, in one of two formats:
+
+- `json`: a single JSON object mapping fixture names to fixtures, formatted as by
+    `json.dump(fixtures, fd, indent=4)`, but written incrementally.
+- `jsonl`: JSON Lines, where each line is a compact JSON object containing a single
+    fixture, mapped by its name.
+
+In both formats, the fixtures are written in the order in which they're generated, not
+grouped by the fixture file they would be written to, so consumers must not rely on the
+order of the fixtures.
+
+The reader detects the format automatically and, for JSON Lines, parses each fixture as
+soon as its line is received.
+"""
+
+import json
+from enum import Enum
+from typing import BinaryIO, Iterable, Iterator, TextIO, Tuple
+
+from pydantic import ValidationError
+
+from ethereum_test_base_types import to_json
+
+from .base import BaseFixture
+from .compression import FixtureFileCompression, decompress_fixture_data
+from .file import Fixtures
+
+
+class FixtureStreamFormat(str, Enum):
+    """Format used to stream fixtures."""
+
+    JSON = "json"
+    JSONL = "jsonl"
+
+    def __str__(self) -> str:
+        """Return the name of the stream format as used on the command line."""
+        return self.value
+
+
+class FixtureStreamWriter:
+    """Write fixtures to a text stream as soon as they are added."""
+
+    def __init__(self, fd: TextIO, stream_format: FixtureStreamFormat = FixtureStreamFormat.JSON):
+        """Initialize the writer."""
+        self.fd = fd
+        self.stream_format = stream_format
+        self.count = 0
+
+    def write(self, name: str, fixture: BaseFixture) -> None:
+        """Write the fixture to the stream and flush it, so it's readily available."""
+        if self.stream_format == FixtureStreamFormat.JSONL:
+            self.fd.write(json.dumps({name: to_json(fixture)}, separators=(",", ":")) + "\n")
+        else:
+            # Strip the enclosing braces of the single-entry object, keeping the indentation
+            # of the entry as if it was dumped as part of the object of all fixtures.
+            entry = json.dumps({name: to_json(fixture)}, indent=4)[2:-2]
+            self.fd.write(("{\n" if self.count == 0 else ",\n") + entry)
+        self.fd.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        """Terminate the stream."""
+        if self.stream_format == FixtureStreamFormat.JSON:
+            self.fd.write("{}" if self.count == 0 else "\n}")
+        self.fd.flush()
+
+
+def _parse_json_line(line: bytes) -> Fixtures | None:
+    """Parse the line as a complete JSON object of fixtures, or return None if it's partial."""
+    try:
+        return Fixtures.model_validate_json(line)
+    except ValidationError as e:
+        if all(error["type"] == "json_invalid" for error in e.errors()):
+            return None
+        raise
+
+
+def _iter_fixture_lines(lines: Iterator[bytes]) -> Iterator[Tuple[str, BaseFixture]]:
+    """Yield the fixtures contained in the lines of a stream."""
+    for first_line in lines:
+        if first_line.strip():
+            break
+    else:
+        return
+
+    if FixtureFileCompression.from_data(first_line) != FixtureFileCompression.NONE:
+        data = decompress_fixture_data(first_line + b"".join(lines))
+        yield from _iter_fixture_lines(iter(data.splitlines(keepends=True)))
+        return
+
+    fixtures = _parse_json_line(first_line)
+    if fixtures is None:
+        # Not JSON Lines: the first line is part of a JSON object spanning multiple lines.
+        yield from Fixtures.model_validate_json(first_line + b"".join(lines)).items()
+        return
+    yield from fixtures.items()
+    for line in lines:
+        if line.strip():
+            yield from Fixtures.model_validate_json(line).items()
+
+
+def iter_fixture_stream(fd: TextIO | BinaryIO) -> Iterator[Tuple[str, BaseFixture]]:
+    """
+    Yield the fixtures of a stream, in any of the `FixtureStreamFormat` formats.
+
+    JSON Lines streams are parsed line by line as they are received; other JSON streams,
+    and compressed (gzip or zstd) streams, are parsed once they have been fully received.
+    """
+    # Read the underlying binary buffer of text streams such as `sys.stdin`.
+    stream: Iterable[bytes | str] = getattr(fd, "buffer", fd)
+    yield from _iter_fixture_lines(
+        line.encode("utf-8") if isinstance(line, str) else line for line in stream
+    )
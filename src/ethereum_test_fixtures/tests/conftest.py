@@ -0,0 +1,26 @@
+"""Common fixtures for the fixture tests."""
+
+from pathlib import Path
+
+import pytest
+
+from ..file import Fixtures
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "ethereum_test_specs" / "tests" / "fixtures"
+
+
+@pytest.fixture
+def fixtures() -> Fixtures:
+    """Return a set of fixtures loaded from the spec tests' fixture files."""
+    all_fixtures = Fixtures(root={})
+    for file_name in [
+        "chainid_cancun_state_test_tx_type_0.json",
+        "chainid_cancun_state_test_tx_type_1.json",
+        "chainid_paris_state_test_tx_type_0.json",
+        "chainid_shanghai_state_test_tx_type_0.json",
+    ]:
+        loaded = Fixtures.model_validate_json((FIXTURES_DIR / file_name).read_text())
+        for name, fixture in loaded.items():
+            all_fixtures[f"{file_name}::{name}"] = fixture
+    assert len(all_fixtures) == 4
+    return all_fixtures
@@ -0,0 +1,46 @@
+"""Test the base fixture definitions."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from ..base import canonical_json_hash
+from ..file import Fixtures
+
+FIXTURES_DIR = Path(__file__).parents[2] / "ethereum_test_specs" / "tests" / "fixtures"
+
+
+def legacy_hash(json_dict: Dict[str, Any]) -> str:
+    """Return the hash of a fixture as originally computed."""
+    json_str = json.dumps(json_dict, sort_keys=True, separators=(",", ":"))
+    return f"0x{hashlib.sha256(json_str.encode('utf-8')).hexdigest()}"
+
+
+@pytest.mark.parametrize(
+    "fixture_file",
+    sorted(path.name for path in FIXTURES_DIR.glob("*.json")),
+)
+def test_fixture_hash(fixture_file: str):
+    """Test that the hash of the fixtures matches the hash originally computed."""
+    try:
+        fixtures = Fixtures.from_file(FIXTURES_DIR / fixture_file)
+    except Exception:
+        pytest.skip(f"{fixture_file} is not a fixture file of a registered format")
+    for fixture in fixtures.values():
+        assert fixture.hash == legacy_hash(fixture.json_dict)
+
+
+@pytest.mark.parametrize(
+    "json_dict",
+    [
+        {},
+        {"b": [1, 2.5, None, True], "a": {"d": "0x00", "c": []}},
+        {"comment": 'non-ASCII é€\U0001f600 and "escaped" \\ characters\n'},
+    ],
+)
+def test_canonical_json_hash(json_dict: Dict[str, Any]):
+    """Test that the canonical JSON hash matches the hash originally computed."""
+    assert canonical_json_hash(json_dict) == legacy_hash(json_dict)
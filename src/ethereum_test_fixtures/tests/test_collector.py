@@ -0,0 +1,142 @@
+"""Test the fixture collector."""
+
+import threading
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from ..base import FixtureFormat
+from ..collector import FixtureCollector
+from ..collector import TestInfo as FixtureTestInfo
+from ..file import Fixtures, merge_fixture_shards
+from ..state import StateFixture
+from ..verify import FixtureVerificationError, FixtureVerifier
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "ethereum_test_specs" / "tests" / "fixtures"
+
+
+class CountingVerifier(FixtureVerifier):
+    """Fixture verifier that records each call and optionally fails a given file."""
+
+    def __init__(self, failing_file_prefix: str | None = None):
+        """Initialize the verifier."""
+        self.calls: List[Tuple[FixtureFormat, Path]] = []
+        self.debug_output_paths: List[Path | None] = []
+        self.failing_file_prefix = failing_file_prefix
+        self.lock = threading.Lock()
+
+    def is_verifiable(self, fixture_format: FixtureFormat) -> bool:
+        """Only state fixtures are verifiable."""
+        return fixture_format == StateFixture
+
+    def verify_fixture(
+        self,
+        fixture_format: FixtureFormat,
+        fixture_path: Path,
+        fixture_name: str | None = None,
+        debug_output_path: Path | None = None,
+    ):
+        """Record the call and fail if the file matches the failing prefix."""
+        assert fixture_path.exists()
+        with self.lock:
+            self.calls.append((fixture_format, fixture_path))
+            self.debug_output_paths.append(debug_output_path)
+        if self.failing_file_prefix and fixture_path.name.startswith(self.failing_file_prefix):
+            raise Exception(f"verification failed: {fixture_path.name}")
+
+
+def collect_fixtures(
+    tmp_path: Path, memory_budget: int | None = None, base_dump_dir: Path | None = None
+) -> FixtureCollector:
+    """Return a collector with two state test files containing several fixtures each."""
+    collector = FixtureCollector(
+        output_dir=tmp_path / "fixtures",
+        flat_output=False,
+        single_fixture_per_file=False,
+        filler_path=tmp_path / "tests",
+        base_dump_dir=base_dump_dir,
+        memory_budget=memory_budget,
+    )
+    state_fixture = next(
+        iter(
+            Fixtures.model_validate_json(
+                (FIXTURES_DIR / "chainid_cancun_state_test_tx_type_0.json").read_text()
+            ).values()
+        )
+    )
+    for function_name in ["test_one", "test_two"]:
+        for param in range(3):
+            info = FixtureTestInfo(
+                name=f"{function_name}[fork_Cancun-state_test-param_{param}]",
+                id=f"tests/cancun/test_module.py::{function_name}[fork_Cancun-param_{param}]",
+                original_name=function_name,
+                path=tmp_path / "tests" / "cancun" / "test_module.py",
+            )
+            collector.add_fixture(info, state_fixture)
+    collector.dump_fixtures()
+    return collector
+
+
+@pytest.fixture
+def collector(tmp_path: Path) -> FixtureCollector:
+    """Return a collector with two state test files containing several fixtures each."""
+    return collect_fixtures(tmp_path)
+
+
+def test_verify_fixture_files_once_per_file(collector: FixtureCollector):
+    """Test that each fixture file is verified once and the result mapped to each test."""
+    verifier = CountingVerifier()
+    results = collector.verify_fixture_files(verifier, max_workers=2)
+    assert len(verifier.calls) == 2
+    assert {fixture_format for fixture_format, _ in verifier.calls} == {StateFixture}
+    assert len(results) == 6
+    assert all(result is None for result in results.values())
+
+
+def test_verify_fixture_files_failure(collector: FixtureCollector):
+    """Test that a failed file verification is mapped back to all the tests in the file."""
+    verifier = CountingVerifier(failing_file_prefix="one")
+    with pytest.raises(FixtureVerificationError) as exc_info:
+        collector.verify_fixture_files(verifier, max_workers=2)
+    assert len(verifier.calls) == 2
+    failures = exc_info.value.failures
+    assert len(failures) == 3
+    assert all("test_one" in test_id for test_id in failures)
+    assert str(exc_info.value).count("verification failed: ") == 1
+
+
+def test_verify_fixture_files_debug_output(tmp_path: Path):
+    """Test that each verified shard file gets its own debug output directory."""
+    collector = collect_fixtures(tmp_path, memory_budget=0, base_dump_dir=tmp_path / "dump")
+    verifier = CountingVerifier()
+    collector.verify_fixture_files(verifier, max_workers=2)
+    debug_output_paths = verifier.debug_output_paths
+    assert len(debug_output_paths) == len(set(debug_output_paths)) == 6
+    for debug_output_path, (_, shard_path) in zip(debug_output_paths, verifier.calls, strict=True):
+        assert debug_output_path is not None
+        assert debug_output_path.name == shard_path.name
+        assert debug_output_path.parent.name == StateFixture.output_base_dir_name()
+        assert debug_output_path.is_relative_to(tmp_path / "dump")
+
+
+@pytest.mark.parametrize("memory_budget", [0, 3_000])
+def test_memory_budget(tmp_path: Path, memory_budget: int):
+    """Test that flushing the fixtures within a memory budget doesn't change the output."""
+    expected_collector = collect_fixtures(tmp_path / "expected")
+    collector = collect_fixtures(tmp_path / "budget", memory_budget=memory_budget)
+    assert collector.pending_size == 0
+    shard_counts = [len(shards) for shards in collector.json_path_to_shards.values()]
+    assert sum(shard_counts) > len(shard_counts)
+
+    verifier = CountingVerifier()
+    results = collector.verify_fixture_files(verifier)
+    assert len(verifier.calls) == sum(shard_counts)
+    assert results == expected_collector.verify_fixture_files(CountingVerifier())
+
+    expected_files = merge_fixture_shards(expected_collector.output_dir)
+    files = merge_fixture_shards(collector.output_dir)
+    assert len(files) == len(expected_files) == 2
+    for expected_file in expected_files:
+        file = collector.output_dir / expected_file.relative_to(expected_collector.output_dir)
+        assert file.read_bytes() == expected_file.read_bytes()
@@ -0,0 +1,127 @@
+"""Test the fixture file writing and merging functionality."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from ..compression import FixtureFileCompression, read_fixture_file
+from ..consume import TestCases
+from ..file import (
+    SHARD_FILE_SUFFIX,
+    Fixtures,
+    merge_fixture_outputs,
+    merge_fixture_shards,
+)
+
+
+def split(fixtures: Fixtures, parts: int) -> list[Fixtures]:
+    """Split the fixtures into `parts` fixture objects."""
+    names = list(fixtures.keys())
+    return [
+        Fixtures(root={name: fixtures[name] for name in names[i::parts]}) for i in range(parts)
+    ]
+
+
+@pytest.mark.parametrize("parts", [1, 2, 4])
+def test_merge_shards_matches_collect_into_file(tmp_path: Path, fixtures: Fixtures, parts: int):
+    """Test that merging shards produces the same file as collecting into the file directly."""
+    expected_path = tmp_path / "expected" / "test.json"
+    expected_path.parent.mkdir()
+    for fixtures_part in split(fixtures, parts):
+        fixtures_part.collect_into_file(expected_path)
+
+    output_dir = tmp_path / "output"
+    file_path = output_dir / "sub_dir" / "test.json"
+    file_path.parent.mkdir(parents=True)
+    for i, fixtures_part in enumerate(reversed(split(fixtures, parts))):
+        shard_path = fixtures_part.collect_into_shard(file_path, f"gw{i}-{i}")
+        assert shard_path.exists()
+    assert not file_path.exists()
+
+    assert merge_fixture_shards(output_dir) == {file_path: len(fixtures)}
+    assert file_path.read_text() == expected_path.read_text()
+    # The fields of the fixtures are written in the order of their models.
+    for name, json_fixture in json.loads(file_path.read_text()).items():
+        assert list(json_fixture) == list(fixtures[name].json_dict_with_info())
+    assert not list(output_dir.rglob(f"*{SHARD_FILE_SUFFIX}"))
+
+
+def test_merge_shards_into_existing_file(tmp_path: Path, fixtures: Fixtures):
+    """Test that merging shards preserves the fixtures of an already existing file."""
+    first, second = split(fixtures, 2)
+    file_path = tmp_path / "test.json"
+    first.collect_into_file(file_path)
+    second.collect_into_shard(file_path, "master-0")
+    merge_fixture_shards(tmp_path)
+
+    with open(file_path) as f:
+        merged = json.load(f)
+    assert list(merged.keys()) == sorted(fixtures.keys())
+
+
+@pytest.mark.parametrize("compression", [FixtureFileCompression.GZIP, FixtureFileCompression.ZSTD])
+def test_merge_shards_compressed(
+    tmp_path: Path, fixtures: Fixtures, compression: FixtureFileCompression
+):
+    """Test that compressed fixture files contain the same json as uncompressed ones."""
+    expected_path = tmp_path / "expected.json"
+    fixtures.collect_into_file(expected_path)
+
+    file_path = tmp_path / f"test.json{compression.suffix}"
+    for i, fixtures_part in enumerate(split(fixtures, 2)):
+        fixtures_part.collect_into_shard(file_path, f"gw{i}-0")
+    merge_fixture_shards(tmp_path)
+
+    assert FixtureFileCompression.from_path(file_path) == compression
+    assert FixtureFileCompression.from_data(file_path.read_bytes()) == compression
+    assert read_fixture_file(file_path) == expected_path.read_bytes()
+    assert Fixtures.from_file(file_path).keys() == fixtures.keys()
+
+    test_cases = TestCases.from_stream(io.BytesIO(file_path.read_bytes()))
+    assert [test_case.id for test_case in test_cases] == sorted(fixtures.keys())
+
+
+def test_gzip_output_reproducible(tmp_path: Path, fixtures: Fixtures):
+    """Test that gzip fixture files don't depend on their name or the time they are written."""
+    first_path = tmp_path / "first.json.gz"
+    second_path = tmp_path / "second.json.gz"
+    fixtures.collect_into_file(first_path)
+    fixtures.collect_into_file(second_path)
+    data = first_path.read_bytes()
+    assert data == second_path.read_bytes()
+    # No FNAME flag and a zero MTIME in the gzip header.
+    assert data[3] == 0
+    assert data[4:8] == bytes(4)
+
+
+def test_merge_fixture_outputs(tmp_path: Path, fixtures: Fixtures):
+    """Test that merging output directories produces the files of a single output."""
+    expected_dir = tmp_path / "expected"
+    (expected_dir / "state_tests").mkdir(parents=True)
+    fixtures.collect_into_file(expected_dir / "state_tests" / "test.json")
+    first, second = split(fixtures, 2)
+    first.collect_into_file(expected_dir / "state_tests" / "first_only.json")
+
+    input_dirs = [tmp_path / "input_1", tmp_path / "input_2"]
+    for input_dir, fixtures_part in zip(input_dirs, [first, second], strict=True):
+        (input_dir / "state_tests").mkdir(parents=True)
+        (input_dir / ".meta").mkdir()
+        (input_dir / ".meta" / "index.json").write_text("{}")
+        fixtures_part.collect_into_file(input_dir / "state_tests" / "test.json")
+    first.collect_into_file(input_dirs[0] / "state_tests" / "first_only.json")
+
+    output_dir = tmp_path / "output"
+    assert sorted(merge_fixture_outputs(input_dirs, output_dir)) == [
+        Path("state_tests/first_only.json"),
+        Path("state_tests/test.json"),
+    ]
+    assert not (output_dir / ".meta").exists()
+    for file_name in ["test.json", "first_only.json"]:
+        assert (output_dir / "state_tests" / file_name).read_text() == (
+            expected_dir / "state_tests" / file_name
+        ).read_text()
+
+    with pytest.raises(ValueError, match="more than one input"):
+        merge_fixture_outputs([input_dirs[0], input_dirs[0]], tmp_path / "duplicates")
@@ -0,0 +1,67 @@
+"""Tests for the fill phase profiler."""
+
+from pathlib import Path
+
+from ..profiling import (
+    PhaseProfiler,
+    format_phase_report,
+    load_phase_events,
+    phase_report_json,
+    summarize_phases,
+    trace_events_json,
+)
+
+
+def test_disabled_profiler_records_nothing():
+    """Test that a disabled profiler doesn't record any events."""
+    profiler = PhaseProfiler()
+    with profiler.phase("t8n"):
+        pass
+    assert profiler.events == []
+
+
+def test_nested_phases():
+    """Test that the exclusive time of a phase excludes the time spent in nested phases."""
+    profiler = PhaseProfiler(enabled=True, process="gw0", test_id="test_a")
+    with profiler.phase("generate"):
+        with profiler.phase("t8n"):
+            pass
+        with profiler.phase("transaction signing"):
+            pass
+    inner_t8n, inner_signing, outer = profiler.events
+    assert [event.name for event in profiler.events] == ["t8n", "transaction signing", "generate"]
+    assert [event.depth for event in profiler.events] == [1, 1, 0]
+    assert inner_t8n.self_duration_ns == inner_t8n.duration_ns
+    assert outer.self_duration_ns == (
+        outer.duration_ns - inner_t8n.duration_ns - inner_signing.duration_ns
+    )
+    assert outer.start_ns <= inner_t8n.start_ns <= inner_signing.start_ns
+    assert all(event.test_id == "test_a" and event.process == "gw0" for event in profiler.events)
+
+
+def test_aggregate_across_processes(tmp_path: Path):
+    """Test that the events dumped by multiple processes are aggregated by phase and test."""
+    for process in ["gw0", "gw1"]:
+        profiler = PhaseProfiler(enabled=True, process=process)
+        for test_id in [f"test_{process}_a", f"test_{process}_b"]:
+            profiler.test_id = test_id
+            with profiler.phase("generate"), profiler.phase("t8n"):
+                pass
+        profiler.dump(tmp_path / f"{process}.json")
+
+    events = load_phase_events(sorted(tmp_path.glob("*.json")))
+    assert len(events) == 8
+
+    summaries = {summary.name: summary for summary in summarize_phases(events)}
+    assert summaries.keys() == {"generate", "t8n"}
+    assert summaries["t8n"].count == summaries["generate"].count == 4
+    assert summaries["generate"].total_ns >= summaries["t8n"].total_ns
+
+    report = phase_report_json(events)
+    assert set(report["tests"]) == {"test_gw0_a", "test_gw0_b", "test_gw1_a", "test_gw1_b"}
+    assert "t8n" in format_phase_report(events)
+
+    trace = trace_events_json(events)
+    complete_events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(complete_events) == 8
+    assert {event["tid"] for event in complete_events} == {0, 1}
@@ -0,0 +1,170 @@
+"""Test the deduplication of fixtures into the fixture store of an output."""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from cli.gen_index import generate_fixtures_index
+from cli.hasher import HashableItem
+
+from .. import file
+from ..compression import FixtureFileCompression, read_fixture_file
+from ..file import (
+    DEDUPLICATION_MEMORY_BUDGET,
+    Fixtures,
+    deduplicate_fixtures,
+    write_json_fixtures,
+)
+from ..store import (
+    CONTENT_KEY,
+    FIXTURE_STORE_DIR_NAME,
+    FORK_KEY,
+    read_resolved_fixture_file,
+)
+
+FIXTURES_DIR = Path(__file__).parents[2] / "ethereum_test_specs" / "tests" / "fixtures"
+FIXTURE_FILES = [
+    "chainid_cancun_blockchain_test_tx_type_0.json",
+    "chainid_cancun_blockchain_test_engine_tx_type_0.json",
+    "chainid_cancun_state_test_tx_type_0.json",
+    "chainid_cancun_state_test_tx_type_1.json",
+]
+
+
+def with_fork(json_fixture: Dict, fork: str) -> Dict:
+    """
+    Return a copy of a fixture generated for a different fork, with the same contents, by
+    renaming the fork in all the fields that contain the fork of the fixture.
+    """
+    fixture_format = json_fixture["_info"]["fixture_format"]
+    json_fixture = json.loads(json.dumps(json_fixture))
+    if fixture_format == "state_test":
+        json_fixture["post"] = {fork: next(iter(json_fixture["post"].values()))}
+    else:
+        json_fixture["network"] = fork
+        json_fixture["config"]["network"] = fork
+    # The hash of the fixture depends on the fork.
+    json_fixture["_info"]["hash"] = Fixtures.model_validate({"x": json_fixture})["x"].hash
+    return json_fixture
+
+
+def write_output(
+    output_dir: Path, compression: FixtureFileCompression = FixtureFileCompression.NONE
+) -> List[Path]:
+    """
+    Write an output in which each fixture of the spec tests is generated for Cancun and
+    Prague, and one of them only for Cancun.
+    """
+    file_paths = []
+    for i, file_name in enumerate(FIXTURE_FILES):
+        with open(FIXTURES_DIR / file_name) as f:
+            cancun_fixtures = json.load(f)
+        json_fixtures = {}
+        for name, json_fixture in cancun_fixtures.items():
+            json_fixtures[f"{name}[fork_Cancun]"] = json_fixture
+            if i > 0:
+                json_fixtures[f"{name}[fork_Prague]"] = with_fork(json_fixture, "Prague")
+        file_path = output_dir / "cancun" / f"{Path(file_name).stem}.json{compression.suffix}"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_fixtures(file_path, json_fixtures)
+        file_paths.append(file_path)
+    return file_paths
+
+
+@pytest.mark.parametrize("memory_budget", [0, DEDUPLICATION_MEMORY_BUDGET])
+@pytest.mark.parametrize("compression", [FixtureFileCompression.NONE, FixtureFileCompression.GZIP])
+def test_deduplicate_fixtures(
+    tmp_path: Path, compression: FixtureFileCompression, memory_budget: int
+):
+    """Test that the deduplicated fixtures are resolved to the original fixtures."""
+    expected_dir, output_dir = tmp_path / "expected", tmp_path / "output"
+    expected_files = write_output(expected_dir, compression)
+    output_files = write_output(output_dir, compression)
+
+    assert deduplicate_fixtures(output_dir, memory_budget=memory_budget) == 6
+    stored_files = [
+        path for path in (output_dir / FIXTURE_STORE_DIR_NAME).rglob("*") if path.is_file()
+    ]
+    assert len(stored_files) == 3
+    # The fork of the fixtures is not part of their stored contents.
+    for stored_file in stored_files:
+        assert stored_file.name.endswith(f".json{compression.suffix}")
+        assert b'"network"' not in read_fixture_file(stored_file)
+    # The fixture that was only generated for Cancun is not stored.
+    assert read_fixture_file(output_files[0]) == read_fixture_file(expected_files[0])
+    references = json.loads(read_fixture_file(output_files[1]))
+    assert {reference[FORK_KEY] for reference in references.values()} == {"Cancun", "Prague"}
+    assert all(CONTENT_KEY in reference for reference in references.values())
+
+    for expected_file, output_file in zip(expected_files, output_files, strict=True):
+        expected_fixtures = Fixtures.from_file(expected_file)
+        output_fixtures = Fixtures.from_file(output_file)
+        assert list(output_fixtures.keys()) == list(expected_fixtures.keys())
+        for name, fixture in output_fixtures.items():
+            assert fixture.json_dict_with_info() == expected_fixtures[name].json_dict_with_info()
+        assert json.loads(read_resolved_fixture_file(output_file)) == json.loads(
+            read_fixture_file(expected_file)
+        )
+
+    assert (
+        HashableItem.from_folder(folder_path=output_dir).hash()
+        == HashableItem.from_folder(folder_path=expected_dir).hash()
+    )
+
+    # Deduplicating the output again changes nothing.
+    deduplicated_files = {file: file.read_bytes() for file in output_files}
+    assert deduplicate_fixtures(output_dir) == 0
+    assert {file: file.read_bytes() for file in output_files} == deduplicated_files
+
+
+def test_deduplicate_fixtures_parses_files_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that the fixture files are only read once when they fit in the memory budget."""
+    output_files = write_output(tmp_path)
+    read_files: List[Path] = []
+
+    def read_fixture_file_once(path: Path) -> bytes:
+        read_files.append(path)
+        return read_fixture_file(path)
+
+    monkeypatch.setattr(file, "read_fixture_file", read_fixture_file_once)
+    assert deduplicate_fixtures(tmp_path) == 6
+    assert sorted(read_files) == sorted(output_files)
+
+
+def test_index_of_deduplicated_output(tmp_path: Path):
+    """Test that the index of a deduplicated output is the index of the original output."""
+    expected_dir, output_dir = tmp_path / "expected", tmp_path / "output"
+    write_output(expected_dir)
+    write_output(output_dir)
+    deduplicate_fixtures(output_dir)
+    for directory in (expected_dir, output_dir):
+        generate_fixtures_index(directory, quiet_mode=True)
+
+    def index(directory: Path) -> Dict:
+        with open(directory / ".meta" / "index.json") as f:
+            index = json.load(f)
+        del index["created_at"]
+        return index
+
+    assert index(output_dir) == index(expected_dir)
+
+
+def test_deduplicate_merged_outputs(tmp_path: Path):
+    """Test that deduplicating an output again stores the newly shared fixtures."""
+    output_dir = tmp_path / "output"
+    output_files = write_output(output_dir)
+    deduplicate_fixtures(output_dir)
+    shutil.copyfile(output_files[0], output_files[0].with_name("copy.json"))
+    assert deduplicate_fixtures(output_dir) == 2
+
+
+def test_missing_fixture_store(tmp_path: Path):
+    """Test the error raised when the store of a deduplicated output is missing."""
+    output_files = write_output(tmp_path / "output")
+    deduplicate_fixtures(tmp_path / "output")
+    shutil.rmtree(tmp_path / "output" / FIXTURE_STORE_DIR_NAME)
+    with pytest.raises(FileNotFoundError, match=FIXTURE_STORE_DIR_NAME):
+        Fixtures.from_file(output_files[1])
@@ -0,0 +1,77 @@
+"""Test the streaming of fixtures to and from text streams."""
+
+import gzip
+import io
+import json
+
+import pytest
+
+from ethereum_test_base_types import to_json
+
+from ..consume import TestCases
+from ..file import Fixtures
+from ..stream import FixtureStreamFormat, FixtureStreamWriter, iter_fixture_stream
+
+
+def write_stream(fixtures: Fixtures, stream_format: FixtureStreamFormat) -> str:
+    """Write the fixtures to a text stream and return its contents."""
+    fd = io.StringIO()
+    writer = FixtureStreamWriter(fd, stream_format)
+    for name, fixture in fixtures.items():
+        writer.write(name, fixture)
+    writer.close()
+    return fd.getvalue()
+
+
+@pytest.mark.parametrize("count", [0, 1, 4])
+def test_json_stream_matches_json_dump(fixtures: Fixtures, count: int):
+    """Test that the incremental JSON stream is identical to dumping all fixtures at once."""
+    fixtures = Fixtures(root=dict(list(fixtures.items())[:count]))
+    expected = json.dumps({name: to_json(fixture) for name, fixture in fixtures.items()}, indent=4)
+    assert write_stream(fixtures, FixtureStreamFormat.JSON) == expected
+
+
+def test_jsonl_stream_writes_one_fixture_per_line(fixtures: Fixtures):
+    """Test that each line of the JSON Lines stream contains one fixture."""
+    lines = write_stream(fixtures, FixtureStreamFormat.JSONL).splitlines()
+    assert len(lines) == len(fixtures)
+    for line, (name, fixture) in zip(lines, fixtures.items(), strict=True):
+        assert json.loads(line) == {name: to_json(fixture)}
+
+
+@pytest.mark.parametrize("stream_format", list(FixtureStreamFormat))
+@pytest.mark.parametrize("compress", [False, True])
+def test_read_stream(
+    fixtures: Fixtures,
+    stream_format: FixtureStreamFormat,
+    compress: bool,
+):
+    """Test that the fixtures are read back from a stream in any format."""
+    data = write_stream(fixtures, stream_format).encode("utf-8")
+    if compress:
+        data = gzip.compress(data)
+    read_fixtures = dict(iter_fixture_stream(io.BytesIO(data)))
+    assert {name: fixture.hash for name, fixture in read_fixtures.items()} == {
+        name: fixture.hash for name, fixture in fixtures.items()
+    }
+
+    test_cases = TestCases.from_stream(io.BytesIO(data))
+    assert [test_case.id for test_case in test_cases] == list(fixtures.keys())
+
+
+def test_read_jsonl_stream_incrementally(fixtures: Fixtures):
+    """Test that fixtures of a JSON Lines stream are yielded before the stream ends."""
+    lines = iter(write_stream(fixtures, FixtureStreamFormat.JSONL).encode().splitlines(True))
+    consumed = 0
+
+    class Stream:
+        """Binary stream that counts the lines consumed by the reader."""
+
+        def __iter__(self):
+            nonlocal consumed
+            for line in lines:
+                consumed += 1
+                yield line
+
+    for i, _ in enumerate(iter_fixture_stream(Stream()), start=1):  # type: ignore[arg-type]
+        assert consumed == i
@@ -1,6 +1,6 @@
 """TransactionTest types."""
 
-from typing import ClassVar, Mapping
+from typing import Any, ClassVar, Dict, Mapping, Tuple
 
 from pydantic import Field
 
@@ -34,3 +34,14 @@ class TransactionFixture(BaseFixture):
         forks = list(self.result.keys())
         assert len(forks) == 1, "Expected transaction test fixture with single fork"
         return forks[0]
+
+    @classmethod
+    def split_fork(cls, json_dict: Dict[str, Any]) -> Tuple[Dict[str, Any], str | None]:
+        """Split the fork from the `result` field, which maps the fork to its result."""
+        ((fork, result),) = json_dict["result"].items()
+        return {**json_dict, "result": result}, fork
+
+    @classmethod
+    def join_fork(cls, json_dict: Dict[str, Any], fork: str | None) -> Dict[str, Any]:
+        """Map the fork back to its result in the `result` field."""
+        return {**json_dict, "result": {fork: json_dict["result"]}}
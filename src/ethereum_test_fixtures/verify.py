@@ -2,10 +2,30 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Dict
 
 from .base import FixtureFormat
 
 
+class FixtureVerificationError(Exception):
+    """Exception raised when one or more fixture files fail verification."""
+
+    def __init__(self, failures: Dict[str, BaseException]):
+        """Initialize the exception with the verification failure of each test."""
+        self.failures = failures
+        super().__init__(str(self))
+
+    def __str__(self):
+        """Return the error message listing each failed test only once per distinct error."""
+        errors: Dict[str, list[str]] = {}
+        for test_id, exception in self.failures.items():
+            errors.setdefault(str(exception), []).append(test_id)
+        return "\n\n".join(
+            f"Fixture verification failed for {', '.join(test_ids)}:\n{error}"
+            for error, test_ids in errors.items()
+        )
+
+
 class FixtureVerifier(ABC):
     """Abstract class for verifying Ethereum test fixtures."""
 
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Callable, ClassVar, Generator, Iterator, List, Optional
 
 import pytest
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from ethereum_clis import Result, TransitionTool
 from ethereum_test_execution import BaseExecute, ExecuteFormat
@@ -43,6 +43,8 @@ def verify_result(result: Result, env: Environment):
 class BaseTest(BaseModel):
     """Represents a base Ethereum test which must return a single test fixture."""
 
+    model_config = ConfigDict(defer_build=True)
+
     tag: str = ""
 
     # Transition tool specific fields
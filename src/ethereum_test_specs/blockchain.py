@@ -38,8 +38,9 @@ from ethereum_test_fixtures.blockchain import (
     InvalidFixtureBlock,
 )
 from ethereum_test_fixtures.common import FixtureBlobSchedule
+from ethereum_test_fixtures.profiling import profile_phase
 from ethereum_test_forks import Fork
-from ethereum_test_types import Alloc, Environment, Removable, Transaction
+from ethereum_test_types import Alloc, Environment, Removable, Transaction, sign_transactions
 
 from .base import BaseTest, verify_result
 from .debugging import print_traces
@@ -78,6 +79,43 @@ def apply_new_parent(env: Environment, new_parent: FixtureHeader) -> "Environmen
     return env.copy(**updated)
 
 
+# Maximum number of genesis blocks kept in memory, the oldest are evicted first.
+MAX_CACHED_GENESIS = 256
+
+GenesisCacheKey = Tuple[Any, ...]
+
+_genesis_cache: Dict[GenesisCacheKey, Tuple[Alloc, FixtureBlock]] = {}
+
+
+def genesis_cache_key(env: Environment, pre: Alloc, fork: Fork) -> GenesisCacheKey:
+    """
+    Return the key of the genesis derived from the pre-state and environment for the fork,
+    made of the contents of the accounts and the environment fields of the genesis header.
+    """
+    return (
+        fork,
+        env.difficulty,
+        env.gas_limit,
+        env.base_fee_per_gas,
+        env.blob_gas_used,
+        env.excess_blob_gas,
+        tuple(
+            (
+                address,
+                None
+                if account is None
+                else (
+                    account.nonce,
+                    account.balance,
+                    account.code,
+                    tuple(account.storage.root.items()) if account.storage is not None else None,
+                ),
+            )
+            for address, account in pre.root.items()
+        ),
+    )
+
+
 def count_blobs(txs: List[Transaction]) -> int:
     """Return number of blobs in a list of transactions."""
     return sum(
@@ -279,8 +317,17 @@ class BlockchainTest(BaseTest):
         pre: Alloc,
         fork: Fork,
     ) -> Tuple[Alloc, FixtureBlock]:
-        """Create a genesis block from the blockchain test definition."""
+        """
+        Create a genesis block from the blockchain test definition.
+
+        Tests often share the same pre-state and environment, so the merged pre-allocation and
+        the genesis block are cached by content and shared by these tests; they must not be
+        modified.
+        """
         env = genesis_environment.set_fork_requirements(fork)
+        cache_key = genesis_cache_key(env, pre, fork)
+        if (cached_genesis := _genesis_cache.get(cache_key)) is not None:
+            return cached_genesis
 
         pre_alloc = Alloc.merge(
             Alloc.model_validate(fork.pre_allocation_blockchain()),
@@ -288,7 +335,8 @@ class BlockchainTest(BaseTest):
         )
         if empty_accounts := pre_alloc.empty_accounts():
             raise Exception(f"Empty accounts in pre state: {empty_accounts}")
-        state_root = pre_alloc.state_root()
+        with profile_phase("genesis state root"):
+            state_root = pre_alloc.state_root()
         genesis = FixtureHeader(
             parent_hash=0,
             ommers_hash=EmptyOmmersRoot,
@@ -311,12 +359,11 @@ class BlockchainTest(BaseTest):
             fork=fork,
         )
 
-        return (
-            pre_alloc,
-            FixtureBlockBase(
-                header=genesis,
-            ).with_rlp(txs=[]),
-        )
+        genesis_block = FixtureBlockBase(header=genesis).with_rlp(txs=[])
+        if len(_genesis_cache) >= MAX_CACHED_GENESIS:
+            del _genesis_cache[next(iter(_genesis_cache))]
+        _genesis_cache[cache_key] = (pre_alloc, genesis_block)
+        return pre_alloc, genesis_block
 
     def generate_block_data(
         self,
@@ -338,7 +385,8 @@ class BlockchainTest(BaseTest):
         env = block.set_environment(previous_env)
         env = env.set_fork_requirements(fork)
 
-        txs = [tx.with_signature_and_sender() for tx in block.txs]
+        with profile_phase("transaction signing"):
+            txs = sign_transactions(block.txs)
 
         if failing_tx_count := len([tx for tx in txs if tx.error]) > 0:
             if failing_tx_count > 1:
@@ -351,18 +399,19 @@ class BlockchainTest(BaseTest):
                     + "must be the last transaction in the block"
                 )
 
-        transition_tool_output = t8n.evaluate(
-            alloc=previous_alloc,
-            txs=txs,
-            env=env,
-            fork=fork,
-            chain_id=self.chain_id,
-            reward=fork.get_reward(env.number, env.timestamp),
-            blob_schedule=fork.blob_schedule(),
-            eips=eips,
-            debug_output_path=self.get_next_transition_tool_output_path(),
-            slow_request=slow,
-        )
+        with profile_phase("t8n"):
+            transition_tool_output = t8n.evaluate(
+                alloc=previous_alloc,
+                txs=txs,
+                env=env,
+                fork=fork,
+                chain_id=self.chain_id,
+                reward=fork.get_reward(env.number, env.timestamp),
+                blob_schedule=fork.blob_schedule(),
+                eips=eips,
+                debug_output_path=self.get_next_transition_tool_output_path(),
+                slow_request=slow,
+            )
 
         try:
             rejected_txs = verify_transactions(
@@ -1,11 +1,13 @@
 """Ethereum EOF test spec definition and filler."""
 
+import hashlib
+import os
 import subprocess
 import warnings
 from pathlib import Path
 from shutil import which
 from subprocess import CompletedProcess
-from typing import Any, Callable, ClassVar, Dict, Generator, List, Optional, Type
+from typing import Any, Callable, ClassVar, Dict, Generator, List, Optional, Tuple, Type
 
 import pytest
 from pydantic import Field, model_validator
@@ -30,7 +32,70 @@ from ethereum_test_types.eof.v1 import Container, ContainerKind
 from .base import BaseTest
 from .state import StateTest
 
-existing_tests: Dict[Bytes, str] = {}
+
+class EOFContainerRegistry:
+    """
+    Registry of the EOF containers generated in the session, mapped to the ID of the test
+    that generated them, used to generate and validate each container only once.
+
+    If a directory is given on registration, e.g. the session's temporary folder shared by
+    all the xdist workers, the registry is shared through files named after the hash of the
+    containers, which are created atomically so exactly one test can register a container.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self.containers: Dict[Bytes, str] = {}
+
+    def register(
+        self, container: Bytes, test_id: str, directory: Path | None = None
+    ) -> Tuple[str, bool]:
+        """
+        Register the container as generated by the test, unless it was already registered,
+        and return the ID of the test that generated it first and whether that test ran in
+        this process.
+
+        A container first generated by another process is recorded as generated by this test
+        in this process, so that the duplicates within this process are still reported.
+        """
+        if container in self.containers:
+            return self.containers[container], True
+        self.containers[container] = test_id
+        if directory is not None:
+            first_test_id = self._register_in_directory(container, test_id, directory)
+            if first_test_id != test_id:
+                return first_test_id, False
+        return test_id, True
+
+    @staticmethod
+    def _register_in_directory(container: Bytes, test_id: str, directory: Path) -> str:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / hashlib.sha256(container).hexdigest()
+        # Linking a complete file fails if the path exists, so readers never see partial IDs.
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(test_id)
+        try:
+            os.link(temp_path, path)
+        except FileExistsError:
+            test_id = path.read_text()
+        finally:
+            temp_path.unlink()
+        return test_id
+
+
+existing_tests = EOFContainerRegistry()
+
+
+def shared_eof_container_directory(request: pytest.FixtureRequest) -> Path | None:
+    """
+    Return the directory used to share the registry of the generated EOF containers with the
+    other xdist workers of the session, if the session has a shared temporary folder.
+    """
+    try:
+        session_temp_folder: Path = request.getfixturevalue("session_temp_folder")
+    except pytest.FixtureLookupError:
+        return None
+    return session_temp_folder / "eof_containers"
 
 
 class EOFBaseExceptionError(Exception):
@@ -148,6 +213,9 @@ class EOFTest(BaseTest):
     supported_fixture_formats: ClassVar[List[FixtureFormat]] = [
         EOFFixture,
     ]
+    # Whether a test generating a container that was already generated is skipped, instead
+    # of failed.
+    skip_duplicate_containers: ClassVar[bool] = False
 
     @model_validator(mode="before")
     @classmethod
@@ -192,12 +260,15 @@ class EOFTest(BaseTest):
         eips: Optional[List[int]],
     ) -> EOFFixture:
         """Generate the EOF test fixture."""
-        if self.container in existing_tests:
-            pytest.fail(
-                f"Duplicate EOF test: {self.container}, "
-                f"existing test: {existing_tests[self.container]}"
-            )
-        existing_tests[self.container] = request.node.nodeid
+        existing_test, in_process = existing_tests.register(
+            self.container, request.node.nodeid, shared_eof_container_directory(request)
+        )
+        if existing_test != request.node.nodeid:
+            # Which xdist worker generates a container first depends on the scheduling of the
+            # tests, so only the duplicates within a process fail.
+            if self.skip_duplicate_containers or not in_process:
+                pytest.skip(f"Duplicate EOF container, existing test: {existing_test}")
+            pytest.fail(f"Duplicate EOF test: {self.container}, existing test: {existing_test}")
         vectors = [
             Vector(
                 code=self.container,
@@ -302,6 +373,9 @@ class EOFStateTest(EOFTest, Transaction):
         BlockchainFixture,
         BlockchainEngineFixture,
     ]
+    # Gracefully skip duplicate tests because one EOFStateTest can generate multiple state
+    # fixtures with the same data.
+    skip_duplicate_containers: ClassVar[bool] = True
 
     @model_validator(mode="before")
     @classmethod
@@ -387,10 +461,6 @@ class EOFStateTest(EOFTest, Transaction):
     ) -> BaseFixture:
         """Generate the BlockchainTest fixture."""
         if fixture_format == EOFFixture:
-            if self.container in existing_tests:
-                # Gracefully skip duplicate tests because one EOFStateTest can generate multiple
-                # state fixtures with the same data.
-                pytest.skip(f"Duplicate EOF container on EOFStateTest: {request.node.nodeid}")
             return self.make_eof_test_fixture(request=request, fork=fork, eips=eips)
         elif fixture_format in StateTest.supported_fixture_formats:
             return self.generate_state_test().generate(
@@ -17,6 +17,7 @@ from ethereum_test_fixtures import (
     StateFixture,
 )
 from ethereum_test_fixtures.common import FixtureBlobSchedule
+from ethereum_test_fixtures.profiling import profile_phase
 from ethereum_test_fixtures.state import (
     FixtureConfig,
     FixtureEnvironment,
@@ -117,7 +118,8 @@ class StateTest(BaseTest):
         fork = fork.fork_at(self.env.number, self.env.timestamp)
 
         env = self.env.set_fork_requirements(fork)
-        tx = self.tx.with_signature_and_sender(keep_secret_key=True)
+        with profile_phase("transaction signing"):
+            tx = self.tx.with_signature_and_sender(keep_secret_key=True)
         pre_alloc = Alloc.merge(
             Alloc.model_validate(fork.pre_allocation()),
             self.pre,
@@ -125,19 +127,20 @@ class StateTest(BaseTest):
         if empty_accounts := pre_alloc.empty_accounts():
             raise Exception(f"Empty accounts in pre state: {empty_accounts}")
 
-        transition_tool_output = t8n.evaluate(
-            alloc=pre_alloc,
-            txs=[tx],
-            env=env,
-            fork=fork,
-            chain_id=self.chain_id,
-            reward=0,  # Reward on state tests is always zero
-            blob_schedule=fork.blob_schedule(),
-            eips=eips,
-            debug_output_path=self.get_next_transition_tool_output_path(),
-            state_test=True,
-            slow_request=slow,
-        )
+        with profile_phase("t8n"):
+            transition_tool_output = t8n.evaluate(
+                alloc=pre_alloc,
+                txs=[tx],
+                env=env,
+                fork=fork,
+                chain_id=self.chain_id,
+                reward=0,  # Reward on state tests is always zero
+                blob_schedule=fork.blob_schedule(),
+                eips=eips,
+                debug_output_path=self.get_next_transition_tool_output_path(),
+                state_test=True,
+                slow_request=slow,
+            )
 
         try:
             self.post.verify_post_alloc(transition_tool_output.alloc)
@@ -0,0 +1,42 @@
+"""Test the genesis of blockchain tests."""
+
+import pytest
+
+from ethereum_test_base_types import Account, Address
+from ethereum_test_forks import Cancun, Fork, Prague
+from ethereum_test_types import Alloc, Environment
+
+from .. import blockchain
+from ..blockchain import BlockchainTest
+
+
+def make_pre(storage_value: int = 1) -> Alloc:
+    """Return a new pre-allocation."""
+    return Alloc(
+        {
+            Address(0x100): Account(balance=10**18, nonce=1),
+            Address(0x200): Account(code=b"\x00", storage={0: storage_value, 1: 2}),
+        }
+    )
+
+
+@pytest.mark.parametrize("fork", [Cancun, Prague])
+def test_genesis_cache(fork: Fork):
+    """Test that identical genesis setups share their genesis, and only them."""
+    blockchain._genesis_cache.clear()
+    pre, genesis = BlockchainTest.make_genesis(Environment(), make_pre(), fork)
+    cached_pre, cached_genesis = BlockchainTest.make_genesis(Environment(), make_pre(), fork)
+    assert cached_pre is pre
+    assert cached_genesis is genesis
+
+    other_pre, other_genesis = BlockchainTest.make_genesis(Environment(), make_pre(2), fork)
+    assert other_genesis.header.state_root != genesis.header.state_root
+    _, other_env_genesis = BlockchainTest.make_genesis(Environment(gas_limit=10**6), pre, fork)
+    assert other_env_genesis.header.gas_limit == 10**6
+    assert other_env_genesis.header.block_hash != genesis.header.block_hash
+
+    blockchain._genesis_cache.clear()
+    assert BlockchainTest.make_genesis(Environment(), make_pre(2), fork) == (
+        other_pre,
+        other_genesis,
+    )
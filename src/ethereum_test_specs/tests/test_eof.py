@@ -0,0 +1,86 @@
+"""Test the registry of the EOF containers generated in a session."""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from ethereum_test_base_types import Bytes
+from ethereum_test_forks import Osaka
+from ethereum_test_types.eof.v1 import Container, Section
+from ethereum_test_vm import Opcodes as Op
+
+from .. import eof
+from ..eof import EOFContainerRegistry, EOFTest
+
+CONTAINERS = [Bytes(bytes([0xEF, 0x00, 0x01, i])) for i in range(16)]
+
+
+def register_containers(directory: Path, worker: int) -> List[str]:
+    """Register all the containers from a new process, as an xdist worker would."""
+    registry = EOFContainerRegistry()
+    return [
+        registry.register(container, f"test_{worker}_{i}", directory)[0]
+        for i, container in enumerate(CONTAINERS)
+    ]
+
+
+def test_register():
+    """Test that a container is registered by the first test that generates it."""
+    registry = EOFContainerRegistry()
+    assert registry.register(CONTAINERS[0], "test_a") == ("test_a", True)
+    assert registry.register(CONTAINERS[0], "test_b") == ("test_a", True)
+    assert registry.register(CONTAINERS[1], "test_b") == ("test_b", True)
+
+
+def test_register_shared_by_workers(tmp_path: Path):
+    """Test that each container is registered by exactly one of concurrent workers."""
+    workers = 8
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(register_containers, [tmp_path] * workers, range(workers)))
+    for i in range(len(CONTAINERS)):
+        test_ids = {worker_results[i] for worker_results in results}
+        assert len(test_ids) == 1
+        assert test_ids.pop().endswith(f"_{i}")
+    assert not list(tmp_path.glob("*.tmp"))
+    late_registry = EOFContainerRegistry()
+    existing_test, in_process = late_registry.register(CONTAINERS[0], "test_late", tmp_path)
+    assert existing_test != "test_late" and not in_process
+    # Later duplicates within the process are reported against the test of the process.
+    assert late_registry.register(CONTAINERS[0], "test_later", tmp_path) == ("test_late", True)
+
+
+class WorkerRequest:
+    """Request of a test run by an xdist worker, sharing the session's temporary folder."""
+
+    def __init__(self, nodeid: str, session_temp_folder: Path):
+        """Initialize the request of the test."""
+        self.node = SimpleNamespace(nodeid=nodeid)
+        self.session_temp_folder = session_temp_folder
+
+    def getfixturevalue(self, name: str) -> Path:
+        """Return the session's temporary folder."""
+        assert name == "session_temp_folder"
+        return self.session_temp_folder
+
+
+@pytest.mark.filterwarnings("ignore:.*eofparse")
+def test_duplicate_eof_tests_of_xdist_workers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that an EOF test whose container was generated by a test of another xdist worker is
+    skipped, and that duplicates within a worker fail.
+    """
+    eof_test = EOFTest(container=Container(sections=[Section.Code(Op.STOP)]))
+    for worker in range(2):
+        monkeypatch.setattr(eof, "existing_tests", EOFContainerRegistry())
+        request: Any = WorkerRequest(f"test_{worker}", tmp_path)
+        if worker == 0:
+            eof_test.make_eof_test_fixture(request=request, fork=Osaka, eips=None)
+            continue
+        with pytest.raises(pytest.skip.Exception, match="existing test: test_0"):
+            eof_test.make_eof_test_fixture(request=request, fork=Osaka, eips=None)
+        request = WorkerRequest(f"test_{worker}_duplicate", tmp_path)
+        with pytest.raises(pytest.fail.Exception, match=f"existing test: test_{worker}"):
+            eof_test.make_eof_test_fixture(request=request, fork=Osaka, eips=None)
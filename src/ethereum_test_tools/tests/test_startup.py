@@ -0,0 +1,71 @@
+"""
+Guard the import time of the framework, which is paid by every process, e.g. each xdist
+worker, before the first test runs.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict
+
+import pytest
+
+# The import time is only checked if a budget, in seconds, is set in this variable, as the
+# wall-clock time depends on the machine and its load, e.g. when running with xdist.
+IMPORT_TIME_BUDGET_VARIABLE = "EEST_IMPORT_TIME_BUDGET"
+
+SLOW_IMPORTS = ["requests", "trie"]
+
+
+def import_in_fresh_process(module: str) -> Dict[str, Any]:
+    """Import the module in a new interpreter and return the imported modules and time."""
+    script = f"""
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+modules = sorted(sys.modules)
+from ethereum_test_fixtures import BaseFixture
+print(json.dumps({{
+    "elapsed": elapsed,
+    "modules": modules,
+    "formats_type_adapter_built": BaseFixture._formats_type_adapter is not None,
+}}))
+"""
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["ethereum_test_vm", "ethereum_test_forks", "cli.evm_bytes"])
+def test_no_slow_imports(module: str):
+    """Test that the basic modules don't import packages that are slow to import."""
+    imported_modules = import_in_fresh_process(module)["modules"]
+    for slow_import in SLOW_IMPORTS:
+        assert slow_import not in imported_modules, f"{module} imports {slow_import}"
+
+
+def test_lazy_imports():
+    """Test that importing the framework doesn't import slow packages or build its models."""
+    result = import_in_fresh_process("ethereum_test_tools")
+    assert "trie" not in result["modules"]
+    assert not result["formats_type_adapter_built"]
+
+
+@pytest.mark.run_in_serial
+@pytest.mark.skipif(
+    IMPORT_TIME_BUDGET_VARIABLE not in os.environ,
+    reason=f"set {IMPORT_TIME_BUDGET_VARIABLE} to check the import time",
+)
+def test_import_time():
+    """Test that the import time of the framework is within the configured budget."""
+    budget = float(os.environ[IMPORT_TIME_BUDGET_VARIABLE])
+    start = time.perf_counter()
+    result = import_in_fresh_process("ethereum_test_tools")
+    assert result["elapsed"] < budget, (
+        f"importing ethereum_test_tools took {result['elapsed']:.2f}s "
+        f"(process: {time.perf_counter() - start:.2f}s)"
+    )
@@ -8,6 +8,7 @@ from .helpers import (
     compute_create_address,
     compute_eofcreate_address,
 )
+from .trie_root import ordered_list_root, trie_root
 from .types import (
     EOA,
     Account,
@@ -24,6 +25,8 @@ from .types import (
     TransactionDefaults,
     TransactionReceipt,
     keccak256,
+    sign_authorization_tuples,
+    sign_transactions,
 )
 
 __all__ = (
@@ -56,5 +59,9 @@ __all__ = (
     "compute_create2_address",
     "compute_eofcreate_address",
     "keccak256",
+    "ordered_list_root",
+    "sign_authorization_tuples",
+    "sign_transactions",
     "to_json",
+    "trie_root",
 )
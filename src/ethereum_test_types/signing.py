@@ -0,0 +1,224 @@
+"""
+Cache of the secp256k1 signatures computed when signing transactions and authorizations.
+
+Signatures are deterministic (RFC 6979): signing the same hash with the same key always gives
+the same signature. Tests sign the same transactions for every fixture format and fork, and on
+every run, so the signatures are cached in memory for the session and, optionally, in a
+directory that is shared by the xdist workers and by later runs.
+
+Each process appends the signatures it computes to its own file in the directory and reads the
+files of all processes the first time it looks up a signature, so processes never write to the
+same file. Every record is checksummed; invalid records, e.g. truncated by an interrupted
+process, are ignored, in which case the signature is simply computed again.
+"""
+
+import hashlib
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Sequence, Tuple
+
+from coincurve.keys import PrivateKey
+
+from ethereum_test_base_types import Bytes
+
+# Maximum number of signatures kept in memory by each process, i.e. by each xdist worker, the
+# oldest are evicted first. It covers what one worker signs in a session.
+MAX_CACHED_SIGNATURES = 1 << 16
+
+# Approximate memory taken by a cached signature, in bytes: a full cache takes about 17 MB.
+CACHED_SIGNATURE_MEMORY = 270
+
+# Maximum number of signatures kept in the cache directory when its files are merged.
+MAX_STORED_SIGNATURES = 1 << 20
+
+# Number of files in the cache directory above which they are merged into a single file.
+MAX_CACHE_FILES = 64
+
+CACHE_FILE_SUFFIX = ".sigs"
+
+# Minimum number of missing signatures that are computed by a pool of threads, below which
+# the overhead of the pool outweighs the gain.
+PARALLEL_SIGNING_MIN_COUNT = 32
+
+# Record of a signature in a cache file: the signing hash, a digest of the key, the recoverable
+# signature, the address of the key and a checksum of the preceding fields.
+_KEY_SIZE = 32 + 32
+_VALUE_SIZE = 65 + 20
+_CHECKSUM_SIZE = 4
+RECORD_SIZE = _KEY_SIZE + _VALUE_SIZE + _CHECKSUM_SIZE
+
+
+def _checksum(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=_CHECKSUM_SIZE).digest()
+
+
+def _cache_key(signing_hash: bytes, secret_key: bytes) -> bytes:
+    # Only a digest of the secret key is stored, in memory and on disk.
+    return bytes(signing_hash) + hashlib.sha256(bytes(secret_key)).digest()
+
+
+def compute_signature(signing_hash: bytes, secret_key: bytes) -> bytes:
+    """Return the recoverable signature of the hash with the key, followed by its address."""
+    private_key = PrivateKey(secret=bytes(secret_key))
+    signature = private_key.sign_recoverable(bytes(signing_hash), hasher=None)
+    public_key = private_key.public_key.format(compressed=False)[1:]
+    return signature + Bytes(public_key).keccak256()[32 - 20 :]
+
+
+def default_signing_workers() -> int:
+    """
+    Return the number of threads used to sign in parallel, i.e. the number of CPUs that are not
+    used by the other xdist workers, if any.
+
+    The signing functions of `coincurve` release the GIL, so signing scales with the threads.
+    """
+    worker_count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max(1, (os.cpu_count() or 1) // max(1, worker_count))
+
+
+def read_signature_records(path: Path) -> Dict[bytes, bytes]:
+    """Read the valid records of a cache file, skipping the invalid ones."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return {}
+    records: Dict[bytes, bytes] = {}
+    for offset in range(0, len(data) - RECORD_SIZE + 1, RECORD_SIZE):
+        record = data[offset : offset + RECORD_SIZE]
+        if _checksum(record[:-_CHECKSUM_SIZE]) == record[-_CHECKSUM_SIZE:]:
+            records[record[:_KEY_SIZE]] = record[_KEY_SIZE:-_CHECKSUM_SIZE]
+    return records
+
+
+def encode_signature_record(key: bytes, value: bytes) -> bytes:
+    """Return the record of a signature in a cache file."""
+    record = key + value
+    return record + _checksum(record)
+
+
+class SignatureCache:
+    """Signatures, and the addresses of the keys that computed them, by signing hash and key."""
+
+    def __init__(self, max_size: int = MAX_CACHED_SIGNATURES):
+        """Initialize an empty cache, kept in memory only."""
+        self.max_size = max_size
+        self.signatures: Dict[bytes, bytes] = {}
+        self.directory: Path | None = None
+        self._directory_loaded = False
+        self._file: BinaryIO | None = None
+        self._lock = threading.Lock()
+
+    def use_directory(self, directory: Path | None) -> None:
+        """Read and write the signatures from and to the directory, or stop if `None`."""
+        self.close()
+        self.directory = directory
+        self._directory_loaded = False
+
+    def sign(self, signing_hash: bytes, secret_key: bytes) -> Tuple[bytes, bytes]:
+        """
+        Return the 65-byte recoverable signature of the hash with the key, and the address of
+        the key, computing them if they are not cached.
+        """
+        key = _cache_key(signing_hash, secret_key)
+        value = self.signatures.get(key)
+        if value is None and self.directory is not None and not self._directory_loaded:
+            self._load_directory()
+            value = self.signatures.get(key)
+        if value is None:
+            value = compute_signature(signing_hash, secret_key)
+            self._add(key, value)
+        return value[:65], value[65:]
+
+    def sign_many(
+        self, requests: Sequence[Tuple[bytes, bytes]], max_workers: int | None = None
+    ) -> List[Tuple[bytes, bytes]]:
+        """
+        Return the signatures and addresses of a list of (signing hash, key) pairs, as returned
+        by `sign`.
+
+        If many signatures are missing from the cache, they are computed in parallel by up to
+        `max_workers` threads, by default `default_signing_workers()`.
+        """
+        if max_workers is None:
+            max_workers = default_signing_workers()
+        if self.directory is not None and not self._directory_loaded:
+            self._load_directory()
+        missing: Dict[bytes, Tuple[bytes, bytes]] = {}
+        for signing_hash, secret_key in requests:
+            key = _cache_key(signing_hash, secret_key)
+            if key not in self.signatures:
+                missing[key] = (signing_hash, secret_key)
+        if max_workers > 1 and len(missing) >= PARALLEL_SIGNING_MIN_COUNT:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                values = list(
+                    executor.map(lambda request: compute_signature(*request), missing.values())
+                )
+            for key, value in zip(missing, values, strict=True):
+                self._add(key, value)
+        return [self.sign(signing_hash, secret_key) for signing_hash, secret_key in requests]
+
+    def _add(self, key: bytes, value: bytes) -> None:
+        if len(self.signatures) >= self.max_size:
+            del self.signatures[next(iter(self.signatures))]
+        self.signatures[key] = value
+        if self.directory is None:
+            return
+        with self._lock:
+            try:
+                if self._file is None:
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                    file_name = f"{os.getpid()}-{uuid.uuid4().hex}{CACHE_FILE_SUFFIX}"
+                    self._file = open(self.directory / file_name, "ab")
+                self._file.write(encode_signature_record(key, value))
+            except OSError:
+                # The cache directory is an optimization, signatures are computed without it.
+                self.directory = None
+
+    def _load_directory(self) -> None:
+        assert self.directory is not None
+        self._directory_loaded = True
+        if not self.directory.is_dir():
+            return
+        for path in sorted(self.directory.glob(f"*{CACHE_FILE_SUFFIX}")):
+            for key, value in read_signature_records(path).items():
+                if len(self.signatures) >= self.max_size:
+                    return
+                self.signatures.setdefault(key, value)
+
+    def close(self) -> None:
+        """Flush and close the file the signatures of this process are written to."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def compact_signature_cache(directory: Path) -> None:
+    """
+    Merge the files of a cache directory into a single one if there are too many of them.
+
+    It should be called before the processes using the directory start, e.g. by the xdist
+    controller; files written concurrently by other sessions might lose their signatures, which
+    are then computed again.
+    """
+    paths = sorted(directory.glob(f"*{CACHE_FILE_SUFFIX}"))
+    if len(paths) <= MAX_CACHE_FILES:
+        return
+    records: Dict[bytes, bytes] = {}
+    for path in paths:
+        records.update(read_signature_records(path))
+    merged_path = directory / f"merged-{uuid.uuid4().hex}{CACHE_FILE_SUFFIX}"
+    temp_path = merged_path.with_suffix(".tmp")
+    with open(temp_path, "wb") as f:
+        for key, value in list(records.items())[-MAX_STORED_SIGNATURES:]:
+            f.write(encode_signature_record(key, value))
+    os.replace(temp_path, merged_path)
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+SIGNATURE_CACHE = SignatureCache()
+"""Signature cache of the current process."""
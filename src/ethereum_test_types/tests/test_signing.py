@@ -0,0 +1,221 @@
+"""Test the cache of the signatures of transactions and authorizations."""
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+from coincurve.keys import PrivateKey
+
+from ethereum_test_base_types import Address, Hash, TestAddress, TestPrivateKey
+
+from ..signing import (
+    CACHE_FILE_SUFFIX,
+    MAX_CACHE_FILES,
+    PARALLEL_SIGNING_MIN_COUNT,
+    RECORD_SIZE,
+    SignatureCache,
+    compact_signature_cache,
+)
+from ..types import (
+    EOA,
+    AuthorizationTuple,
+    Transaction,
+    sign_authorization_tuples,
+    sign_transactions,
+)
+
+SIGNING_HASHES = [Hash(i) for i in range(1, 21)]
+SECRET_KEY = Hash(TestPrivateKey)
+
+
+def expected_signature(signing_hash: Hash, secret_key: Hash = SECRET_KEY) -> bytes:
+    """Return the signature of the hash computed without cache."""
+    return PrivateKey(secret=secret_key).sign_recoverable(signing_hash, hasher=None)
+
+
+def cache_files(directory: Path) -> list[Path]:
+    """Return the files of a cache directory."""
+    return sorted(directory.glob(f"*{CACHE_FILE_SUFFIX}"))
+
+
+def test_signature_cache_in_memory():
+    """Test that the signatures are computed once per signing hash and key."""
+    cache = SignatureCache()
+    for signing_hash in SIGNING_HASHES:
+        signature, address = cache.sign(signing_hash, SECRET_KEY)
+        assert signature == expected_signature(signing_hash)
+        assert Address(address) == TestAddress
+    assert len(cache.signatures) == len(SIGNING_HASHES)
+    assert cache.sign(SIGNING_HASHES[0], SECRET_KEY)[0] == expected_signature(SIGNING_HASHES[0])
+    other_key = Hash(TestPrivateKey + 1)
+    assert cache.sign(SIGNING_HASHES[0], other_key)[0] == expected_signature(
+        SIGNING_HASHES[0], other_key
+    )
+    assert len(cache.signatures) == len(SIGNING_HASHES) + 1
+
+
+def test_signature_cache_size():
+    """Test that the oldest signatures are evicted from a full cache."""
+    cache = SignatureCache(max_size=5)
+    for signing_hash in SIGNING_HASHES:
+        cache.sign(signing_hash, SECRET_KEY)
+    assert len(cache.signatures) == 5
+    assert cache.sign(SIGNING_HASHES[0], SECRET_KEY)[0] == expected_signature(SIGNING_HASHES[0])
+
+
+def test_signature_cache_directory(tmp_path: Path):
+    """Test that the signatures written to the directory are reused by another cache."""
+    cache = SignatureCache()
+    cache.use_directory(tmp_path)
+    for signing_hash in SIGNING_HASHES:
+        cache.sign(signing_hash, SECRET_KEY)
+    cache.close()
+    assert [file.stat().st_size for file in cache_files(tmp_path)] == [
+        RECORD_SIZE * len(SIGNING_HASHES)
+    ]
+    # The secret key is never written to the cache.
+    assert bytes(SECRET_KEY) not in cache_files(tmp_path)[0].read_bytes()
+
+    reader = SignatureCache()
+    reader.use_directory(tmp_path)
+    reader.sign(SIGNING_HASHES[0], SECRET_KEY)
+    assert len(reader.signatures) == len(SIGNING_HASHES)
+    for signing_hash in SIGNING_HASHES:
+        assert reader.sign(signing_hash, SECRET_KEY)[0] == expected_signature(signing_hash)
+    reader.close()
+    # Nothing was signed by the reader, so nothing was written.
+    assert len(cache_files(tmp_path)) == 1
+
+
+def test_signature_cache_directory_larger_than_cache(tmp_path: Path):
+    """Test that a process only loads as many signatures from the directory as it caches."""
+    cache = SignatureCache()
+    cache.use_directory(tmp_path)
+    for signing_hash in SIGNING_HASHES:
+        cache.sign(signing_hash, SECRET_KEY)
+    cache.close()
+
+    reader = SignatureCache(max_size=5)
+    reader.use_directory(tmp_path)
+    reader.sign(SIGNING_HASHES[0], SECRET_KEY)
+    assert len(reader.signatures) == 5
+    for signing_hash in SIGNING_HASHES:
+        assert reader.sign(signing_hash, SECRET_KEY)[0] == expected_signature(signing_hash)
+    assert len(reader.signatures) == 5
+    reader.close()
+
+
+def test_signature_cache_invalid_records(tmp_path: Path):
+    """Test that invalid and truncated records are ignored and signed again."""
+    cache = SignatureCache()
+    cache.use_directory(tmp_path)
+    for signing_hash in SIGNING_HASHES[:3]:
+        cache.sign(signing_hash, SECRET_KEY)
+    cache.close()
+    cache_file = cache_files(tmp_path)[0]
+    data = bytearray(cache_file.read_bytes())
+    data[RECORD_SIZE + 70] ^= 0xFF  # Corrupt the signature of the second record.
+    cache_file.write_bytes(bytes(data[: 3 * RECORD_SIZE - 10]))  # Truncate the third record.
+
+    reader = SignatureCache()
+    reader.use_directory(tmp_path)
+    for signing_hash in SIGNING_HASHES[:3]:
+        assert reader.sign(signing_hash, SECRET_KEY)[0] == expected_signature(signing_hash)
+    reader.close()
+
+
+def sign_in_process(directory: Path, offset: int) -> None:
+    """Sign the signing hashes, starting from an offset, using the cache directory."""
+    cache = SignatureCache()
+    cache.use_directory(directory)
+    for signing_hash in SIGNING_HASHES[offset:] + SIGNING_HASHES[:offset]:
+        cache.sign(signing_hash, SECRET_KEY)
+    cache.close()
+
+
+def test_signature_cache_shared_by_processes(tmp_path: Path):
+    """Test that processes signing concurrently write valid records to their own files."""
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=sign_in_process, args=(tmp_path, offset)) for offset in (0, 10)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    files = cache_files(tmp_path)
+    assert 1 <= len(files) <= 2
+
+    reader = SignatureCache()
+    reader.use_directory(tmp_path)
+    reader.sign(SIGNING_HASHES[0], SECRET_KEY)
+    assert len(reader.signatures) == len(SIGNING_HASHES)
+    for signing_hash in SIGNING_HASHES:
+        assert reader.sign(signing_hash, SECRET_KEY)[0] == expected_signature(signing_hash)
+
+
+def test_compact_signature_cache(tmp_path: Path):
+    """Test that the files of a cache directory are merged once there are too many of them."""
+    for i in range(MAX_CACHE_FILES + 1):
+        cache = SignatureCache()
+        cache.use_directory(tmp_path)
+        cache.sign(Hash(1_000 + i), SECRET_KEY)
+        cache.close()
+    assert len(cache_files(tmp_path)) == MAX_CACHE_FILES + 1
+    compact_signature_cache(tmp_path)
+    assert [file.stat().st_size for file in cache_files(tmp_path)] == [
+        RECORD_SIZE * (MAX_CACHE_FILES + 1)
+    ]
+    compact_signature_cache(tmp_path)
+    assert len(cache_files(tmp_path)) == 1
+
+
+def test_transaction_signature_from_cache():
+    """Test that transactions signed with a cached signature are identical."""
+    tx = Transaction(nonce=1, gas_price=10, secret_key=TestPrivateKey)
+    expected_tx = tx.with_signature_and_sender()
+    assert expected_tx.sender == TestAddress
+    assert tx.with_signature_and_sender() == expected_tx
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_sign_many(max_workers: int):
+    """Test that signing in bulk gives the signatures computed one by one."""
+    requests = [
+        (Hash(i), Hash(TestPrivateKey + i % 3)) for i in range(2 * PARALLEL_SIGNING_MIN_COUNT)
+    ]
+    cache = SignatureCache()
+    cache.sign(*requests[0])
+    results = cache.sign_many(requests, max_workers=max_workers)
+    assert len(cache.signatures) == len(requests)
+    for (signing_hash, secret_key), (signature, address) in zip(requests, results, strict=True):
+        assert signature == expected_signature(signing_hash, secret_key)
+        assert address == bytes(EOA(key=secret_key))
+
+
+@pytest.mark.parametrize("count", [1, PARALLEL_SIGNING_MIN_COUNT + 1])
+def test_sign_transactions(count: int):
+    """Test that transactions signed in bulk are identical to transactions signed one by one."""
+    txs = [
+        Transaction(nonce=i, gas_price=10 + count, secret_key=TestPrivateKey + i % 2)
+        for i in range(count)
+    ]
+    # An already signed transaction.
+    txs.append(Transaction(nonce=count, gas_price=10, v=27, r=1, s=2, sender=TestAddress))
+    signed_txs = sign_transactions(txs, max_workers=4)
+    assert signed_txs == [tx.with_signature_and_sender() for tx in txs]
+
+
+@pytest.mark.parametrize("count", [1, PARALLEL_SIGNING_MIN_COUNT + 1])
+def test_sign_authorization_tuples(count: int):
+    """Test that authorization tuples signed in bulk are identical to the ones signed singly."""
+    authorizations = [
+        {"chain_id": count, "address": Address(i), "nonce": i, "signer": EOA(key=TestPrivateKey)}
+        if i % 2
+        else {"address": Address(i), "nonce": [i, i + 1], "secret_key": TestPrivateKey + 1}
+        for i in range(count)
+    ]
+    authorizations.append({"address": Address(1), "v": 0, "r": 1, "s": 2})
+    signed_authorizations = sign_authorization_tuples(authorizations, max_workers=4)
+    assert signed_authorizations == [AuthorizationTuple(**fields) for fields in authorizations]
@@ -2,9 +2,12 @@
 
 from typing import Tuple
 
+import ethereum_rlp as eth_rlp
 import pytest
 
-from ..types import AccessList, Hash, Transaction
+from ethereum_test_base_types import Address, TestPrivateKey
+
+from ..types import AccessList, AuthorizationTuple, Hash, Transaction
 
 
 @pytest.mark.parametrize(
@@ -262,3 +265,48 @@ def test_transaction_signing(
     assert tx.sender is not None
     assert tx.sender.hex() == expected_sender
     assert (tx.rlp().hex()) == expected_serialized
+
+
+def generic_rlp(tx: Transaction) -> bytes:
+    """Return the RLP of the transaction computed by the generic `eth_rlp.encode`."""
+    return tx.get_rlp_prefix() + eth_rlp.encode(tx.to_list(signing=False))
+
+
+def test_transaction_rlp_cache_invalidation():
+    """Test that the cached RLP of a transaction follows the changes of its fields."""
+    authorization = AuthorizationTuple(address=Address(1), secret_key=TestPrivateKey)
+    tx = Transaction(
+        ty=4,
+        nonce=1,
+        access_list=[AccessList(address=Address(2), storage_keys=[Hash(1)])],
+        authorization_list=[authorization],
+        secret_key=TestPrivateKey,
+    ).with_signature_and_sender()
+    rlp = tx.rlp()
+    assert rlp == generic_rlp(tx)
+    assert tx.rlp() == rlp
+
+    # Assigned field.
+    tx.nonce = 2
+    assert tx.rlp() == generic_rlp(tx) != rlp
+
+    # Field of a nested object.
+    rlp = tx.rlp()
+    authorization.nonce = 3
+    assert tx.rlp() == generic_rlp(tx) != rlp
+
+    # List modified in place, at any depth.
+    rlp = tx.rlp()
+    assert tx.access_list is not None and tx.authorization_list is not None
+    tx.access_list[0].storage_keys.append(Hash(2))
+    assert tx.rlp() == generic_rlp(tx) != rlp
+    rlp = tx.rlp()
+    tx.authorization_list.append(authorization)
+    assert tx.rlp() == generic_rlp(tx) != rlp
+
+    # Copies share the cache until one of them changes.
+    tx_copy = tx.copy()
+    assert tx_copy == tx
+    tx_copy.value = 1
+    assert tx_copy.rlp() == generic_rlp(tx_copy) != tx.rlp()
+    assert tx.rlp() == generic_rlp(tx)
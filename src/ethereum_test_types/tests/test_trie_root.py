@@ -0,0 +1,165 @@
+"""Test the single-pass trie roots against `HexaryTrie`."""
+
+import random
+import time
+from typing import List, Sequence, Tuple
+
+import ethereum_rlp as eth_rlp
+import pytest
+from ethereum.frontier.fork_types import Account as FrontierAccount
+from ethereum.frontier.fork_types import Address as FrontierAddress
+from ethereum.frontier.state import State, set_account, set_storage, state_root
+from ethereum_types.numeric import U256, Bytes32, Uint
+from trie import HexaryTrie
+
+from ethereum_test_base_types import Address, EmptyTrieRoot, Hash, TestPrivateKey
+
+from ..trie_root import _storage_roots, _subtrie_references, ordered_list_root, trie_root
+from ..types import Account, Alloc, Transaction
+
+
+def hexary_trie_root(items: Sequence[Tuple[bytes, bytes]]) -> bytes:
+    """Return the root of a `HexaryTrie` built by setting the items one at a time."""
+    t = HexaryTrie(db={})
+    for key, value in items:
+        t.set(key, value)
+    return t.root_hash
+
+
+def hexary_list_root(values: Sequence[bytes]) -> bytes:
+    """Return the root of the ordered list as computed by `Transaction.list_root` before."""
+    return hexary_trie_root([(eth_rlp.encode(Uint(i)), value) for i, value in enumerate(values)])
+
+
+def random_bytes(rng: random.Random, length: int) -> bytes:
+    """Return random bytes of the given length."""
+    return bytes(rng.getrandbits(8) for _ in range(length))
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 16, 17, 127, 128, 129, 300])
+def test_ordered_list_root(count: int):
+    """Test the roots of lists of short and long values, around the RLP key size boundaries."""
+    rng = random.Random(count)
+    values = [random_bytes(rng, rng.choice([1, 2, 20, 31, 32, 33, 150])) for _ in range(count)]
+    assert ordered_list_root(values) == hexary_list_root(values)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_trie_root(seed: int):
+    """
+    Test the roots of tries whose keys share prefixes, are prefixes of each other or are
+    repeated, and whose values are short, long or empty.
+    """
+    rng = random.Random(seed)
+    items: List[Tuple[bytes, bytes]] = [
+        (
+            bytes(rng.choice([0x00, 0x01, 0x10, 0xFF]) for _ in range(rng.randrange(4))),
+            random_bytes(rng, rng.choice([0, 1, 5, 40])),
+        )
+        for _ in range(rng.randrange(40))
+    ]
+    assert trie_root(items) == hexary_trie_root(items)
+
+
+def test_secure_trie_root():
+    """Test the root of a trie keyed by hashes, as the state and storage tries."""
+    rng = random.Random(0)
+    items = {random_bytes(rng, 32): random_bytes(rng, rng.randrange(1, 80)) for _ in range(500)}
+    assert trie_root(items) == hexary_trie_root(list(items.items()))
+    assert trie_root({}) == EmptyTrieRoot
+
+
+def frontier_state_root(alloc: Alloc) -> bytes:
+    """Return the state root of the allocation computed by the execution specs."""
+    state = State()
+    for address, account in alloc.root.items():
+        assert account is not None
+        set_account(
+            state=state,
+            address=FrontierAddress(address),
+            account=FrontierAccount(
+                nonce=Uint(account.nonce), balance=U256(account.balance), code=account.code
+            ),
+        )
+        for key, value in account.storage.root.items():
+            set_storage(
+                state=state,
+                address=FrontierAddress(address),
+                key=Bytes32(Hash(key)),
+                value=U256(value),
+            )
+    return state_root(state)
+
+
+def random_account(rng: random.Random) -> Account:
+    """Return an account with random fields and storage, including empty ones and zero slots."""
+    return Account(
+        nonce=rng.choice([0, 1, 2**64 - 1]),
+        balance=rng.choice([0, 1, 10**30]),
+        code=random_bytes(rng, rng.choice([0, 1, 50])),
+        storage={
+            rng.choice([0, 1, rng.getrandbits(256)]): rng.choice([0, 1, rng.getrandbits(256)])
+            for _ in range(rng.choice([0, 1, 3, 40]))
+        },
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_state_root(seed: int):
+    """Test the state roots of random allocations against the execution specs."""
+    rng = random.Random(seed)
+    alloc = Alloc(
+        {Address(rng.getrandbits(160)): random_account(rng) for _ in range(rng.randrange(12))}
+    )
+    assert alloc.state_root() == frontier_state_root(alloc)
+
+
+def test_state_root_after_changes():
+    """Test that the memoized roots follow the changes of an allocation with large storage."""
+    alloc = Alloc({1: Account(storage={i: i + 1 for i in range(1_000)}), 2: Account(balance=1)})
+    root = alloc.state_root()
+    assert root == frontier_state_root(alloc)
+    alloc[1].storage[7] = 0
+    assert alloc.state_root() == frontier_state_root(alloc) != root
+    alloc[1].storage[1_000] = 1
+    alloc[2].balance = 2
+    assert alloc.state_root() == frontier_state_root(alloc)
+    alloc[1].storage[7] = 8
+    del alloc[1].storage[1_000]
+    alloc[2].balance = 1
+    assert alloc.state_root() == root
+
+
+def test_state_root_with_bounded_caches(monkeypatch: pytest.MonkeyPatch):
+    """Test that the memoized roots are evicted once they exceed their budget of items."""
+    for cache in (_storage_roots, _subtrie_references):
+        monkeypatch.setattr(cache, "max_items", 100)
+        monkeypatch.setattr(cache, "entries", {})
+        monkeypatch.setattr(cache, "items", 0)
+    rng = random.Random(0)
+    for _ in range(10):
+        alloc = Alloc({Address(rng.getrandbits(160)): random_account(rng) for _ in range(5)})
+        assert alloc.state_root() == frontier_state_root(alloc)
+        assert 0 < _storage_roots.items <= 100
+        assert _subtrie_references.items <= 100
+
+
+@pytest.mark.run_in_serial
+def test_list_root_benchmark():
+    """Benchmark `Transaction.list_root` of a large block against `HexaryTrie`."""
+    txs = [Transaction(nonce=i, data=bytes(100), secret_key=TestPrivateKey) for i in range(500)]
+    txs = [tx.with_signature_and_sender() for tx in txs]
+    tx_rlps = [tx.rlp() for tx in txs]
+
+    start = time.perf_counter()
+    expected_root = hexary_list_root(tx_rlps)
+    hexary_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    root = Transaction.list_root(txs)
+    list_root_time = time.perf_counter() - start
+
+    assert root == expected_root
+    assert list_root_time < hexary_time, (
+        f"list_root: {list_root_time * 1000:.1f}ms, HexaryTrie: {hexary_time * 1000:.1f}ms"
+    )
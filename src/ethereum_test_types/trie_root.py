@@ -0,0 +1,249 @@
+"""
+Root hashes of Merkle Patricia tries built in a single pass.
+
+`HexaryTrie` inserts the key-value pairs one at a time, storing and hashing every
+intermediate node. When all the pairs are known upfront, e.g. the transactions of a block, the
+trie is built bottom-up from the sorted keys instead, encoding and hashing each node once.
+"""
+
+from functools import lru_cache
+from typing import Dict, Generic, Hashable, Iterable, List, Mapping, Sequence, Tuple, TypeVar
+
+from Crypto.Hash import keccak
+from ethereum_types.numeric import U256, Uint
+
+from ethereum_test_base_types import EmptyTrieRoot, Hash
+from ethereum_test_base_types.serialization import (
+    rlp_encode_bytes,
+    rlp_encode_list_payload,
+    rlp_encode_uint,
+)
+
+# The RLP of an empty string, used for empty branch slots.
+_EMPTY = b"\x80"
+
+# Storage roots and account encodings are memoized by content, so the state roots of
+# allocations that share accounts, e.g. the system contracts of a fork, only hash the accounts
+# that differ. The storage roots are memoized up to a total number of storage slots.
+STORAGE_ROOT_CACHE_ITEMS = 1 << 18
+ACCOUNT_CACHE_SIZE = 1 << 16
+
+# Total size, in bytes, of the code whose hash is memoized; accounts are memoized by the hash
+# of their code, so they don't keep their code alive.
+CODE_HASH_CACHE_BYTES = 1 << 24
+
+# Sub-tries of at least this many items are memoized by content, up to a total number of items,
+# so a trie that differs from a previous one in a few items, e.g. the storage of an account with
+# one more slot, only encodes the nodes on the paths to those items.
+MEMOIZED_SUBTRIE_MIN_SIZE = 16
+SUBTRIE_CACHE_ITEMS = 1 << 18
+
+# Storage slots of an account, as (key, value) pairs.
+StorageItems = Tuple[Tuple[int, int], ...]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _ItemBudgetCache(Generic[K, V]):
+    """
+    Memo of values computed from collections of items, whose oldest entries are evicted once
+    the total number of items of the entries exceeds the budget.
+    """
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self.entries: Dict[K, Tuple[V, int]] = {}
+        self.items = 0
+
+    def get(self, key: K) -> V | None:
+        entry = self.entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def add(self, key: K, value: V, items: int) -> None:
+        self.entries[key] = (value, items)
+        self.items += items
+        while self.items > self.max_items:
+            self.items -= self.entries.pop(next(iter(self.entries)))[1]
+
+
+def _keccak256(data: bytes) -> bytes:
+    return keccak.new(data=data, digest_bits=256).digest()
+
+
+# Translates the ASCII hex digits of a key into its nibbles, one per byte.
+_HEX_DIGITS_TO_NIBBLES = bytes.maketrans(b"0123456789abcdef", bytes(range(16)))
+
+
+def _nibbles(key: bytes) -> bytes:
+    """Return the nibbles of the key, one per byte."""
+    return key.hex().encode().translate(_HEX_DIGITS_TO_NIBBLES)
+
+
+def _hex_prefix(nibbles: bytes, is_leaf: bool) -> bytes:
+    """Return the hex-prefix encoding of a path."""
+    flag = 0x20 if is_leaf else 0x00
+    if len(nibbles) % 2:
+        prefix = bytes([flag | 0x10 | nibbles[0]])
+        nibbles = nibbles[1:]
+    else:
+        prefix = bytes([flag])
+    return prefix + bytes(
+        (high << 4) | low for high, low in zip(nibbles[::2], nibbles[1::2], strict=True)
+    )
+
+
+def _reference(encoded_node: bytes) -> bytes:
+    """Return how a node is referenced by its parent: inline if short, by hash otherwise."""
+    if len(encoded_node) < 32:
+        return encoded_node
+    return rlp_encode_bytes(_keccak256(encoded_node))
+
+
+def _encode_node(items: Sequence[Tuple[bytes, bytes]], start: int, end: int, depth: int) -> bytes:
+    """
+    Return the RLP of the node of the sub-trie of `items[start:end]`, whose paths all share
+    their first `depth` nibbles.
+    """
+    first_path, first_value = items[start]
+    if end - start == 1:
+        return rlp_encode_list_payload(
+            rlp_encode_bytes(_hex_prefix(first_path[depth:], is_leaf=True))
+            + rlp_encode_bytes(first_value)
+        )
+
+    # The items are sorted, so the prefix shared by all of them is the prefix shared by the
+    # first and the last.
+    last_path = items[end - 1][0]
+    common_end = depth
+    max_common_end = min(len(first_path), len(last_path))
+    while common_end < max_common_end and first_path[common_end] == last_path[common_end]:
+        common_end += 1
+    if common_end > depth:
+        return rlp_encode_list_payload(
+            rlp_encode_bytes(_hex_prefix(first_path[depth:common_end], is_leaf=False))
+            + _reference(_encode_node(items, start, end, common_end))
+        )
+
+    # Branch node: a path ending here is the value of the branch, it's sorted first.
+    value = _EMPTY
+    if len(first_path) == depth:
+        value = rlp_encode_bytes(first_value)
+        start += 1
+    slots: List[bytes] = [_EMPTY] * 16
+    while start < end:
+        nibble = items[start][0][depth]
+        child_end = start + 1
+        while child_end < end and items[child_end][0][depth] == nibble:
+            child_end += 1
+        if child_end - start >= MEMOIZED_SUBTRIE_MIN_SIZE:
+            slots[nibble] = _encode_subtrie_reference(tuple(items[start:child_end]), depth + 1)
+        else:
+            slots[nibble] = _reference(_encode_node(items, start, child_end, depth + 1))
+        start = child_end
+    return rlp_encode_list_payload(b"".join(slots) + value)
+
+
+_subtrie_references: _ItemBudgetCache[Tuple[Tuple[Tuple[bytes, bytes], ...], int], bytes] = (
+    _ItemBudgetCache(SUBTRIE_CACHE_ITEMS)
+)
+
+
+def _encode_subtrie_reference(items: Tuple[Tuple[bytes, bytes], ...], depth: int) -> bytes:
+    reference = _subtrie_references.get((items, depth))
+    if reference is None:
+        reference = _reference(_encode_node(items, 0, len(items), depth))
+        _subtrie_references.add((items, depth), reference, len(items))
+    return reference
+
+
+def trie_root(items: Mapping[bytes, bytes] | Iterable[Tuple[bytes, bytes]]) -> Hash:
+    """
+    Return the root hash of the trie of the key-value pairs, identical to the root of a
+    `HexaryTrie` in which all the pairs are set.
+
+    As in `HexaryTrie`, empty values are not stored in the trie and, if a key is repeated, its
+    last value is stored.
+    """
+    if not isinstance(items, Mapping):
+        items = dict(items)
+    nibble_items = sorted((_nibbles(key), value) for key, value in items.items() if value)
+    if not nibble_items:
+        return Hash(EmptyTrieRoot)
+    return Hash(_keccak256(_encode_node(nibble_items, 0, len(nibble_items), 0)))
+
+
+def ordered_list_root(values: Sequence[bytes]) -> Hash:
+    """
+    Return the root hash of the trie of an ordered list, keyed by the RLP of each index, as
+    for the transactions, receipts and withdrawals of a block.
+    """
+    return trie_root((rlp_encode_uint(i), value) for i, value in enumerate(values))
+
+
+@lru_cache(maxsize=ACCOUNT_CACHE_SIZE)
+def _secure_key(key: bytes) -> bytes:
+    return _keccak256(key)
+
+
+_storage_roots: _ItemBudgetCache[StorageItems, Hash] = _ItemBudgetCache(STORAGE_ROOT_CACHE_ITEMS)
+
+
+def storage_trie_root(storage: StorageItems) -> Hash:
+    """
+    Return the root of the storage trie of an account, keyed by the hash of each slot, in which
+    slots with a zero value are not stored.
+
+    The root is memoized by the contents of the storage.
+    """
+    root = _storage_roots.get(storage)
+    if root is None:
+        slots = dict(storage)
+        root = trie_root(
+            {
+                _secure_key(key.to_bytes(32, "big")): rlp_encode_bytes(U256(value).to_be_bytes())
+                for key, value in slots.items()
+                if value != 0
+            }
+        )
+        _storage_roots.add(storage, root, len(storage))
+    return root
+
+
+_code_hashes: _ItemBudgetCache[bytes, bytes] = _ItemBudgetCache(CODE_HASH_CACHE_BYTES)
+
+
+def _code_hash(code: bytes) -> bytes:
+    code_hash = _code_hashes.get(code)
+    if code_hash is None:
+        code_hash = _keccak256(code)
+        _code_hashes.add(code, code_hash, len(code))
+    return code_hash
+
+
+@lru_cache(maxsize=ACCOUNT_CACHE_SIZE)
+def _encode_account(nonce: int, balance: int, code_hash: bytes, storage_root: bytes) -> bytes:
+    return rlp_encode_list_payload(
+        rlp_encode_bytes(Uint(nonce).to_be_bytes())
+        + rlp_encode_bytes(U256(balance).to_be_bytes())
+        + rlp_encode_bytes(storage_root)
+        + rlp_encode_bytes(code_hash)
+    )
+
+
+def state_trie_root(accounts: Iterable[Tuple[bytes, int, int, bytes, StorageItems]]) -> Hash:
+    """
+    Return the root of the state trie of the accounts, given as (address, nonce, balance, code,
+    storage) tuples, identical to the root computed by the execution specs.
+
+    The storage root and the encoding of each account are memoized by content, so only the
+    accounts that were not part of a previous state are hashed.
+    """
+    return trie_root(
+        {
+            _secure_key(bytes(address)): _encode_account(
+                nonce, balance, _code_hash(code), storage_trie_root(storage)
+            )
+            for address, nonce, balance, code, storage in accounts
+        }
+    )
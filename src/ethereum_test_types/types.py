@@ -4,14 +4,10 @@ from abc import abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass
 from functools import cached_property
-from typing import Any, ClassVar, Dict, Generic, List, Literal, Sequence, SupportsBytes
+from typing import Any, ClassVar, Dict, Generic, List, Literal, Sequence, SupportsBytes, Tuple
 
 import ethereum_rlp as eth_rlp
 from coincurve.keys import PrivateKey, PublicKey
-from ethereum.frontier.fork_types import Account as FrontierAccount
-from ethereum.frontier.fork_types import Address as FrontierAddress
-from ethereum.frontier.state import State, set_account, set_storage, state_root
-from ethereum_types.numeric import U256, Bytes32, Uint
 from pydantic import (
     AliasChoices,
     BaseModel,
@@ -22,7 +18,6 @@ from pydantic import (
     model_serializer,
     model_validator,
 )
-from trie import HexaryTrie
 
 from ethereum_test_base_types import (
     AccessList,
@@ -55,6 +50,9 @@ from ethereum_test_exceptions import TransactionException
 from ethereum_test_forks import Fork
 from ethereum_test_vm import EVMCodeType
 
+from .signing import PARALLEL_SIGNING_MIN_COUNT, SIGNATURE_CACHE
+from .trie_root import ordered_list_root, state_trie_root
+
 
 def keccak256(data: bytes) -> Hash:
     """Calculate keccak256 hash of the given data."""
@@ -220,28 +218,17 @@ class Alloc(BaseAlloc):
 
     def state_root(self) -> bytes:
         """Return state root of the allocation."""
-        state = State()
-        for address, account in self.root.items():
-            if account is None:
-                continue
-            set_account(
-                state=state,
-                address=FrontierAddress(address),
-                account=FrontierAccount(
-                    nonce=Uint(account.nonce) if account.nonce is not None else Uint(0),
-                    balance=(U256(account.balance) if account.balance is not None else U256(0)),
-                    code=account.code if account.code is not None else b"",
-                ),
+        return state_trie_root(
+            (
+                address,
+                account.nonce if account.nonce is not None else 0,
+                account.balance if account.balance is not None else 0,
+                account.code if account.code is not None else b"",
+                tuple(account.storage.root.items()) if account.storage is not None else (),
             )
-            if account.storage is not None:
-                for key, value in account.storage.root.items():
-                    set_storage(
-                        state=state,
-                        address=FrontierAddress(address),
-                        key=Bytes32(Hash(key)),
-                        value=U256(value),
-                    )
-        return state_root(state)
+            for address, account in self.root.items()
+            if account is not None
+        )
 
     def verify_post_alloc(self, got_alloc: "Alloc"):
         """
@@ -448,9 +435,11 @@ class AuthorizationTuple(AuthorizationTupleGeneric[HexNumber]):
                 signing_key = eoa.key
             assert signing_key is not None, "secret_key or signer must be set"
 
-            signature_bytes = PrivateKey(secret=signing_key).sign_recoverable(
-                rlp_signing_bytes, hasher=keccak256
+            signature_bytes, signer_address = SIGNATURE_CACHE.sign(
+                rlp_signing_bytes.keccak256(), signing_key
             )
+            if self.signer is None:
+                self.signer = EOA(address=Address(signer_address))
             self.v, self.r, self.s = (
                 HexNumber(signature_bytes[64]),
                 HexNumber(int.from_bytes(signature_bytes[0:32], byteorder="big")),
@@ -479,6 +468,41 @@ class AuthorizationTuple(AuthorizationTupleGeneric[HexNumber]):
                 pass
 
 
+def sign_authorization_tuples(
+    authorizations: Sequence[Dict[str, Any]], max_workers: int | None = None
+) -> List[AuthorizationTuple]:
+    """
+    Return the authorization tuples with the given fields, e.g. `address`, `nonce` and `signer`,
+    identical to `[AuthorizationTuple(**fields) for fields in authorizations]`, but computing
+    the signatures of a large number of tuples in parallel.
+
+    Authorization tuples sign themselves when they are created by the tests, so the framework
+    doesn't call this function itself: tests that create many tuples should use it instead of
+    creating the tuples one by one.
+    """
+    if len(authorizations) < PARALLEL_SIGNING_MIN_COUNT:
+        return [AuthorizationTuple(**fields) for fields in authorizations]
+    requests: List[Tuple[bytes, bytes]] = []
+    for fields in authorizations:
+        if {"v", "r", "s"} & fields.keys():
+            continue
+        signing_key = fields.get("secret_key")
+        if signing_key is None and fields.get("signer") is not None:
+            signing_key = fields["signer"].key
+        if signing_key is None:
+            continue
+        unsigned = AuthorizationTupleGeneric[HexNumber](
+            **{
+                name: fields[name]
+                for name in AuthorizationTuple.rlp_signing_fields
+                if name in fields
+            }
+        )
+        requests.append((unsigned.rlp_signing_bytes().keccak256(), Hash(signing_key)))
+    SIGNATURE_CACHE.sign_many(requests, max_workers=max_workers)
+    return [AuthorizationTuple(**fields) for fields in authorizations]
+
+
 class TransactionLog(CamelModel):
     """Transaction log."""
 
@@ -536,6 +560,8 @@ class TransactionGeneric(BaseModel, Generic[NumberBoundTypeVar]):
     FixtureTransaction (blockchain).
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     ty: NumberBoundTypeVar = Field(0, alias="type")  # type: ignore
     chain_id: NumberBoundTypeVar = Field(default_factory=lambda: TransactionDefaults.chain_id)  # type: ignore
     nonce: NumberBoundTypeVar = Field(0)  # type: ignore
@@ -752,9 +778,7 @@ class Transaction(
                 signing_key = eoa.key
             assert signing_key is not None, "secret_key or signer must be set"
 
-            signature_bytes = PrivateKey(secret=signing_key).sign_recoverable(
-                rlp_signing_bytes, hasher=keccak256
-            )
+            signature_bytes, _ = SIGNATURE_CACHE.sign(rlp_signing_bytes.keccak256(), signing_key)
             v, r, s = (
                 signature_bytes[64],
                 int.from_bytes(signature_bytes[0:32], byteorder="big"),
@@ -815,15 +839,8 @@ class Transaction(
         # Get the signing bytes
         signing_hash = self.rlp_signing_bytes().keccak256()
 
-        # Sign the bytes
-        signature_bytes = PrivateKey(secret=self.secret_key).sign_recoverable(
-            signing_hash, hasher=None
-        )
-        public_key = PublicKey.from_signature_and_message(
-            signature_bytes, signing_hash, hasher=None
-        )
-
-        sender = keccak256(public_key.format(compressed=False)[1:])[32 - 20 :]
+        # Sign the bytes, or get the signature of a previous signing of the same bytes
+        signature_bytes, sender = SIGNATURE_CACHE.sign(signing_hash, self.secret_key)
         updated_values["sender"] = Address(sender)
 
         v, r, s = (
@@ -966,10 +983,7 @@ class Transaction(
     @staticmethod
     def list_root(input_txs: List["Transaction"]) -> Hash:
         """Return transactions root of a list of transactions."""
-        t = HexaryTrie(db={})
-        for i, tx in enumerate(input_txs):
-            t.set(eth_rlp.encode(Uint(i)), tx.rlp())
-        return Hash(t.root_hash)
+        return ordered_list_root([tx.rlp() for tx in input_txs])
 
     @staticmethod
     def list_blob_versioned_hashes(input_txs: List["Transaction"]) -> List[Hash]:
@@ -992,6 +1006,26 @@ class Transaction(
         return Address(hash_bytes[-20:])
 
 
+def sign_transactions(
+    txs: Sequence[Transaction], max_workers: int | None = None
+) -> List[Transaction]:
+    """
+    Return the signed versions of the transactions, identical to calling
+    `with_signature_and_sender` on each of them, but computing the missing signatures of a large
+    number of transactions in parallel.
+    """
+    if len(txs) >= PARALLEL_SIGNING_MIN_COUNT:
+        SIGNATURE_CACHE.sign_many(
+            [
+                (tx.rlp_signing_bytes().keccak256(), tx.secret_key)
+                for tx in txs
+                if tx.secret_key is not None and not {"v", "r", "s"} & tx.model_fields_set
+            ],
+            max_workers=max_workers,
+        )
+    return [tx.with_signature_and_sender() for tx in txs]
+
+
 class NetworkWrappedTransaction(CamelModel, RLPSerializable):
     """
     Network wrapped transaction as defined in
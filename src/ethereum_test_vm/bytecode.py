@@ -1,9 +1,59 @@
 """Ethereum Virtual Machine bytecode primitives and utilities."""
 
-from typing import SupportsBytes
+from typing import SupportsBytes, Tuple
 
 from ethereum_test_base_types import Bytes, Hash
 
+# Popped and pushed stack items, minimum and maximum stack height of a bytecode.
+StackProperties = Tuple[int, int, int, int]
+
+# Minimum length of the bytecode objects whose additions share a buffer, below which copying
+# the bytes is cheaper.
+SHARED_BUFFER_MIN_LENGTH = 64
+
+
+def concatenate_stack_properties(a: StackProperties, b: StackProperties) -> StackProperties:
+    """
+    Return the stack properties of the concatenation of two bytecodes, `c = a + b`.
+
+    The concatenation is associative, so the properties of a bytecode repeated `n` times can be
+    computed by repeated squaring.
+    """
+    # Figure out the stack height after executing the two opcodes.
+    a_pop, a_push, a_min, a_max = a
+    b_pop, b_push, b_min, b_max = b
+
+    # NOTE: "_pop" is understood as the number of elements required by an instruction or
+    # bytecode to be popped off the stack before it starts returning (pushing).
+
+    # Auxiliary variables representing "stages" of the execution of `c = a + b` bytecode:
+    # Assume starting point 0 as reference:
+    a_start = 0
+    # A (potentially) pops some elements and reaches its "bottom", might be negative:
+    a_bottom = a_start - a_pop
+    # After this A pushes some elements, then B pops and reaches its "bottom":
+    b_bottom = a_bottom + a_push - b_pop
+
+    # C's bottom is either at the bottom of A or B:
+    c_bottom = min(a_bottom, b_bottom)
+    if c_bottom == a_bottom:
+        # C pops the same as A to reach its bottom, then the rest of A and B are C's "push"
+        c_pop = a_pop
+        c_push = a_push - b_pop + b_push
+    else:
+        # A and B are C's "pop" to reach its bottom, then pushes the same as B
+        c_pop = a_pop - a_push + b_pop
+        c_push = b_push
+
+    # C's minimum required stack is either A's or B's shifted by the net stack balance of A
+    c_min = max(a_min, b_min + a_pop - a_push)
+
+    # C starts from c_min, then reaches max either in the spot where A reached a_max or in the
+    # spot where B reached b_max, after A had completed.
+    c_max = max(c_min + a_max - a_min, c_min - a_pop + a_push + b_max - b_min)
+
+    return c_pop, c_push, c_min, c_max
+
 
 class Bytecode:
     """
@@ -23,7 +73,14 @@ class Bytecode:
     """
 
     _name_: str = ""
-    _bytes_: bytes
+
+    # The bytes of a bytecode are a prefix of a buffer that can be shared with the bytecode
+    # objects it's concatenated to: the result of an addition to the bytecode that ends the
+    # buffer extends it in place, so that building a large bytecode by repeated additions,
+    # e.g. in a `code += ...` loop, takes linear time instead of copying it on every addition.
+    _buffer_: bytearray | None = None
+    _length_: int = 0
+    _cached_bytes_: bytes | None = None
 
     popped_stack_items: int
     pushed_stack_items: int
@@ -59,7 +116,9 @@ class Bytecode:
             # Required because Enum class calls the base class with the instantiated object as
             # parameter.
             obj = super().__new__(cls)
-            obj._bytes_ = bytes_or_byte_code_base._bytes_
+            obj._buffer_ = bytes_or_byte_code_base._buffer_
+            obj._length_ = bytes_or_byte_code_base._length_
+            obj._cached_bytes_ = bytes_or_byte_code_base._cached_bytes_
             obj.popped_stack_items = bytes_or_byte_code_base.popped_stack_items
             obj.pushed_stack_items = bytes_or_byte_code_base.pushed_stack_items
             obj.min_stack_height = bytes_or_byte_code_base.min_stack_height
@@ -89,13 +148,56 @@ class Bytecode:
 
         raise TypeError("Bytecode constructor '__new__' didn't return an instance!")
 
+    @property
+    def _bytes_(self) -> bytes:
+        """Return the bytes of the bytecode, copied out of the shared buffer on first use."""
+        if self._cached_bytes_ is None:
+            assert self._buffer_ is not None
+            with memoryview(self._buffer_) as view:
+                self._cached_bytes_ = bytes(view[: self._length_])
+        return self._cached_bytes_
+
+    @_bytes_.setter
+    def _bytes_(self, value: bytes) -> None:
+        self._buffer_ = None
+        self._length_ = len(value)
+        self._cached_bytes_ = value
+
+    def _concatenate_bytes(
+        self, other: bytes, stack_properties: StackProperties, terminating: bool
+    ) -> "Bytecode":
+        """
+        Return a bytecode with the bytes of this bytecode followed by the given bytes, and the
+        given stack properties.
+        """
+        c = object.__new__(Bytecode)
+        if self._length_ < SHARED_BUFFER_MIN_LENGTH:
+            c._cached_bytes_ = self._bytes_ + other
+            c._length_ = len(c._cached_bytes_)
+        else:
+            buffer = self._buffer_
+            if buffer is None or len(buffer) != self._length_:
+                # The buffer doesn't exist yet or was already extended by another addition.
+                buffer = bytearray(self._bytes_)
+            buffer += other
+            c._buffer_ = buffer
+            c._length_ = len(buffer)
+        (
+            c.popped_stack_items,
+            c.pushed_stack_items,
+            c.min_stack_height,
+            c.max_stack_height,
+        ) = stack_properties
+        c.terminating = terminating
+        return c
+
     def __bytes__(self) -> bytes:
         """Return the opcode byte representation."""
         return self._bytes_
 
     def __len__(self) -> int:
         """Return the length of the opcode byte representation."""
-        return len(self._bytes_)
+        return self._length_
 
     def __str__(self) -> str:
         """Return the name of the opcode, assigned at Enum creation."""
@@ -141,54 +243,23 @@ class Bytecode:
             return self
 
         if isinstance(other, bytes):
-            c = Bytecode(self)
-            c._bytes_ += other
-            c._name_ = ""
-            return c
+            return self._concatenate_bytes(other, self.stack_properties, self.terminating)
 
         assert isinstance(other, Bytecode), "Can only concatenate Bytecode instances"
-        # Figure out the stack height after executing the two opcodes.
-        a_pop, a_push = self.popped_stack_items, self.pushed_stack_items
-        a_min, a_max = self.min_stack_height, self.max_stack_height
-        b_pop, b_push = other.popped_stack_items, other.pushed_stack_items
-        b_min, b_max = other.min_stack_height, other.max_stack_height
-
-        # NOTE: "_pop" is understood as the number of elements required by an instruction or
-        # bytecode to be popped off the stack before it starts returning (pushing).
-
-        # Auxiliary variables representing "stages" of the execution of `c = a + b` bytecode:
-        # Assume starting point 0 as reference:
-        a_start = 0
-        # A (potentially) pops some elements and reaches its "bottom", might be negative:
-        a_bottom = a_start - a_pop
-        # After this A pushes some elements, then B pops and reaches its "bottom":
-        b_bottom = a_bottom + a_push - b_pop
-
-        # C's bottom is either at the bottom of A or B:
-        c_bottom = min(a_bottom, b_bottom)
-        if c_bottom == a_bottom:
-            # C pops the same as A to reach its bottom, then the rest of A and B are C's "push"
-            c_pop = a_pop
-            c_push = a_push - b_pop + b_push
-        else:
-            # A and B are C's "pop" to reach its bottom, then pushes the same as B
-            c_pop = a_pop - a_push + b_pop
-            c_push = b_push
-
-        # C's minimum required stack is either A's or B's shifted by the net stack balance of A
-        c_min = max(a_min, b_min + a_pop - a_push)
-
-        # C starts from c_min, then reaches max either in the spot where A reached a_max or in the
-        # spot where B reached b_max, after A had completed.
-        c_max = max(c_min + a_max - a_min, c_min - a_pop + a_push + b_max - b_min)
-
-        return Bytecode(
-            bytes(self) + bytes(other),
-            popped_stack_items=c_pop,
-            pushed_stack_items=c_push,
-            min_stack_height=c_min,
-            max_stack_height=c_max,
-            terminating=other.terminating,
+        return self._concatenate_bytes(
+            other._bytes_,
+            concatenate_stack_properties(self.stack_properties, other.stack_properties),
+            other.terminating,
+        )
+
+    @property
+    def stack_properties(self) -> StackProperties:
+        """Return the popped and pushed stack items and the minimum and maximum stack height."""
+        return (
+            self.popped_stack_items,
+            self.pushed_stack_items,
+            self.min_stack_height,
+            self.max_stack_height,
         )
 
     def __radd__(self, other: "Bytecode | int | None") -> "Bytecode":
@@ -205,10 +276,33 @@ class Bytecode:
             raise ValueError("Cannot multiply by a negative number")
         if other == 0:
             return Bytecode()
-        output = self
-        for _ in range(other - 1):
-            output += self
-        return output
+        if other == 1:
+            return self
+        c = Bytecode(self)
+        c._name_ = ""
+        c._bytes_ = self._bytes_ * other
+        # Compute the stack properties of `self + self + ...` by repeated squaring.
+        properties: StackProperties | None = None
+        square = self.stack_properties
+        while True:
+            if other & 1:
+                properties = (
+                    square
+                    if properties is None
+                    else concatenate_stack_properties(properties, square)
+                )
+            other >>= 1
+            if not other:
+                break
+            square = concatenate_stack_properties(square, square)
+        assert properties is not None
+        (
+            c.popped_stack_items,
+            c.pushed_stack_items,
+            c.min_stack_height,
+            c.max_stack_height,
+        ) = properties
+        return c
 
     def hex(self) -> str:
         """Return the hexadecimal representation of the opcode byte representation."""
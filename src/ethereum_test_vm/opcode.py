@@ -8,11 +8,12 @@ to @ThreeHrSleep for integrating it in the docstrings.
 """
 
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Callable, Iterable, List, Mapping, Optional, SupportsBytes
 
 from ethereum_test_base_types import to_bytes
 
-from .bytecode import Bytecode
+from .bytecode import Bytecode, StackProperties, concatenate_stack_properties
 
 
 def _get_int_size(n: int) -> int:
@@ -30,14 +31,13 @@ def _get_int_size(n: int) -> int:
 KW_ARGS_DEFAULTS_TYPE = Mapping[str, "int | bytes | str | Opcode | Bytecode"]
 
 
-def _stack_argument_to_bytecode(
-    arg: "int | bytes | SupportsBytes | str | Opcode | Bytecode | Iterable[int]",
-) -> Bytecode:
-    """Convert stack argument in an opcode or macro to bytecode."""
-    if isinstance(arg, Bytecode):
-        return arg
+# Number of push encodings of constant stack arguments that are memoized. Tests push the same
+# few constants over and over, e.g. storage keys, offsets and addresses.
+PUSH_ENCODING_CACHE_SIZE = 4096
 
-    # We are going to push a constant to the stack.
+
+def _push_constant(arg: "int | bytes | SupportsBytes | str | Iterable[int]") -> "Opcode":
+    """Return the push opcode with the minimal encoding of a constant stack argument."""
     data_size = 0
     if isinstance(arg, int):
         signed = arg < 0
@@ -65,6 +65,58 @@ def _stack_argument_to_bytecode(
     return new_opcode
 
 
+_cached_push_constant = lru_cache(maxsize=PUSH_ENCODING_CACHE_SIZE)(_push_constant)
+
+
+def _stack_argument_to_bytecode(
+    arg: "int | bytes | SupportsBytes | str | Opcode | Bytecode | Iterable[int]",
+) -> Bytecode:
+    """Convert stack argument in an opcode or macro to bytecode."""
+    if isinstance(arg, Bytecode):
+        return arg
+
+    # We are going to push a constant to the stack.
+    if type(arg) is int and 0 <= arg < len(_small_int_push_opcodes):
+        return _small_int_push_opcodes[arg]
+    if isinstance(arg, (int, bytes, str)):
+        # The push opcodes are never modified, so the same instance can be reused.
+        return _cached_push_constant(arg)
+    return _push_constant(arg)
+
+
+def _push_stack_arguments(
+    args: "Iterable[int | bytes | SupportsBytes | str | Opcode | Bytecode | Iterable[int]]",
+    bytecode: Bytecode,
+) -> Bytecode:
+    """
+    Return the bytecode that pushes the stack arguments, in the given order, followed by the
+    given bytecode.
+
+    The result is identical to `Bytecode() + push(args[0]) + ... + push(args[-1]) + bytecode`,
+    but its bytes are joined once instead of being copied by each addition.
+    """
+    parts: List[bytes] = []
+    stack_properties: StackProperties = (0, 0, 0, 0)
+    for arg in args:
+        arg_bytecode = _stack_argument_to_bytecode(arg)
+        parts.append(arg_bytecode._bytes_)
+        stack_properties = concatenate_stack_properties(
+            stack_properties, arg_bytecode.stack_properties
+        )
+    parts.append(bytecode._bytes_)
+    popped_stack_items, pushed_stack_items, min_stack_height, max_stack_height = (
+        concatenate_stack_properties(stack_properties, bytecode.stack_properties)
+    )
+    return Bytecode(
+        b"".join(parts),
+        popped_stack_items=popped_stack_items,
+        pushed_stack_items=pushed_stack_items,
+        min_stack_height=min_stack_height,
+        max_stack_height=max_stack_height,
+        terminating=bytecode.terminating,
+    )
+
+
 class Opcode(Bytecode):
     """
     Represents a single Opcode instruction in the EVM, with extra metadata useful to parametrize
@@ -264,10 +316,7 @@ class Opcode(Bytecode):
                 f"{len(args)} were provided. Use 'unchecked=True' parameter to ignore this check."
             )
 
-        pre_opcode_bytecode = Bytecode()
-        while len(args) > 0:
-            pre_opcode_bytecode += _stack_argument_to_bytecode(args.pop())
-        return pre_opcode_bytecode + self
+        return _push_stack_arguments(reversed(args), self)
 
     def __lt__(self, other: "Opcode") -> bool:
         """Compare two opcodes by their integer value."""
@@ -317,10 +366,7 @@ class Macro(Bytecode):
         if self.lambda_operation is not None:
             return self.lambda_operation(*args_t)
 
-        pre_opcode_bytecode = Bytecode()
-        for arg in args_t:
-            pre_opcode_bytecode += _stack_argument_to_bytecode(arg)
-        return pre_opcode_bytecode + self
+        return _push_stack_arguments(args_t, self)
 
 
 #  Constants
@@ -5699,6 +5745,10 @@ _push_opcodes_byte_list: List[Opcode] = [
     Opcodes.PUSH32,
 ]
 
+# Push opcodes of the integers that fit in a single byte, i.e., most of the constants pushed by
+# tests.
+_small_int_push_opcodes: List[Opcode] = [Opcodes.PUSH1[n] for n in range(0x100)]
+
 
 def _mstore_operation(data: OpcodeCallArg = b"", offset: OpcodeCallArg = 0) -> Bytecode:
     """Generate the bytecode that stores an arbitrary amount of data in memory."""
@@ -4,7 +4,7 @@ import pytest
 
 from ethereum_test_base_types import Address
 
-from ..opcode import Bytecode
+from ..opcode import Bytecode, _push_constant, _stack_argument_to_bytecode
 from ..opcode import Macros as Om
 from ..opcode import Opcodes as Op
 
@@ -431,3 +431,104 @@ def test_bytecode_concatenation_with_bytes():
     assert code.max_stack_height == base.max_stack_height
     assert code.min_stack_height == base.min_stack_height
     assert code.terminating == base.terminating
+
+
+@pytest.mark.parametrize(
+    "bytecode",
+    [
+        pytest.param(Op.JUMPDEST, id="JUMPDEST"),
+        pytest.param(Op.PUSH0, id="PUSH0"),
+        pytest.param(Op.POP, id="POP"),
+        pytest.param(Op.ADD + Op.PUSH0 * 2, id="ADD+PUSH0*2"),
+        pytest.param(Op.SWAP1 + Op.DUP3, id="SWAP1+DUP3"),
+        pytest.param(Op.SSTORE(0, 1) + Op.STOP, id="terminating"),
+    ],
+)
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 7, 64, 100])
+def test_bytecode_multiplication(bytecode: Bytecode, count: int):
+    """Test that multiplying a bytecode is equivalent to adding it repeatedly."""
+    expected = Bytecode()
+    for _ in range(count):
+        expected += bytecode
+    result = bytecode * count
+    assert result == expected
+    assert result.terminating == expected.terminating
+
+
+def test_bytecode_additions_sharing_a_prefix():
+    """Test that additions to the same large bytecode don't affect each other."""
+    prefix = Op.PUSH1(1) * 100
+    a = prefix + Op.STOP
+    b = prefix + Op.INVALID
+    a_extended = a + Op.ADD
+    b_extended = b + b"\x01"
+    assert bytes(prefix) == b"\x60\x01" * 100
+    assert bytes(a) == bytes(prefix) + b"\x00"
+    assert bytes(b) == bytes(prefix) + b"\xfe"
+    assert bytes(a_extended) == bytes(prefix) + b"\x00\x01"
+    assert bytes(b_extended) == bytes(prefix) + b"\xfe\x01"
+    assert len(a_extended) == len(b_extended) == 202
+
+    code = Bytecode()
+    for i in range(1_000):
+        code += Op.PUSH2(i) + Op.POP
+    assert bytes(code) == b"".join(bytes(Op.PUSH2(i) + Op.POP) for i in range(1_000))
+    assert code == sum((Op.PUSH2(i) + Op.POP for i in range(1_000)), Bytecode())
+
+
+@pytest.mark.parametrize(
+    "bytecode,expected",
+    [
+        pytest.param(Op.SSTORE(1, 2), Op.PUSH1(2) + Op.PUSH1(1) + Op.SSTORE, id="SSTORE"),
+        pytest.param(
+            Op.CALL(Op.GAS, Op.CALLER, 0, 0, 0x20, Op.PUSH0, 0),
+            Op.PUSH1(0)
+            + Op.PUSH0
+            + Op.PUSH1(0x20)
+            + Op.PUSH1(0)
+            + Op.PUSH1(0)
+            + Op.CALLER
+            + Op.GAS
+            + Op.CALL,
+            id="CALL",
+        ),
+        pytest.param(
+            Op.RETURN(0, Op.MLOAD(0x20)),
+            Op.PUSH1(0x20) + Op.MLOAD + Op.PUSH1(0) + Op.RETURN,
+            id="RETURN",
+        ),
+        pytest.param(Op.STOP(), Bytecode() + Op.STOP, id="STOP"),
+        pytest.param(Om.OOG(), Om.OOG, id="OOG"),
+    ],
+)
+def test_opcode_call_stack_properties(bytecode: Bytecode, expected: Bytecode):
+    """Test that calling an opcode is equivalent to adding the pushes of its arguments."""
+    assert bytecode == expected
+    assert bytecode.terminating == expected.terminating
+
+
+@pytest.mark.parametrize(
+    "arg",
+    [
+        0,
+        1,
+        0x20,
+        0xFF,
+        0x100,
+        -1,
+        2**256 - 1,
+        b"",
+        b"\x00\x01",
+        "0x0100",
+        Address(0x1234),
+        [0, 1, 2],
+    ],
+)
+def test_memoized_push_encoding(arg):
+    """Test that the memoized push encodings are the ones computed for each argument."""
+    expected = _push_constant(arg)
+    for _ in range(2):
+        bytecode = _stack_argument_to_bytecode(arg)
+        assert bytecode == expected
+        assert str(bytecode) == str(expected)
+    assert Op.MSTORE(arg, arg) == expected + expected + Op.MSTORE
@@ -12,7 +12,7 @@ import pytest
 import requests
 import rich
 
-from cli.gen_index import generate_fixtures_index
+from cli.gen_index import generate_fixtures_index, iter_fixture_files
 from ethereum_test_fixtures.consume import TestCases
 from ethereum_test_tools.utility.versioning import get_current_commit_hash_or_tag
 
@@ -152,7 +152,7 @@ def pytest_configure(config):  # noqa: D103
     config.fixtures_source = fixtures_source
     if not fixtures_source.exists():
         pytest.exit(f"Specified fixture directory '{fixtures_source}' does not exist.")
-    if not any(fixtures_source.glob("**/*.json")):
+    if not any(iter_fixture_files(fixtures_source)):
         pytest.exit(
             f"Specified fixture directory '{fixtures_source}' does not contain any JSON files."
         )
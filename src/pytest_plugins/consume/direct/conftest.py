@@ -14,8 +14,10 @@ import pytest
 
 from ethereum_clis import TransitionTool
 from ethereum_test_base_types import to_json
+from ethereum_test_fixtures.compression import FixtureFileCompression, strip_compression_suffix
 from ethereum_test_fixtures.consume import TestCaseIndexFile, TestCaseStream
 from ethereum_test_fixtures.file import Fixtures
+from ethereum_test_fixtures.store import find_fixture_store, read_resolved_fixture_file
 
 from ..consume import FixturesSource
 
@@ -103,6 +105,9 @@ def fixture_path(test_case: TestCaseIndexFile | TestCaseStream, fixtures_source:
     Path to the current JSON fixture file.
 
     If the fixture source is stdin, the fixture is written to a temporary json file.
+    Compressed fixture files are decompressed, and the references of fixture files to the
+    fixture store of a deduplicated output are resolved, to a temporary json file, as the
+    evm tool can only read plain json files.
     """
     if fixtures_source == "stdin":
         assert isinstance(test_case, TestCaseStream)
@@ -115,7 +120,20 @@ def fixture_path(test_case: TestCaseIndexFile | TestCaseStream, fixtures_source:
         temp_dir.cleanup()
     else:
         assert isinstance(test_case, TestCaseIndexFile)
-        yield fixtures_source / test_case.json_path
+        fixture_path = fixtures_source / test_case.json_path
+        if (
+            FixtureFileCompression.from_path(fixture_path) == FixtureFileCompression.NONE
+            and find_fixture_store(fixture_path) is None
+        ):
+            yield fixture_path
+            return
+        temp_dir = tempfile.TemporaryDirectory()
+        decompressed_fixture_path = (
+            Path(temp_dir.name) / strip_compression_suffix(fixture_path).name
+        )
+        decompressed_fixture_path.write_bytes(read_resolved_fixture_file(fixture_path))
+        yield decompressed_fixture_path
+        temp_dir.cleanup()
 
 
 @pytest.fixture(scope="function")
@@ -240,7 +240,7 @@ class FixturesDict(Dict[Path, Fixtures]):
         """Return the fixtures from the index file, if not found, load from disk."""
         assert key.is_file(), f"Expected a file path, got '{key}'"
         if key not in self._fixtures:
-            self._fixtures[key] = Fixtures.model_validate_json(key.read_text())
+            self._fixtures[key] = Fixtures.from_file(key)
         return self._fixtures[key]
 
 
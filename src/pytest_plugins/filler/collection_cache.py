@@ -0,0 +1,207 @@
+"""
+On-disk cache of the test items collected from each test module.
+
+Collecting the full test suite imports every test module and parametrizes every test
+function for all forks and fixture formats. When the cache is enabled, the keywords and
+markers of the items kept after filtering are saved per test module in pytest's cache
+directory. Subsequent sessions use them to skip importing and collecting the modules
+whose items would all be deselected by the `-k` and `-m` expressions, or that contain
+no items at all.
+
+The cache only speeds up sessions that filter the items with `-k` or `-m`: without
+expressions, every module that contains items is collected as usual.
+
+The cache is invalidated as a whole whenever a source file of the framework or the
+tests, or a command-line option that can affect the collected items, changes. Checking
+this takes a `stat` of each source file, i.e. about 10ms for the ~500 files of the repo.
+
+The keywords and markers of each item are derived from the public `pytest.Item` API, as
+pytest does to evaluate `-k` and `-m`. pytest offers no public API to compile these
+expressions, so `_pytest.mark.expression` is used; if it's not available, the cache is
+never used to skip modules.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+import pytest
+
+try:
+    from _pytest.mark.expression import Expression, ParseError
+except ImportError:  # pragma: no cover
+    Expression = None  # type: ignore
+    ParseError = ValueError  # type: ignore
+
+# Items of a module as the indexes of their keyword names and marker names in a table of
+# names, which is shared by all items of the module to keep the cache compact.
+CachedModule = Dict[str, Any]
+
+# Options that select among or display the collected items, but can't change them.
+IGNORED_OPTIONS = {
+    "collection_cache",
+    "collectonly",
+    "color",
+    "disable_html",
+    "dist",
+    "file_or_dir",
+    "htmlpath",
+    "keyword",
+    "markexpr",
+    "maxprocesses",
+    "numprocesses",
+    "output",
+    "phase_profile",
+    "reportchars",
+    "shard",
+    "signature_cache",
+    "tbstyle",
+    "verbose",
+}
+
+
+def compile_expression(expression: str) -> "Expression | None":
+    """Compile a `-k` or `-m` expression, if any."""
+    return Expression.compile(expression) if expression else None
+
+
+def item_keywords(item: pytest.Item) -> Set[str]:
+    """
+    Return the names matched by `-k` expressions: the names of the item and its parents,
+    their extra keywords, the attributes of the test function and the item's markers.
+    """
+    keywords = {node.name for node in item.listchain() if not isinstance(node, pytest.Session)}
+    keywords.update(item.listextrakeywords())
+    function = getattr(item, "function", None)
+    if function is not None:
+        keywords.update(function.__dict__)
+    keywords.update(item_markers(item))
+    return keywords
+
+
+def item_markers(item: pytest.Item) -> Set[str]:
+    """Return the names matched by `-m` expressions: the names of the item's markers."""
+    return {marker.name for marker in item.iter_markers()}
+
+
+def keyword_matcher(keywords: Set[str]) -> Callable[[str], bool]:
+    """Return a matcher of the `-k` identifiers, matched case-insensitively as substrings."""
+    lower_keywords = [keyword.lower() for keyword in keywords]
+    return lambda name: any(name.lower() in keyword for keyword in lower_keywords)
+
+
+def source_files(directory: Path) -> Iterable[Path]:
+    """Return all the files of a source directory, excluding byte-compiled files."""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__" and not d.startswith("."))
+        for file in sorted(files):
+            yield Path(root) / file
+
+
+def collection_digest(config: pytest.Config) -> str:
+    """
+    Return a digest of everything that can affect the collected items: the source files
+    of the framework and the tests (by path, size and modification time), the
+    configuration files and the values of the command-line options.
+    """
+    h = hashlib.sha256()
+    h.update(f"{sys.version}\n{pytest.__version__}\n".encode())
+    options = {k: v for k, v in vars(config.option).items() if k not in IGNORED_OPTIONS}
+    h.update(repr(sorted(options.items(), key=lambda item: item[0])).encode())
+    source_dirs = [config.rootpath / "src", Path(config.getoption("filler_path")).absolute()]
+    for directory in dict.fromkeys(source_dirs):
+        for file in source_files(directory):
+            stat = file.stat()
+            h.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    if config.inipath is not None:
+        h.update(config.inipath.read_bytes())
+    return h.hexdigest()
+
+
+@dataclass(kw_only=True)
+class CollectionCache:
+    """Cached keywords and markers of the items collected from each test module."""
+
+    path: Path
+    digest: str
+    modules: Dict[str, CachedModule] = field(default_factory=dict)
+    collected_modules: Set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, config: pytest.Config) -> "CollectionCache":
+        """Load the cache of the session, discarding it if it's stale."""
+        assert config.cache is not None, "the collection cache requires pytest's cacheprovider"
+        path = config.cache.mkdir("fill_collection") / "modules.json"
+        digest = collection_digest(config)
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        if cached.get("digest") != digest:
+            return cls(path=path, digest=digest)
+        return cls(path=path, digest=digest, modules=cached["modules"])
+
+    def can_skip_module(self, module_path: Path, config: pytest.Config) -> bool:
+        """
+        Return whether the module can be skipped because, according to the cache, none of
+        its items would be selected by the `-k` and `-m` expressions.
+        """
+        cached_module = self.modules.get(str(module_path))
+        if cached_module is None or Expression is None:
+            return False
+        try:
+            keyword_expression = compile_expression(config.option.keyword.lstrip())
+            mark_expression = compile_expression(config.option.markexpr)
+        except ParseError:
+            # Let pytest report the invalid expression.
+            return False
+        names = cached_module["names"]
+        for keyword_indexes, marker_indexes in cached_module["items"]:
+            if keyword_expression and not keyword_expression.evaluate(
+                keyword_matcher({names[i] for i in keyword_indexes})
+            ):
+                continue
+            if mark_expression and not mark_expression.evaluate(
+                {names[i] for i in marker_indexes}.__contains__
+            ):
+                continue
+            return False
+        return True
+
+    def add_collected_module(self, module_path: Path) -> None:
+        """Mark the module as collected in this session."""
+        self.collected_modules.add(str(module_path))
+
+    def update(self, items: List[pytest.Item]) -> None:
+        """Replace the cached items of all modules collected in this session."""
+        module_names: Dict[str, Dict[str, int]] = {}
+        for module in self.collected_modules:
+            self.modules[module] = {"names": [], "items": []}
+            module_names[module] = {}
+        for item in items:
+            module = str(item.path)
+            if module not in self.collected_modules:
+                continue
+            names = module_names[module]
+            keywords = sorted(item_keywords(item))
+            markers = sorted(item_markers(item))
+            self.modules[module]["items"].append(
+                [
+                    [names.setdefault(name, len(names)) for name in keywords],
+                    [names.setdefault(name, len(names)) for name in markers],
+                ]
+            )
+        for module, names in module_names.items():
+            self.modules[module]["names"] = list(names)
+
+    def save(self) -> None:
+        """Write the cache atomically, as it can be written by multiple xdist workers."""
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"digest": self.digest, "modules": self.modules}, f)
+        os.replace(tmp_path, self.path)
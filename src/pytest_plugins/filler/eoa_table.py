@@ -0,0 +1,123 @@
+"""
+Table of the addresses of the deterministic EOAs funded by the tests.
+
+The i-th EOA returned by the `pre` fixture always has the same private key, so its address
+never changes either, but deriving it requires an elliptic curve point multiplication in every
+process of every session. The addresses of the first EOAs are computed once, written to a file
+in pytest's cache directory and memory mapped by every process, including the xdist workers,
+so that creating one of these EOAs only costs a table lookup.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from coincurve.keys import PrivateKey
+
+from ethereum_test_base_types import Address, Bytes, TestPrivateKey, TestPrivateKey2
+
+# Number of EOAs whose addresses are in the table; the addresses of the following EOAs are
+# derived from their key.
+EOA_TABLE_SIZE = 4096
+
+EOA_TABLE_FILE_NAME = "eoa_addresses.bin"
+
+# The header identifies the keys the addresses were derived from, so a table written by a
+# version of the framework with different keys is never used, and contains the digest of the
+# addresses, so a corrupted table is never used either.
+_MAGIC = b"EOATBL02"
+_HEADER = struct.Struct(">8s32s32sI32s")
+_ADDRESS_SIZE = 20
+
+
+def eoa_key(i: int) -> int:
+    """Return the private key of the i-th EOA."""
+    return TestPrivateKey + i if i != 1 else TestPrivateKey2
+
+
+def derive_eoa_address(i: int) -> Address:
+    """Derive the address of the i-th EOA from its private key."""
+    public_key = PrivateKey(eoa_key(i).to_bytes(32, "big")).public_key
+    return Address(Bytes(public_key.format(compressed=False)[1:]).keccak256()[32 - 20 :])
+
+
+def _table_header(size: int, addresses_digest: bytes) -> bytes:
+    return _HEADER.pack(
+        _MAGIC,
+        TestPrivateKey.to_bytes(32, "big"),
+        TestPrivateKey2.to_bytes(32, "big"),
+        size,
+        addresses_digest,
+    )
+
+
+def write_eoa_table(path: Path, size: int = EOA_TABLE_SIZE) -> None:
+    """
+    Write the table of the addresses of the first `size` EOAs.
+
+    The table is written to a temporary file that is then renamed, so that processes reading
+    the table never see a partially written file.
+    """
+    addresses = b"".join(derive_eoa_address(i) for i in range(size))
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(_table_header(size, hashlib.sha256(addresses).digest()))
+        f.write(addresses)
+    os.replace(temp_path, path)
+
+
+class EOATable:
+    """Memory-mapped table of the addresses of the first EOAs."""
+
+    def __init__(self, path: Path):
+        """
+        Map the table in memory.
+
+        Raises:
+            ValueError: if the file is not a valid table of the current EOA keys.
+
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path} is not a table of EOA addresses")
+            *_, size, addresses_digest = _HEADER.unpack(header)
+            if header != _table_header(size, addresses_digest):
+                raise ValueError(f"{path} is not a table of the current EOA addresses")
+            if os.fstat(f.fileno()).st_size != _HEADER.size + size * _ADDRESS_SIZE:
+                raise ValueError(f"{path} is truncated")
+            self.addresses = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hashlib.sha256(self.addresses[_HEADER.size :]).digest() != addresses_digest:
+            self.addresses.close()
+            raise ValueError(f"{path} is corrupted")
+        self.size = size
+
+    def address(self, i: int) -> Address | None:
+        """Return the address of the i-th EOA, if it's in the table."""
+        if not 0 <= i < self.size:
+            return None
+        offset = _HEADER.size + i * _ADDRESS_SIZE
+        return Address(self.addresses[offset : offset + _ADDRESS_SIZE])
+
+    def close(self) -> None:
+        """Unmap the table."""
+        self.addresses.close()
+
+
+def load_eoa_table(path: Path, generate: bool) -> EOATable | None:
+    """
+    Return the table at the given path, generating it first if requested and it's missing or
+    invalid, or `None` if there is no valid table.
+    """
+    try:
+        return EOATable(path)
+    except (OSError, ValueError):
+        if not generate:
+            return None
+    try:
+        write_eoa_table(path)
+        return EOATable(path)
+    except (OSError, ValueError):
+        return None
@@ -9,7 +9,6 @@ writes the generated fixtures to file.
 import configparser
 import datetime
 import os
-import tarfile
 import warnings
 from pathlib import Path
 from typing import Any, Dict, Generator, List, Type
@@ -24,14 +23,43 @@ from config import AppConfig
 from ethereum_clis import TransitionTool
 from ethereum_test_base_types import Alloc, ReferenceSpec
 from ethereum_test_fixtures import BaseFixture, FixtureCollector, TestInfo
+from ethereum_test_fixtures.collector import (
+    pop_recorded_fixture_files,
+    pop_recorded_test_cases,
+    record_fixture_files,
+)
+from ethereum_test_fixtures.compression import FixtureFileCompression, is_fixture_file
+from ethereum_test_fixtures.file import deduplicate_fixtures, merge_fixture_shards
+from ethereum_test_fixtures.profiling import (
+    PHASE_EVENTS_DIR_NAME,
+    PHASE_PROFILE_FILE_NAME,
+    PHASE_TRACE_FILE_NAME,
+    profile_phase,
+)
+from ethereum_test_fixtures.stream import FixtureStreamFormat
 from ethereum_test_forks import Fork
 from ethereum_test_specs import SPEC_TYPES, BaseTest
 from ethereum_test_tools.utility.versioning import (
     generate_github_url,
     get_current_commit_hash_or_tag,
 )
+from ethereum_test_types.signing import (
+    CACHED_SIGNATURE_MEMORY,
+    MAX_CACHED_SIGNATURES,
+    SIGNATURE_CACHE,
+    compact_signature_cache,
+)
 from pytest_plugins.spec_version_checker.spec_version_checker import EIPSpecTestItem
 
+from .collection_cache import CollectionCache
+from .tarball import create_tarball
+
+PROPERTIES_FILE_HEADER = "; This file describes fixture build properties\n\n"
+
+collection_cache_key = pytest.StashKey[CollectionCache]()
+# Transition tool kept running across sessions by the fill daemon (`fill --daemon`).
+warm_transition_tool_key = pytest.StashKey[TransitionTool]()
+
 
 def default_output_directory() -> str:
     """
@@ -49,13 +77,30 @@ def default_html_report_file_path() -> str:
     return ".meta/report_fill.html"
 
 
+def has_output_tarball_suffix(output: Path) -> bool:
+    """Return True if the output path ends in '.tar.gz', i.e. the output is a tarball."""
+    return output.suffix == ".gz" and output.with_suffix("").suffix == ".tar"
+
+
 def strip_output_tarball_suffix(output: Path) -> Path:
     """Strip the '.tar.gz' suffix from the output path."""
-    if str(output).endswith(".tar.gz"):
+    if has_output_tarball_suffix(output):
         return output.with_suffix("").with_suffix("")
     return output
 
 
+def is_release_file(file: Path) -> bool:
+    """
+    Return True if the file of the output directory belongs in the release tarball: the
+    fixture files, the fixtures index and the `.ini` properties, but not the phase profile.
+    """
+    if file.name in (PHASE_PROFILE_FILE_NAME, PHASE_TRACE_FILE_NAME):
+        return False
+    if file.parent.name == PHASE_EVENTS_DIR_NAME and file.parent.parent.name == ".meta":
+        return False
+    return file.suffix == ".ini" or is_fixture_file(file)
+
+
 def is_output_stdout(output: Path) -> bool:
     """Return True if the fixture output is configured to be stdout."""
     return strip_output_tarball_suffix(output).name == "stdout"
@@ -105,6 +150,17 @@ def pytest_addoption(parser: pytest.Parser):
             "Default: The first (geth) 'evm' entry in PATH."
         ),
     )
+    evm_group.addoption(
+        "--verify-fixtures-workers",
+        action="store",
+        dest="verify_fixtures_workers",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of fixture files verified concurrently by each (xdist) worker. "
+            "Default: The number of available cores divided by the number of workers."
+        ),
+    )
 
     test_group = parser.getgroup("tests", "Arguments defining filler location and output")
     test_group.addoption(
@@ -145,6 +201,57 @@ def pytest_addoption(parser: pytest.Parser):
             "file. This can be used to increase the granularity of --verify-fixtures."
         ),
     )
+    test_group.addoption(
+        "--output-compression",
+        action="store",
+        dest="output_compression",
+        type=FixtureFileCompression,
+        choices=list(FixtureFileCompression),
+        default=FixtureFileCompression.NONE,
+        help=(
+            "Compress the generated JSON fixture files as they are written, e.g. "
+            "'gzip' writes '.json.gz' files. 'zstd' requires the `zstandard` package. "
+            "Default: 'none'."
+        ),
+    )
+    test_group.addoption(
+        "--fixture-memory-budget",
+        action="store",
+        dest="fixture_memory_budget",
+        type=int,
+        default=None,
+        metavar="MIB",
+        help=(
+            "Maximum size, in MiB, of the serialized fixtures each worker holds in memory "
+            "before writing them to the output; it bounds the memory used to fill large "
+            "test modules. The fixture files are the same for any budget. Default: unbounded."
+        ),
+    )
+    test_group.addoption(
+        "--deduplicate-fixtures",
+        action="store_true",
+        dest="deduplicate_fixtures",
+        default=False,
+        help=(
+            "Store the fixtures that are identical apart from their name and fork once, in "
+            "the 'fixture_store' directory of the output, and reference them from the fixture "
+            "files. The references are resolved by `consume`, but not by other tools."
+        ),
+    )
+    test_group.addoption(
+        "--stdout-format",
+        action="store",
+        dest="stdout_format",
+        type=FixtureStreamFormat,
+        choices=list(FixtureStreamFormat),
+        default=FixtureStreamFormat.JSON,
+        help=(
+            "Format of the fixtures streamed when writing to stdout ('--output=stdout'). "
+            "Each fixture is written as soon as it's generated, either as an entry of a "
+            "single JSON object ('json') or as a line of JSON Lines ('jsonl'). "
+            "Default: 'json'."
+        ),
+    )
     test_group.addoption(
         "--no-html",
         action="store_true",
@@ -163,6 +270,29 @@ def pytest_addoption(parser: pytest.Parser):
         type=str,
         help="Specify a build name for the fixtures.ini file, e.g., 'stable'.",
     )
+    test_group.addoption(
+        "--collection-cache",
+        action="store_true",
+        dest="collection_cache",
+        default=False,
+        help=(
+            "Cache the items collected from each test module in pytest's cache directory and "
+            "skip the modules without selected items (e.g. by '-k') in subsequent runs. The "
+            "cache is invalidated when source files or command-line options change."
+        ),
+    )
+    test_group.addoption(
+        "--signature-cache",
+        action="store_true",
+        dest="signature_cache",
+        default=False,
+        help=(
+            "Save the signatures of the transactions and authorizations in pytest's cache "
+            "directory and reuse them in subsequent runs instead of signing them again. Each "
+            f"xdist worker keeps up to {MAX_CACHED_SIGNATURES} signatures in memory, about "
+            f"{MAX_CACHED_SIGNATURES * CACHED_SIGNATURE_MEMORY // 10**6} MB."
+        ),
+    )
     test_group.addoption(
         "--skip-index",
         action="store_false",
@@ -401,6 +531,10 @@ def verify_fixtures_bin(request: pytest.FixtureRequest) -> Path | None:
 @pytest.fixture(autouse=True, scope="session")
 def t8n(request: pytest.FixtureRequest, evm_bin: Path) -> Generator[TransitionTool, None, None]:
     """Return configured transition tool."""
+    if warm_transition_tool_key in request.config.stash:
+        # Owned, and shut down, by the fill daemon.
+        yield request.config.stash[warm_transition_tool_key]
+        return
     t8n = TransitionTool.from_binary_path(
         binary_path=evm_bin, trace=request.config.getoption("evm_collect_traces")
     )
@@ -464,10 +598,7 @@ def base_dump_dir(request: pytest.FixtureRequest) -> Path | None:
 @pytest.fixture(scope="session")
 def is_output_tarball(request: pytest.FixtureRequest) -> bool:
     """Return True if the output directory is a tarball."""
-    output: Path = request.config.getoption("output")
-    if output.suffix == ".gz" and output.with_suffix("").suffix == ".tar":
-        return True
-    return False
+    return has_output_tarball_suffix(request.config.getoption("output"))
 
 
 @pytest.fixture(scope="session")
@@ -499,42 +630,57 @@ def create_properties_file(
         return
     if not output_dir.exists():
         output_dir.mkdir(parents=True)
+    write_properties_file(request.config, output_metadata_dir)
+
+
+def write_properties_file(config: pytest.Config, output_metadata_dir: Path) -> None:
+    """Write the ini file with the fixture build properties to the metadata directory."""
     if not output_metadata_dir.exists():
         output_metadata_dir.mkdir(parents=True)
 
     fixture_properties = {
         "timestamp": datetime.datetime.now().isoformat(),
     }
-    if build_name := request.config.getoption("build_name"):
+    if build_name := config.getoption("build_name"):
         fixture_properties["build"] = build_name
     if github_ref := os.getenv("GITHUB_REF"):
         fixture_properties["ref"] = github_ref
     if github_sha := os.getenv("GITHUB_SHA"):
         fixture_properties["commit"] = github_sha
-    command_line_args = request.config.stash[metadata_key]["Command-line args"]
+    command_line_args = config.stash[metadata_key]["Command-line args"]
     command_line_args = command_line_args.replace("<code>", "").replace("</code>", "")
     fixture_properties["command_line_args"] = command_line_args
 
-    config = configparser.ConfigParser(interpolation=None)
-    config["fixtures"] = fixture_properties
+    properties = configparser.ConfigParser(interpolation=None)
+    properties["fixtures"] = fixture_properties
     environment_properties = {}
-    for key, val in request.config.stash[metadata_key].items():
+    for key, val in config.stash[metadata_key].items():
         if key.lower() == "command-line args":
             continue
         if key.lower() in ["ci", "python", "platform"]:
             environment_properties[key] = val
         elif isinstance(val, dict):
-            config[key.lower()] = val
+            properties[key.lower()] = val
         else:
             warnings.warn(
                 f"Fixtures ini file: Skipping metadata key {key} with value {val}.", stacklevel=2
             )
-    config["environment"] = environment_properties
+    properties["environment"] = environment_properties
+    write_properties(properties, output_metadata_dir)
+
 
+def write_properties(properties: configparser.ConfigParser, output_metadata_dir: Path) -> None:
+    """
+    Write the fixture build properties to the ini file of the metadata directory.
+
+    The file is written atomically, as each xdist worker writes the properties.
+    """
     ini_filename = output_metadata_dir / "fixtures.ini"
-    with open(ini_filename, "w") as f:
-        f.write("; This file describes fixture build properties\n\n")
-        config.write(f)
+    temp_filename = ini_filename.with_name(f"{ini_filename.name}.{os.getpid()}.tmp")
+    with open(temp_filename, "w") as f:
+        f.write(PROPERTIES_FILE_HEADER)
+        properties.write(f)
+    os.replace(temp_filename, ini_filename)
 
 
 @pytest.fixture(scope="function")
@@ -561,6 +707,25 @@ def dump_dir_parameter_level(
     return evm_dump_dir
 
 
+def verify_fixtures_workers(config: pytest.Config) -> int:
+    """
+    Return the maximum number of fixture files verified concurrently by this worker.
+
+    By default, the available cores are shared among all xdist workers.
+    """
+    if (workers := config.getoption("verify_fixtures_workers")) is not None:
+        return max(workers, 1)
+    xdist_worker_count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max((os.cpu_count() or 1) // max(xdist_worker_count, 1), 1)
+
+
+def fixture_memory_budget(config: pytest.Config) -> int | None:
+    """Return the memory budget of the fixture collector in bytes, if any."""
+    if (budget := config.getoption("fixture_memory_budget")) is None:
+        return None
+    return max(budget, 0) * 1024 * 1024
+
+
 def get_fixture_collection_scope(fixture_name, config):
     """
     Return the appropriate scope to write fixture JSON files.
@@ -582,6 +747,7 @@ def fixture_collector(
     filler_path: Path,
     base_dump_dir: Path | None,
     output_dir: Path,
+    worker_id: str,
 ) -> Generator[FixtureCollector, None, None]:
     """
     Return configured fixture collector instance used for all tests
@@ -593,11 +759,18 @@ def fixture_collector(
         single_fixture_per_file=request.config.getoption("single_fixture_per_file"),
         filler_path=filler_path,
         base_dump_dir=base_dump_dir,
+        worker_id=worker_id,
+        compression=request.config.getoption("output_compression"),
+        stdout_format=request.config.getoption("stdout_format"),
+        memory_budget=fixture_memory_budget(request.config),
     )
     yield fixture_collector
     fixture_collector.dump_fixtures()
     if do_fixture_verification:
-        fixture_collector.verify_fixture_files(evm_fixture_verification)
+        fixture_collector.verify_fixture_files(
+            evm_fixture_verification,
+            max_workers=verify_fixtures_workers(request.config),
+        )
 
 
 @pytest.fixture(autouse=True, scope="session")
@@ -671,14 +844,16 @@ def base_test_parametrizer(cls: Type[BaseTest]):
                 kwargs["t8n_dump_dir"] = dump_dir_parameter_level
                 if "pre" not in kwargs:
                     kwargs["pre"] = pre
-                super(BaseTestWrapper, self).__init__(*args, **kwargs)
-                fixture = self.generate(
-                    request=request,
-                    t8n=t8n,
-                    fork=fork,
-                    fixture_format=fixture_format,
-                    eips=eips,
-                )
+                with profile_phase("spec validation"):
+                    super(BaseTestWrapper, self).__init__(*args, **kwargs)
+                with profile_phase("generate"):
+                    fixture = self.generate(
+                        request=request,
+                        t8n=t8n,
+                        fork=fork,
+                        fixture_format=fixture_format,
+                        eips=eips,
+                    )
                 fixture.fill_info(
                     t8n.version(),
                     test_case_description,
@@ -687,10 +862,11 @@ def base_test_parametrizer(cls: Type[BaseTest]):
                     _info_metadata=t8n._info_metadata,
                 )
 
-                fixture_path = fixture_collector.add_fixture(
-                    node_to_test_info(request.node),
-                    fixture,
-                )
+                with profile_phase("collect fixture"):
+                    fixture_path = fixture_collector.add_fixture(
+                        node_to_test_info(request.node),
+                        fixture,
+                    )
 
                 # NOTE: Use str for compatibility with pytest-dist
                 request.node.config.fixture_path_absolute = str(fixture_path.absolute())
@@ -739,60 +915,126 @@ def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item
 
     This can't be handled in this plugins pytest_generate_tests() as the fork
     parametrization occurs in the forks plugin.
+
+    The items are filtered in a single pass, as removing items from the list one by one is
+    quadratic in the number of collected items.
     """
-    for item in items[:]:  # use a copy of the list, as we'll be modifying it
+    spec_names = [spec_type.pytest_parameter_name() for spec_type in SPEC_TYPES]
+    selected_items: List[pytest.Item] = []
+    for item in items:
         if isinstance(item, EIPSpecTestItem):
+            selected_items.append(item)
             continue
         params: Dict[str, Any] = item.callspec.params  # type: ignore
         if "fork" not in params or params["fork"] is None:
-            items.remove(item)
             continue
         fork: Fork = params["fork"]
-        for spec_name in [spec_type.pytest_parameter_name() for spec_type in SPEC_TYPES]:
-            if spec_name in params and not params[spec_name].supports_fork(fork):
-                items.remove(item)
-                break
+        if any(
+            spec_name in params and not params[spec_name].supports_fork(fork)
+            for spec_name in spec_names
+        ):
+            continue
         for marker in item.iter_markers():
             if marker.name == "fill":
                 for mark in marker.args:
                     item.add_marker(mark)
         if "yul" in item.fixturenames:  # type: ignore
             item.add_marker(pytest.mark.yul_test)
+        selected_items.append(item)
+    items[:] = selected_items
+
+    if collection_cache := config.stash.get(collection_cache_key, None):
+        collection_cache.update(items)
+        collection_cache.save()
+
+
+def pytest_sessionstart(session: pytest.Session):
+    """Load the collection cache and the signature cache, if enabled."""
+    config = session.config
+    if config.getoption("collection_cache") and config.cache is not None:
+        config.stash[collection_cache_key] = CollectionCache.load(config)
+    if config.getoption("signature_cache") and config.cache is not None:
+        signature_cache_dir = config.cache.mkdir("fill_signatures")
+        if not xdist.is_xdist_worker(session):
+            # The xdist workers only start once the session of the controller has started.
+            compact_signature_cache(signature_cache_dir)
+        SIGNATURE_CACHE.use_directory(signature_cache_dir)
+
+
+def pytest_ignore_collect(collection_path: Path, config: pytest.Config) -> bool | None:
+    """Skip the test modules that contain no selected items according to the collection cache."""
+    collection_cache = config.stash.get(collection_cache_key, None)
+    if (
+        collection_cache is None
+        or collection_path.suffix != ".py"
+        or collection_path.name == "conftest.py"
+    ):
+        return None
+    if collection_cache.can_skip_module(collection_path, config):
+        return True
+    return None
+
+
+def pytest_collectstart(collector: pytest.Collector):
+    """Keep track of the test modules collected in this session for the collection cache."""
+    collection_cache = collector.config.stash.get(collection_cache_key, None)
+    if collection_cache is not None and isinstance(collector, pytest.Module):
+        collection_cache.add_collected_module(collector.path)
 
 
 def pytest_sessionfinish(session: pytest.Session, exitstatus: int):
     """
     Perform session finish tasks.
 
-    - Remove any lock files that may have been created.
+    - Write the properties file of a shard without tests.
+    - Merge the fixture shard files written by each worker into the fixture files.
+    - Deduplicate the fixtures into the fixture store, if enabled.
     - Generate index file for all produced fixtures.
     - Create tarball of the output directory if the output is a tarball.
     """
-    if xdist.is_xdist_worker(session):
-        return
+    # Write the remaining signatures computed by this process to the signature cache.
+    SIGNATURE_CACHE.use_directory(None)
 
     output: Path = session.config.getoption("output")
     if is_output_stdout(output):
         return
-
     output_dir = strip_output_tarball_suffix(output)
-    # Remove any lock files that may have been created.
-    for file in output_dir.rglob("*.lock"):
-        file.unlink()
 
-    # Generate index file for all produced fixtures.
+    # The properties are written when the first test runs, but a shard without any test
+    # needs them too, to be merged with the other shards. The shard is recorded by the
+    # processes that collect the items, i.e. the xdist workers, if any.
+    if (
+        "Shard" in session.config.stash[metadata_key]
+        and not session.config.option.collectonly
+        and not (output_dir / ".meta" / "fixtures.ini").exists()
+    ):
+        write_properties_file(session.config, output_dir / ".meta")
+
+    if xdist.is_xdist_worker(session):
+        return
+
+    # Merge the fixture shard files written by each worker into the fixture files.
+    fixture_counts = merge_fixture_shards(output_dir)
+
+    # Move the fixtures shared by several tests to the fixture store.
+    if session.config.getoption("deduplicate_fixtures"):
+        deduplicate_fixtures(output_dir)
+    record_fixture_files(output_dir, fixture_counts)
+
+    # Generate index file for all produced fixtures, from the index entries recorded by the
+    # fixture collectors as they wrote the fixtures, and the manifest of the written files.
+    recorded_test_cases = pop_recorded_test_cases(output_dir)
+    recorded_fixture_files = pop_recorded_fixture_files(output_dir)
     if session.config.getoption("generate_index"):
         generate_fixtures_index(
-            output_dir, quiet_mode=True, force_flag=False, disable_infer_format=False
+            output_dir,
+            quiet_mode=True,
+            force_flag=False,
+            disable_infer_format=False,
+            known_test_cases=recorded_test_cases,
+            known_fixture_files=recorded_fixture_files,
         )
 
     # Create tarball of the output directory if the output is a tarball.
-    is_output_tarball = output.suffix == ".gz" and output.with_suffix("").suffix == ".tar"
-    if is_output_tarball:
-        source_dir = output_dir
-        tarball_filename = output
-        with tarfile.open(tarball_filename, "w:gz") as tar:
-            for file in source_dir.rglob("*"):
-                if file.suffix in {".json", ".ini"}:
-                    arcname = Path("fixtures") / file.relative_to(source_dir)
-                    tar.add(file, arcname=arcname)
+    if has_output_tarball_suffix(output):
+        create_tarball(output_dir, output, include=is_release_file)
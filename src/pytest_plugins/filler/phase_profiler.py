@@ -0,0 +1,134 @@
+"""
+Pytest plugin that profiles the phases of fixture generation during `fill`.
+
+When enabled with `--phase-profile`, each xdist worker records the time spent in the
+instrumented phases of every test (pre-allocation and test body, spec validation,
+transaction signing, genesis state root, t8n, fixture serialization and hashing,
+file writing and verification). At the end of the session, the events of all
+workers are aggregated into a ranked report that is printed in the terminal summary
+and exported to the `.meta` directory of the output as:
+
+- `phase_profile.json`: the time spent in each phase and the total time of each test.
+- `phase_profile.trace.json`: all events in the Trace Event Format, which can be
+    opened with Perfetto (https://ui.perfetto.dev) or `chrome://tracing`.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Generator, List
+
+import pytest
+import xdist
+from _pytest.terminal import TerminalReporter
+
+from ethereum_test_fixtures.profiling import (
+    PHASE_EVENTS_DIR_NAME,
+    PHASE_PROFILE_FILE_NAME,
+    PHASE_TRACE_FILE_NAME,
+    PROFILER,
+    PhaseEvent,
+    format_phase_report,
+    load_phase_events,
+    phase_report_json,
+    profile_phase,
+    trace_events_json,
+)
+
+from .filler import is_output_stdout, strip_output_tarball_suffix
+
+phase_events_key = pytest.StashKey[List[PhaseEvent]]()
+
+
+def pytest_addoption(parser: pytest.Parser):
+    """Add command-line options to pytest."""
+    debug_group = parser.getgroup("debug", "Arguments defining debug behavior")
+    debug_group.addoption(
+        "--phase-profile",
+        action="store_true",
+        dest="phase_profile",
+        default=False,
+        help=(
+            "Profile the time spent in each phase of fixture generation, print a ranked "
+            "report and export it, along with a trace-event file, to the output's '.meta' "
+            "directory."
+        ),
+    )
+
+
+def phase_profile_dir(output_dir: Path) -> Path:
+    """Return the directory where each process dumps its recorded events."""
+    return output_dir / ".meta" / PHASE_EVENTS_DIR_NAME
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config):
+    """Enable the profiler of this process if requested."""
+    if not config.getoption("phase_profile") or config.option.collectonly:
+        return
+    if is_output_stdout(config.getoption("output")):
+        pytest.exit(
+            "--phase-profile can't be used when writing fixtures to stdout.",
+            returncode=pytest.ExitCode.USAGE_ERROR,
+        )
+    PROFILER.enabled = True
+    PROFILER.process = os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: pytest.Item) -> Generator[None, None, None]:
+    """Attribute the events recorded while running the test to the test."""
+    PROFILER.test_id = item.nodeid
+    yield
+    PROFILER.test_id = ""
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_pyfunc_call() -> Generator[None, None, None]:
+    """
+    Time the test function.
+
+    The exclusive time of this phase is spent in the test function itself, mostly
+    allocating the pre-state, i.e. deploying contracts and funding EOAs.
+    """
+    with profile_phase("pre-allocation and test body"):
+        yield
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int):
+    """
+    Dump the events recorded by this process and, in the controller process, aggregate
+    the events of all processes and export them.
+    """
+    if not PROFILER.enabled:
+        return
+    output_dir = strip_output_tarball_suffix(session.config.getoption("output"))
+    profile_dir = phase_profile_dir(output_dir)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    PROFILER.dump(profile_dir / f"{PROFILER.process}.json")
+    if xdist.is_xdist_worker(session):
+        return
+
+    # The controller's session finishes after all workers have dumped their events.
+    events = load_phase_events(sorted(profile_dir.glob("*.json")))
+    shutil.rmtree(profile_dir)
+    with open(output_dir / ".meta" / PHASE_PROFILE_FILE_NAME, "w") as f:
+        json.dump(phase_report_json(events), f, indent=4)
+    with open(output_dir / ".meta" / PHASE_TRACE_FILE_NAME, "w") as f:
+        json.dump(trace_events_json(events), f)
+    session.config.stash[phase_events_key] = events
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: pytest.Config):
+    """Print the ranked report of the time spent in each phase."""
+    events = config.stash.get(phase_events_key, None)
+    if events is None:
+        return
+    terminalreporter.write_sep("=", "fill phase profile")
+    terminalreporter.write_line(format_phase_report(events))
+    output_dir = strip_output_tarball_suffix(config.getoption("output"))
+    terminalreporter.write_line(
+        f"\nPhase profile exported to {output_dir / '.meta' / PHASE_PROFILE_FILE_NAME} and "
+        f"{output_dir / '.meta' / PHASE_TRACE_FILE_NAME}"
+    )
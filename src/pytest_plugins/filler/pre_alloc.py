@@ -7,6 +7,7 @@ from itertools import count
 from typing import Iterator, Literal
 
 import pytest
+import xdist
 from pydantic import PrivateAttr
 
 from ethereum_test_base_types import (
@@ -15,8 +16,6 @@ from ethereum_test_base_types import (
     Number,
     Storage,
     StorageRootType,
-    TestPrivateKey,
-    TestPrivateKey2,
     ZeroPaddedHexNumber,
 )
 from ethereum_test_base_types.conversions import (
@@ -29,6 +28,8 @@ from ethereum_test_types import Alloc as BaseAlloc
 from ethereum_test_types.eof.v1 import Container
 from ethereum_test_vm import Bytecode, EVMCodeType, Opcodes
 
+from .eoa_table import EOA_TABLE_FILE_NAME, EOATable, eoa_key, load_eoa_table
+
 CONTRACT_START_ADDRESS_DEFAULT = 0x1000
 CONTRACT_ADDRESS_INCREMENTS_DEFAULT = 0x100
 
@@ -286,10 +287,31 @@ def contract_address_iterator(
     )
 
 
+_eoa_table: EOATable | None = None
+
+
+def pytest_sessionstart(session: pytest.Session):
+    """
+    Map the table of the addresses of the EOAs in memory, which is generated in pytest's cache
+    directory by the xdist controller, or the single process, the first time it's needed.
+    """
+    global _eoa_table
+    config = session.config
+    if config.cache is None:
+        # The cacheprovider plugin is disabled, the addresses are derived from the keys.
+        return
+    table_path = config.cache.mkdir("fill_eoa_table") / EOA_TABLE_FILE_NAME
+    _eoa_table = load_eoa_table(table_path, generate=not xdist.is_xdist_worker(session))
+    eoa_by_index.cache_clear()
+
+
 @cache
 def eoa_by_index(i: int) -> EOA:
     """Return EOA by index."""
-    return EOA(key=TestPrivateKey + i if i != 1 else TestPrivateKey2, nonce=0)
+    address = _eoa_table.address(i) if _eoa_table is not None else None
+    if address is None:
+        return EOA(key=eoa_key(i), nonce=0)
+    return EOA(address, key=eoa_key(i), nonce=0)
 
 
 @pytest.fixture(scope="function")
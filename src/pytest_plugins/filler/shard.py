@@ -0,0 +1,101 @@
+"""
+Pytest plugin that fills a deterministic shard of the collected test items.
+
+With `--shard i/N`, only the items assigned to the i-th of N shards are filled. An item is
+assigned to a shard by the hash of its node ID, independently of the other collected items
+and of the host, so N independent `fill` runs with the same arguments on different hosts
+fill disjoint subsets that, together, cover all collected items.
+
+Each shard writes a self-contained output, whose `.meta/fixtures.ini` records the shard and
+a digest of the items collected before sharding in its `[shard]` section. The outputs of all
+shards are combined with `merge_shards`, which checks that the shards are complete and were
+collected from the same item set, into a release identical to a single `fill` run.
+"""
+
+import argparse
+import hashlib
+from dataclasses import dataclass
+from typing import List
+
+import pytest
+from pytest_metadata.plugin import metadata_key  # type: ignore
+
+
+@dataclass(frozen=True)
+class Shard:
+    """The i-th (1-based) of N shards of the collected test items."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def from_string(cls, value: str) -> "Shard":
+        """Parse a shard specified as `i/N` on the command line."""
+        try:
+            index, count = (int(part) for part in value.split("/"))
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(
+                f"invalid shard '{value}', expected 'i/N', e.g. '1/4'"
+            ) from e
+        if not 1 <= index <= count:
+            raise argparse.ArgumentTypeError(
+                f"invalid shard '{value}', the index must be between 1 and {count}"
+            )
+        return cls(index=index, count=count)
+
+    def __str__(self) -> str:
+        """Return the shard as specified on the command line."""
+        return f"{self.index}/{self.count}"
+
+    def contains(self, nodeid: str) -> bool:
+        """Return whether the item with the given node ID is assigned to this shard."""
+        digest = hashlib.sha256(nodeid.encode()).digest()
+        return int.from_bytes(digest[:8], "big") % self.count == self.index - 1
+
+
+def collection_digest(items: List[pytest.Item]) -> str:
+    """Return a digest of the node IDs of the items, independent of their order."""
+    return hashlib.sha256("\n".join(sorted(item.nodeid for item in items)).encode()).hexdigest()
+
+
+def pytest_addoption(parser: pytest.Parser):
+    """Add command-line options to pytest."""
+    test_group = parser.getgroup("tests", "Arguments defining filler location and output")
+    test_group.addoption(
+        "--shard",
+        action="store",
+        dest="shard",
+        type=Shard.from_string,
+        default=None,
+        help=(
+            "Only fill the i-th of N deterministic shards of the collected tests, specified "
+            "as 'i/N'. The outputs of all shards are combined with `merge_shards`."
+        ),
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]):
+    """
+    Deselect the items assigned to other shards.
+
+    This runs after all other plugins have filtered the items, e.g. by `-k` and `-m`, so the
+    digest recorded in the properties of the output covers the exact item set that was
+    sharded.
+    """
+    shard: Shard | None = config.getoption("shard")
+    if shard is None:
+        return
+    selected_items: List[pytest.Item] = []
+    deselected_items: List[pytest.Item] = []
+    for item in items:
+        (selected_items if shard.contains(item.nodeid) else deselected_items).append(item)
+    config.stash[metadata_key]["Shard"] = {
+        "index": str(shard.index),
+        "count": str(shard.count),
+        "collected_tests": str(len(items)),
+        "collection_digest": collection_digest(items),
+    }
+    if deselected_items:
+        config.hook.pytest_deselected(items=deselected_items)
+    items[:] = selected_items
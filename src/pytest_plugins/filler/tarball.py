@@ -0,0 +1,127 @@
+"""
+Creation of the fixture release tarball using all available cores.
+
+The tar stream is split into fixed-size chunks that are gzip-compressed in parallel and
+written as consecutive gzip members. A gzip file consisting of multiple members is part
+of the gzip specification (RFC 1952), so the resulting `.tar.gz` can be read by the
+standard `tar`/`gzip` tools and by python's `tarfile` module.
+
+Fixture files that are already compressed (`.json.gz`, `.json.zst`) are stored in the
+tarball with a cheap compression level, as compressing them again gains nothing.
+"""
+
+import gzip
+import os
+import tarfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, BinaryIO, Callable, Deque, cast
+
+from ethereum_test_fixtures.compression import FixtureFileCompression
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+COMPRESSED_FILE_COMPRESSLEVEL = 0
+
+
+class ParallelGzipWriter:
+    """
+    Write-only file object that gzip-compresses the written data using a pool of threads.
+
+    `zlib` releases the GIL while compressing, so threads compress the chunks in parallel.
+    The compressed chunks are written to the underlying file object in order.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        *,
+        workers: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compresslevel: int = 9,
+    ):
+        """Initialize the writer; `workers` defaults to the number of available cores."""
+        self.fileobj = fileobj
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.compresslevel = compresslevel
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending: Deque[Future[bytes]] = deque()
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        """Buffer the data and submit every complete chunk for compression."""
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            self._submit(bytes(self._buffer[: self.chunk_size]))
+            del self._buffer[: self.chunk_size]
+        return len(data)
+
+    def set_compresslevel(self, compresslevel: int) -> None:
+        """
+        Compress the data written from now on with the given level.
+
+        The buffered data is submitted as a shorter chunk with the previous level, so that
+        every gzip member has a single level.
+        """
+        if compresslevel == self.compresslevel:
+            return
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        self.compresslevel = compresslevel
+
+    def _submit(self, chunk: bytes) -> None:
+        """Submit a chunk for compression, bounding the number of chunks held in memory."""
+        self._pending.append(
+            self._executor.submit(gzip.compress, chunk, self.compresslevel, mtime=0)
+        )
+        while len(self._pending) > 2 * self.workers:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        """Compress the remaining data and write all the pending chunks."""
+        if self._buffer or not self._pending:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self.fileobj.write(self._pending.popleft().result())
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ParallelGzipWriter":
+        """Enter the context of the writer."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the writer when exiting the context."""
+        self.close()
+
+
+def create_tarball(
+    source_dir: Path,
+    tarball_path: Path,
+    include: Callable[[Path], bool],
+    arcname_root: Path = Path("fixtures"),
+    workers: int | None = None,
+    compresslevel: int = 9,
+) -> None:
+    """
+    Create a `.tar.gz` of all the files in `source_dir` selected by `include`.
+
+    Files are added in sorted order below `arcname_root` and compressed using all
+    available cores, unless `workers` is specified. Already compressed fixture files are
+    stored with `COMPRESSED_FILE_COMPRESSLEVEL` instead of `compresslevel`.
+    """
+    with (
+        open(tarball_path, "wb") as f,
+        ParallelGzipWriter(f, workers=workers, compresslevel=compresslevel) as gzip_writer,
+        tarfile.open(fileobj=cast(IO[bytes], gzip_writer), mode="w|") as tar,
+    ):
+        for file in sorted(source_dir.rglob("*")):
+            if file.is_file() and include(file):
+                # The tar stream buffers a record, so the level may switch a few KiB late.
+                if FixtureFileCompression.from_path(file) == FixtureFileCompression.NONE:
+                    gzip_writer.set_compresslevel(compresslevel)
+                else:
+                    gzip_writer.set_compresslevel(COMPRESSED_FILE_COMPRESSLEVEL)
+                tar.add(file, arcname=arcname_root / file.relative_to(source_dir))
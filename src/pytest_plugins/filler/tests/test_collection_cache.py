@@ -0,0 +1,70 @@
+"""Test the cache of the items collected from each test module."""
+
+from pathlib import Path
+
+import pytest
+
+from ..collection_cache import CollectionCache
+
+TEST_MODULE = """
+import pytest
+
+@pytest.mark.parametrize("value", [1, 2])
+def test_slow_thing(value):
+    pass
+
+@pytest.mark.state_test
+def test_fast_thing():
+    pass
+"""
+
+
+@pytest.fixture
+def collection_cache(pytester: pytest.Pytester, tmp_path: Path) -> CollectionCache:
+    """Return a collection cache updated with the items of a test module."""
+    pytester.makeini("[pytest]\nmarkers =\n    state_test")
+    items = pytester.getitems(TEST_MODULE)
+    collection_cache = CollectionCache(path=tmp_path / "modules.json", digest="digest")
+    collection_cache.add_collected_module(items[0].path)
+    collection_cache.add_collected_module(Path("empty_module.py").absolute())
+    collection_cache.update(items)
+    return collection_cache
+
+
+@pytest.mark.parametrize(
+    "keyword,markexpr,can_skip",
+    [
+        ("", "", False),
+        ("slow_thing", "", False),
+        ("slow_thing and 2", "", False),
+        ("slow_thing and 3", "", True),
+        ("not thing", "", True),
+        ("", "state_test", False),
+        ("slow_thing", "state_test", True),
+        ("", "blockchain_test", True),
+        ("invalid expression (", "", False),
+    ],
+)
+def test_can_skip_module(
+    pytester: pytest.Pytester,
+    collection_cache: CollectionCache,
+    keyword: str,
+    markexpr: str,
+    can_skip: bool,
+):
+    """Test that only the modules without any selected item are skipped."""
+    config = pytester.parseconfig("-k", keyword, "-m", markexpr)
+    (module_path,) = [path for path in collection_cache.modules if "empty" not in path]
+    assert collection_cache.can_skip_module(Path(module_path), config) is can_skip
+    # Modules without items can always be skipped, unknown modules never.
+    assert collection_cache.can_skip_module(Path("empty_module.py").absolute(), config) is (
+        keyword != "invalid expression ("
+    )
+    assert not collection_cache.can_skip_module(Path("unknown.py").absolute(), config)
+
+
+def test_save(collection_cache: CollectionCache):
+    """Test that the saved cache contains the compact representation of the items."""
+    collection_cache.save()
+    assert collection_cache.path.exists()
+    assert list(collection_cache.path.parent.iterdir()) == [collection_cache.path]
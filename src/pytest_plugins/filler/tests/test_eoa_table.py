@@ -0,0 +1,61 @@
+"""Test the table of the addresses of the EOAs of the filler's pre-allocation."""
+
+from pathlib import Path
+
+import pytest
+
+from ethereum_test_base_types import TestAddress, TestAddress2
+from ethereum_test_types import EOA
+
+from ..eoa_table import EOATable, derive_eoa_address, eoa_key, load_eoa_table, write_eoa_table
+
+TABLE_SIZE = 64
+
+
+@pytest.fixture
+def table_path(tmp_path: Path) -> Path:
+    """Return the path of a small table."""
+    path = tmp_path / "eoa_addresses.bin"
+    write_eoa_table(path, size=TABLE_SIZE)
+    return path
+
+
+def test_eoa_table_addresses(table_path: Path):
+    """Test that the addresses of the table are the addresses of the keys of the EOAs."""
+    table = EOATable(table_path)
+    assert table.size == TABLE_SIZE
+    assert table.address(0) == TestAddress
+    assert table.address(1) == TestAddress2
+    for i in range(TABLE_SIZE):
+        assert table.address(i) == EOA(key=eoa_key(i)) == derive_eoa_address(i)
+    assert table.address(TABLE_SIZE) is None
+    assert table.address(-1) is None
+    table.close()
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        pytest.param(lambda data: data[:-1], id="truncated"),
+        pytest.param(lambda data: data[:10], id="truncated_header"),
+        pytest.param(lambda data: b"X" + data[1:], id="other_format"),
+        pytest.param(lambda data: data[:20] + b"\xff" + data[21:], id="other_keys"),
+        pytest.param(lambda data: data[:-1] + bytes([data[-1] ^ 1]), id="corrupted_address"),
+    ],
+)
+def test_invalid_eoa_table(table_path: Path, corrupt):
+    """Test that an invalid table is rejected, and generated again by the controller."""
+    table_path.write_bytes(corrupt(table_path.read_bytes()))
+    with pytest.raises(ValueError):
+        EOATable(table_path)
+    assert load_eoa_table(table_path, generate=False) is None
+    table = load_eoa_table(table_path, generate=True)
+    assert table is not None
+    assert table.address(TABLE_SIZE) == derive_eoa_address(TABLE_SIZE)
+    table.close()
+
+
+def test_missing_eoa_table(tmp_path: Path):
+    """Test that a worker doesn't generate a missing table."""
+    assert load_eoa_table(tmp_path / "missing.bin", generate=False) is None
+    assert not (tmp_path / "missing.bin").exists()
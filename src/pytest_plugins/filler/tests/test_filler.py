@@ -11,6 +11,7 @@ from pathlib import Path
 
 import pytest
 
+from cli.merge_shards import merge_shard_outputs
 from ethereum_clis import ExecutionSpecsTransitionTool, TransitionTool
 from pytest_plugins.filler.filler import default_output_directory
 
@@ -598,3 +599,61 @@ def test_fixture_output_based_on_command_line_args(
         assert "build" in properties
         build_name = args[args.index("--build-name") + 1]
         assert properties["build"] == build_name
+
+
+@pytest.mark.run_in_serial
+def test_sharded_fill_matches_single_fill(testdir):
+    """
+    Test that merging the outputs of shards filled in separate processes produces the same
+    release as a single fill run.
+    """
+    tests_dir = testdir.mkdir("tests")
+    tests_dir.mkdir("paris").join("test_module_paris.py").write(test_module_paris)
+    tests_dir.mkdir("shanghai").join("test_module_shanghai.py").write(test_module_shanghai)
+    testdir.copy_example(name="pytest.ini")
+
+    args = ["--no-html", "--build-name", "test_build"]
+    result = testdir.runpytest_subprocess(*args, "--output", "single")
+    result.assert_outcomes(passed=total_test_count * 3)
+
+    shard_dirs = []
+    passed = 0
+    for i in range(1, 3):
+        result = testdir.runpytest_subprocess(*args, "--output", f"shard_{i}", "--shard", f"{i}/2")
+        passed += result.parseoutcomes().get("passed", 0)
+        shard_dirs.append(Path(f"shard_{i}").absolute())
+    assert passed == total_test_count * 3
+
+    single_dir = Path("single").absolute()
+    release_dir = Path("release").absolute()
+    merge_shard_outputs(shard_dirs, release_dir)
+
+    fixture_files = sorted(
+        file.relative_to(single_dir)
+        for file in single_dir.rglob("*.json")
+        if ".meta" not in file.parts
+    )
+    assert fixture_files == sorted(
+        file.relative_to(release_dir)
+        for file in release_dir.rglob("*.json")
+        if ".meta" not in file.parts
+    )
+    for fixture_file in fixture_files:
+        assert (release_dir / fixture_file).read_bytes() == (
+            single_dir / fixture_file
+        ).read_bytes()
+
+    def index_test_cases(output_dir: Path):
+        with open(output_dir / ".meta" / "index.json") as f:
+            return sorted(json.load(f)["test_cases"], key=lambda test_case: test_case["id"])
+
+    assert index_test_cases(release_dir) == index_test_cases(single_dir)
+
+    single_properties = configparser.ConfigParser()
+    single_properties.read(single_dir / ".meta" / "fixtures.ini")
+    release_properties = configparser.ConfigParser()
+    release_properties.read(release_dir / ".meta" / "fixtures.ini")
+    assert release_properties.sections() == single_properties.sections()
+    assert release_properties["fixtures"]["build"] == "test_build"
+    assert "--shard" not in release_properties["fixtures"]["command_line_args"]
+    assert dict(release_properties["tools"]) == dict(single_properties["tools"])
@@ -0,0 +1,64 @@
+"""Test the deterministic sharding of the collected test items."""
+
+import argparse
+from typing import List
+
+import pytest
+
+from ..shard import Shard
+
+TEST_MODULE = """
+import pytest
+
+@pytest.mark.parametrize("value", range(30))
+def test_value(value):
+    pass
+"""
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("1/1", Shard(index=1, count=1)),
+        ("2/4", Shard(index=2, count=4)),
+        ("4/4", Shard(index=4, count=4)),
+    ],
+)
+def test_from_string(value: str, expected: Shard):
+    """Test that valid shards are parsed and printed as specified."""
+    assert Shard.from_string(value) == expected
+    assert str(expected) == value
+
+
+@pytest.mark.parametrize("value", ["", "1", "a/2", "0/2", "3/2", "1/0", "1/2/3"])
+def test_from_string_invalid(value: str):
+    """Test that invalid shards are rejected."""
+    with pytest.raises(argparse.ArgumentTypeError):
+        Shard.from_string(value)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 8])
+def test_shards_partition_items(count: int):
+    """Test that each item is assigned to exactly one shard."""
+    nodeids = [f"tests/test_module.py::test_value[fork_Cancun-{i}]" for i in range(100)]
+    shards = [Shard(index=i, count=count) for i in range(1, count + 1)]
+    for nodeid in nodeids:
+        assert sum(shard.contains(nodeid) for shard in shards) == 1
+
+
+def collected_nodeids(pytester: pytest.Pytester, *args: str) -> List[str]:
+    """Return the node IDs collected by a session with the shard plugin."""
+    result = pytester.runpytest("-p", "pytest_plugins.filler.shard", "--collect-only", "-q", *args)
+    return [line for line in result.outlines if "::" in line]
+
+
+def test_sharded_collection(pytester: pytest.Pytester):
+    """Test that the shards collect disjoint subsets of the items that cover all items."""
+    pytester.makepyfile(test_module=TEST_MODULE)
+    all_nodeids = collected_nodeids(pytester)
+    assert len(all_nodeids) == 30
+
+    shard_nodeids = [collected_nodeids(pytester, "--shard", f"{i}/3") for i in range(1, 4)]
+    assert all(shard_nodeids)
+    assert sorted(sum(shard_nodeids, [])) == sorted(all_nodeids)
+    assert collected_nodeids(pytester, "--shard", "2/3") == shard_nodeids[1]
@@ -0,0 +1,119 @@
+"""Test the parallel creation of the fixture release tarball."""
+
+import gzip
+import io
+import os
+import shutil
+import subprocess
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from ..filler import is_release_file
+from ..tarball import COMPRESSED_FILE_COMPRESSLEVEL, ParallelGzipWriter, create_tarball
+
+
+@pytest.mark.parametrize("chunk_size", [100, 1000, 1 << 20])
+@pytest.mark.parametrize("data_size", [0, 999, 1000, 123_456])
+def test_parallel_gzip_writer(chunk_size: int, data_size: int):
+    """Test that the concatenated gzip members decompress to the written data."""
+    data = bytes(i % 251 for i in range(data_size))
+    output = io.BytesIO()
+    with ParallelGzipWriter(output, workers=4, chunk_size=chunk_size) as writer:
+        for i in range(0, data_size, 77):
+            writer.write(data[i : i + 77])
+    assert gzip.decompress(output.getvalue()) == data
+
+
+def test_parallel_gzip_writer_compresslevel():
+    """Test that the data written after a change of level is compressed with that level."""
+    data = os.urandom(10_000)
+    output = io.BytesIO()
+    with ParallelGzipWriter(output, workers=4, chunk_size=4096, compresslevel=9) as writer:
+        writer.write(data[:5000])
+        writer.set_compresslevel(0)
+        writer.write(data[5000:])
+    assert gzip.decompress(output.getvalue()) == data
+    # Stored data keeps its size, compressed incompressible data also barely grows.
+    assert len(output.getvalue()) < len(data) + 200
+
+
+def test_create_tarball_of_compressed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that already compressed fixture files aren't compressed again."""
+    source_dir = tmp_path / "fixtures"
+    (source_dir / "state_tests").mkdir(parents=True)
+    compressed_content = gzip.compress(os.urandom(1 << 20))
+    (source_dir / "state_tests" / "a.json.gz").write_bytes(compressed_content)
+
+    compresslevels = []
+    compress = gzip.compress
+
+    def recording_compress(data: bytes, compresslevel: int = 9, **kwargs) -> bytes:
+        compresslevels.append((len(data), compresslevel))
+        return compress(data, compresslevel, **kwargs)
+
+    monkeypatch.setattr(gzip, "compress", recording_compress)
+    tarball_path = tmp_path / "fixtures.tar.gz"
+    create_tarball(source_dir, tarball_path, include=is_release_file, workers=2)
+
+    stored_bytes = sum(
+        size for size, level in compresslevels if level == COMPRESSED_FILE_COMPRESSLEVEL
+    )
+    assert stored_bytes >= len(compressed_content)
+    with tarfile.open(tarball_path, "r:gz") as tar:
+        extracted = tar.extractfile("fixtures/state_tests/a.json.gz")
+        assert extracted is not None
+        assert extracted.read() == compressed_content
+
+
+def test_create_tarball(tmp_path: Path):
+    """Test that the tarball can be read by `tarfile` and by the `tar` command."""
+    source_dir = tmp_path / "fixtures"
+    files = {
+        Path("state_tests/a.json"): b'{"a": 1}',
+        Path("state_tests/sub/b.json"): b"b" * 100_000,
+        Path(".meta/fixtures.ini"): b"[fixtures]",
+        Path("state_tests/c.txt"): b"not included",
+    }
+    for path, content in files.items():
+        (source_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (source_dir / path).write_bytes(content)
+
+    tarball_path = tmp_path / "fixtures.tar.gz"
+    create_tarball(source_dir, tarball_path, include=lambda f: f.suffix in {".json", ".ini"})
+
+    with tarfile.open(tarball_path, "r:gz") as tar:
+        names = tar.getnames()
+        for path, content in files.items():
+            arcname = str(Path("fixtures") / path)
+            if path.suffix == ".txt":
+                assert arcname not in names
+                continue
+            extracted = tar.extractfile(arcname)
+            assert extracted is not None
+            assert extracted.read() == content
+
+    if shutil.which("tar") is not None:
+        listing = subprocess.run(
+            ["tar", "-tzf", str(tarball_path)], check=True, capture_output=True, text=True
+        )
+        assert "fixtures/state_tests/sub/b.json" in listing.stdout.splitlines()
+
+
+@pytest.mark.parametrize(
+    "file,expected",
+    [
+        ("state_tests/cancun/test.json", True),
+        ("state_tests/cancun/test.json.gz", True),
+        ("index.json", True),
+        (".meta/fixtures.ini", True),
+        (".meta/phase_profile.json", False),
+        (".meta/phase_profile.trace.json", False),
+        (".meta/phase_profile/gw0.json", False),
+        ("state_tests/cancun/test.txt", False),
+    ],
+)
+def test_is_release_file(file: str, expected: bool):
+    """Test that the phase profile is left out of the release tarball."""
+    assert is_release_file(Path("fixtures") / file) == expected